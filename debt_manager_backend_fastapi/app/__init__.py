@@ -1,8 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 
+from app.config.repositories import uses_database
 from app.migrations.create_database import main
 
 db = SQLAlchemy()
 
-main()
+# The memory repository backend runs without a database
+if uses_database():
+    main()
 
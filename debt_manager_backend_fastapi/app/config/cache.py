@@ -0,0 +1,107 @@
+import os
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.repositories.entity_cache import (
+    EntityCache,
+    InMemorySharedBackend,
+    LocalLRUCache,
+    RedisSharedBackend,
+)
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Entity cache settings
+ENTITY_CACHE_SETTINGS = {
+    "enabled": os.getenv("ENTITY_CACHE_ENABLED", "true").lower() == "true",
+    "max_entries": int(os.getenv("ENTITY_CACHE_MAX_ENTRIES", 10000)),
+    "ttl_seconds": float(os.getenv("ENTITY_CACHE_TTL_SECONDS", 30)),
+    # "none", "memory" (local stand-in for a shared store) or "redis"
+    "shared_backend": os.getenv("ENTITY_CACHE_SHARED_BACKEND", "none"),
+    "shared_ttl_seconds": float(os.getenv("ENTITY_CACHE_SHARED_TTL_SECONDS", 300)),
+    "redis_url": os.getenv("ENTITY_CACHE_REDIS_URL", "redis://localhost:6379/0"),
+    # Tell the other workers about writes; without it they serve stale records for up to ttl_seconds
+    "broadcast_invalidations": os.getenv("ENTITY_CACHE_BROADCAST_INVALIDATIONS", "true").lower() == "true",
+}
+
+# NOTIFY channel of the entity cache invalidations, payload "<namespace>:<record id>"
+ENTITY_CACHE_CHANNEL = "entity_cache_invalidated"
+
+_shared_backend = None
+
+# Entity caches by namespace
+_caches: Dict[str, EntityCache] = {}
+
+
+def _get_shared_backend():
+    global _shared_backend
+    backend = ENTITY_CACHE_SETTINGS["shared_backend"]
+    if backend == "none":
+        return None
+    if _shared_backend is None:
+        if backend == "memory":
+            _shared_backend = InMemorySharedBackend()
+        elif backend == "redis":
+            _shared_backend = RedisSharedBackend(ENTITY_CACHE_SETTINGS["redis_url"])
+        else:
+            raise ValueError(f"Unknown entity cache backend '{backend}'.")
+    return _shared_backend
+
+
+def get_entity_cache(namespace: str) -> Optional[EntityCache]:
+    """
+    Get the entity cache for a namespace (a table name), creating it on first use.
+
+    Returns:
+        Optional[EntityCache]: The cache, or None when the entity cache is disabled.
+    """
+    if not ENTITY_CACHE_SETTINGS["enabled"]:
+        return None
+
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = EntityCache(
+            namespace,
+            LocalLRUCache(ENTITY_CACHE_SETTINGS["max_entries"], ENTITY_CACHE_SETTINGS["ttl_seconds"]),
+            shared=_get_shared_backend(),
+            shared_ttl_seconds=ENTITY_CACHE_SETTINGS["shared_ttl_seconds"],
+            broadcast_channel=ENTITY_CACHE_CHANNEL if ENTITY_CACHE_SETTINGS["broadcast_invalidations"] else None,
+        )
+        _caches[namespace] = cache
+    return cache
+
+
+def cache_statistics() -> Dict[str, Dict]:
+    """
+    Hit, miss, eviction and invalidation counters for every entity cache.
+    """
+    return {namespace: cache.statistics() for namespace, cache in _caches.items()}
+
+
+def evict_invalidated(payload: str):
+    """
+    Drop a record another worker wrote from this worker's local cache.
+
+    Args:
+        payload (str): The notification payload, "<namespace>:<record id>".
+    """
+    namespace = payload.split(":", 1)[0]
+    cache = _caches.get(namespace)
+    if cache is not None:
+        cache.evict_local(payload)
+
+
+def clear_local_caches():
+    """Empty every local cache, as invalidations may have been missed."""
+    for cache in _caches.values():
+        cache.clear_local()
+
+
+def follow_invalidations(listener):
+    """
+    Evict the records other workers write, as the listener delivers their notifications.
+    """
+    if ENTITY_CACHE_SETTINGS["enabled"] and ENTITY_CACHE_SETTINGS["broadcast_invalidations"]:
+        listener.subscribe(ENTITY_CACHE_CHANNEL, evict_invalidated, on_connect=clear_local_caches)
@@ -1,8 +1,15 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
 
+from app.config.pool_metrics import instrumented_pool_class, register_engine
+from app.config.query_metrics import query_metrics
+from app.config.replica_router import ReplicaRouter
+from app.config.repositories import uses_database
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -12,12 +19,98 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in the environment variables.")
 
+# Connection pool settings, shared by the sync and async engines
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    "pool_use_lifo": os.getenv("DB_POOL_USE_LIFO", "false").lower() == "true",
+}
+
 # SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=instrumented_pool_class("primary"),
+    **POOL_SETTINGS,
+)
+register_engine("primary", engine)
+query_metrics.instrument(engine)
 
 # SQLAlchemy session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async database URL: explicit ASYNC_DATABASE_URL, or DATABASE_URL on the asyncpg driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or str(
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+)
+
+# SQLAlchemy async engine, used by the request path so DB waits don't block the event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=instrumented_pool_class("primary_async", is_async=True),
+    **POOL_SETTINGS,
+)
+register_engine("primary_async", async_engine)
+query_metrics.instrument(async_engine)
+
+# SQLAlchemy async session factory
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica URLs (comma separated); reads fall back to the primary when empty
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# How reads pick a replica: "round_robin" or "least_connections"
+DATABASE_REPLICA_STRATEGY = os.getenv("DATABASE_REPLICA_STRATEGY", "round_robin")
+
+# Seconds after a write to a table during which its reads stay on the primary
+DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv("DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS", 1.0))
+
+replicas = []
+async_replicas = []
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS):
+    replica_engine = create_engine(
+        replica_url,
+        poolclass=instrumented_pool_class(f"replica_{index}"),
+        **POOL_SETTINGS,
+    )
+    register_engine(f"replica_{index}", replica_engine)
+    query_metrics.instrument(replica_engine)
+    replicas.append((replica_engine, sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)))
+
+    async_replica_engine = create_async_engine(
+        str(make_url(replica_url).set(drivername="postgresql+asyncpg")),
+        poolclass=instrumented_pool_class(f"replica_{index}_async", is_async=True),
+        **POOL_SETTINGS,
+    )
+    register_engine(f"replica_{index}_async", async_replica_engine)
+    query_metrics.instrument(async_replica_engine)
+    async_replicas.append((
+        async_replica_engine,
+        sessionmaker(
+            bind=async_replica_engine,
+            class_=AsyncSession,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        ),
+    ))
+
+# Session factories for repository reads, routed to the replicas
+ReadSessionLocal = ReplicaRouter(
+    SessionLocal, replicas, DATABASE_REPLICA_STRATEGY, DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS
+)
+AsyncReadSessionLocal = ReplicaRouter(
+    AsyncSessionLocal, async_replicas, DATABASE_REPLICA_STRATEGY, DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS
+)
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -30,9 +123,16 @@ def get_db():
     finally:
         db.close()
 
-# Test the database connection
-try:
-    with engine.connect() as connection:
-        print("Successfully connected to the database!")
-except Exception as e:
-    print(f"Error connecting to the database: {e}")
+# Function to get an async database session
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Test the database connection (engines connect lazily, so the memory backend never does)
+if uses_database():
+    try:
+        with engine.connect() as connection:
+            print("Successfully connected to the database!")
+    except Exception as e:
+        print(f"Error connecting to the database: {e}")
@@ -0,0 +1,121 @@
+import select
+import threading
+from typing import Callable, List, NamedTuple, Optional, Set
+
+from app.config.database import engine
+
+
+class Subscription(NamedTuple):
+    channel: str
+    on_notify: Callable[[str], None]
+    on_connect: Optional[Callable[[], None]]
+    on_idle: Optional[Callable[[], None]]
+
+
+class NotificationListener:
+    """
+    One PostgreSQL LISTEN connection per process, shared by every channel the
+    process follows (status changes, entity cache invalidations).
+
+    A background thread LISTENs on the subscribed channels and calls each
+    channel's handlers with the notification payload. Once LISTENing on a
+    connection it calls the subscription's `on_connect` hook, as notifications
+    may have been missed before (or while reconnecting), and roughly once a
+    second, when no notification arrived, the `on_idle` hooks.
+    """
+
+    def __init__(self, bind=engine, poll_seconds: float = 1.0, retry_seconds: float = 5.0):
+        self.bind = bind
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Call `on_notify(payload)` for each notification on `channel`. Channels
+        subscribed while the listener runs are LISTENed on its next poll.
+        """
+        with self._lock:
+            self._subscriptions.append(Subscription(channel, on_notify, on_connect, on_idle))
+
+    def start(self):
+        """Start the listener thread, if it is not running yet."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._listen, name="notification-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the listener thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @staticmethod
+    def _call(hook: Callable, *args):
+        # A failing handler must not drop the connection the other channels share
+        try:
+            hook(*args)
+        except Exception as e:
+            print(f"Notification handler error: {e}")
+
+    def _listen(self):
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self.bind.raw_connection()
+                connection.detach()  # Long-lived and in autocommit: keep it out of the pool
+                dbapi_connection = getattr(connection, "dbapi_connection", None) or connection.connection
+                dbapi_connection.autocommit = True
+                cursor = dbapi_connection.cursor()
+                listening: Set[str] = set()
+                connected = 0
+
+                while not self._stop.is_set():
+                    with self._lock:
+                        subscriptions = list(self._subscriptions)
+                    for subscription in subscriptions[connected:]:
+                        if subscription.channel not in listening:
+                            cursor.execute(f"LISTEN {subscription.channel}")
+                            listening.add(subscription.channel)
+                        # Changes may have been missed before LISTENing
+                        if subscription.on_connect is not None:
+                            self._call(subscription.on_connect)
+                    connected = len(subscriptions)
+
+                    ready, _, _ = select.select([dbapi_connection], [], [], self.poll_seconds)
+                    if ready:
+                        dbapi_connection.poll()
+                        notifies = list(dbapi_connection.notifies)
+                        dbapi_connection.notifies.clear()
+                        for notify in notifies:
+                            for subscription in subscriptions:
+                                if subscription.channel == notify.channel:
+                                    self._call(subscription.on_notify, notify.payload)
+                    else:
+                        for subscription in subscriptions:
+                            if subscription.on_idle is not None:
+                                self._call(subscription.on_idle)
+            except Exception as e:
+                print(f"Notification listener error: {e}")
+                self._stop.wait(self.retry_seconds)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+# Shared listener, started with the application
+notification_listener = NotificationListener()
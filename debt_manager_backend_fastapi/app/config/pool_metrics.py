@@ -0,0 +1,133 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait time histogram buckets
+WAIT_TIME_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """
+    Checkout counters and wait time histogram for one connection pool.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = Lock()
+        self._bucket_counts = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+        self._wait_time_sum = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def observe_checkout(self, seconds: float):
+        """Record a successful checkout and how long it waited."""
+        with self._lock:
+            self._bucket_counts[bisect_left(WAIT_TIME_BUCKETS, seconds)] += 1
+            self._wait_time_sum += seconds
+            self.checkouts += 1
+
+    def observe_failure(self, timed_out: bool):
+        """Record a checkout that failed, either on pool timeout or on connect."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.errors += 1
+
+    def snapshot(self, pool) -> Dict:
+        """
+        Combine the recorded counters with the live state of the pool.
+
+        Args:
+            pool: The SQLAlchemy pool these metrics belong to.
+
+        Returns:
+            Dict: Pool state, checkout counters and a cumulative wait time histogram.
+        """
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(WAIT_TIME_BUCKETS, self._bucket_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._bucket_counts[-1]
+
+            return {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "checkout_failures": {"timeout": self.timeouts, "error": self.errors},
+                "wait_time_seconds": {
+                    "buckets": buckets,
+                    "count": self.checkouts,
+                    "sum": self._wait_time_sum,
+                },
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout from the pool queue and counts failures."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_failure(timed_out=True)
+            raise
+        except Exception:
+            self.metrics.observe_failure(timed_out=False)
+            raise
+        self.metrics.observe_checkout(perf_counter() - start)
+        return connection
+
+
+# Registered engines, by name, with the metrics of their pools
+_registry: Dict[str, Tuple[PoolMetrics, object]] = {}
+
+
+def instrumented_pool_class(name: str, is_async: bool = False):
+    """
+    Build a queue pool class whose checkouts are recorded under `name`.
+
+    The metrics live on the class, so they survive `engine.dispose()`, which
+    recreates the pool from the same class.
+
+    Args:
+        name (str): Name the pool metrics are reported under.
+        is_async (bool): Build on the asyncio-adapted queue pool.
+
+    Returns:
+        type: Pool class to pass as `poolclass` to the engine factory.
+    """
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics": PoolMetrics(name)})
+
+
+def register_engine(name: str, engine):
+    """
+    Make an engine's pool visible in `pool_statistics`.
+
+    Args:
+        name (str): Name to report the pool under.
+        engine: A sync engine, or an async engine (its `sync_engine` is used).
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = getattr(sync_engine.pool, "metrics", None) or PoolMetrics(name)
+    _registry[name] = (metrics, sync_engine)
+
+
+def pool_statistics() -> Dict[str, Dict]:
+    """
+    Live statistics for every registered pool.
+    """
+    return {name: metrics.snapshot(engine.pool) for name, (metrics, engine) in _registry.items()}
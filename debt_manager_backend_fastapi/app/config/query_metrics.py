@@ -0,0 +1,256 @@
+import logging
+import os
+import re
+from collections import Counter, deque
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+# Load environment variables from .env file
+load_dotenv()
+
+# SQL instrumentation settings
+QUERY_METRICS_SETTINGS = {
+    "enabled": os.getenv("QUERY_METRICS_ENABLED", "true").lower() == "true",
+    # Statements slower than this are logged with their route
+    "slow_query_ms": float(os.getenv("SLOW_QUERY_MS", 200)),
+    # Requests issuing more statements than this are logged as likely N+1
+    "max_queries_per_request": int(os.getenv("MAX_QUERIES_PER_REQUEST", 20)),
+    # Send the per-request query count and time as response headers
+    "debug_headers": os.getenv("DEBUG", "false").lower() == "true",
+    # Distinct fingerprints tracked; further ones are grouped under OTHER_FINGERPRINT
+    "max_fingerprints": int(os.getenv("QUERY_METRICS_MAX_FINGERPRINTS", 1000)),
+    # Recent durations kept per fingerprint to estimate its p95
+    "samples": int(os.getenv("QUERY_METRICS_SAMPLES", 512)),
+}
+
+OTHER_FINGERPRINT = "<other>"
+
+logger = logging.getLogger("app.sql")
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAMETERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBERS = re.compile(r"(?<![\w\".$])\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so every execution of the same query shares one key:
+    literals and bind parameters become `?`, IN lists and multi-row VALUES
+    collapse, and comments and extra whitespace are dropped.
+    """
+    normalized = _COMMENTS.sub(" ", statement)
+    normalized = _STRINGS.sub("?", normalized)
+    normalized = _BIND_PARAMETERS.sub("?", normalized)
+    normalized = _NUMBERS.sub("?", normalized)
+    normalized = _IN_LISTS.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class StatementStats:
+    """Execution count, total and maximum time, and recent durations of one fingerprint."""
+
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "samples")
+
+    def __init__(self, samples: int):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = deque(maxlen=samples)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.samples.append(seconds)
+
+    def snapshot(self) -> Dict:
+        samples = sorted(self.samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class RequestQueries:
+    """Statements issued while handling one HTTP request."""
+
+    __slots__ = ("scope", "count", "seconds", "fingerprints")
+
+    def __init__(self, scope: Optional[Dict] = None):
+        self.scope = scope or {}
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        """The route template once the router has matched, otherwise the raw path."""
+        route = getattr(self.scope.get("route"), "path", None)
+        return route or self.scope.get("path", "-")
+
+
+# Queries of the request being handled (propagated to worker threads and greenlets)
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar("current_request_queries", default=None)
+
+
+class QueryMetrics:
+    """
+    Statement statistics by fingerprint, fed by SQLAlchemy engine events.
+
+    Each execution is timed from `before_cursor_execute` to
+    `after_cursor_execute` (or `handle_error`). Statements slower than
+    `slow_query_ms` are logged with the route of the request that issued
+    them, and requests issuing more than `max_queries_per_request`
+    statements are logged as likely N+1 patterns. Executions may come from
+    worker threads, so updates are locked.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = {**QUERY_METRICS_SETTINGS, **(settings or {})}
+        self._lock = Lock()
+        self._statements: Dict[str, StatementStats] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._flagged_routes: Counter = Counter()
+
+    def instrument(self, engine):
+        """
+        Time every statement executed by `engine`.
+
+        Args:
+            engine: A sync engine, or an async engine (its `sync_engine` is used).
+        """
+        if not self.settings["enabled"]:
+            return
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def begin_request(self, scope: Optional[Dict] = None):
+        """
+        Start counting the statements of a request in the current context.
+
+        Returns:
+            A token for `end_request`.
+        """
+        return _current_request.set(RequestQueries(scope))
+
+    def end_request(self, token) -> RequestQueries:
+        """
+        Stop counting, flag the request if it issued too many statements and
+        return its query counts.
+        """
+        queries = _current_request.get()
+        _current_request.reset(token)
+        if queries is not None and queries.count > self.settings["max_queries_per_request"]:
+            with self._lock:
+                self._flagged_routes[queries.route] += 1
+            statement, repeats = queries.fingerprints.most_common(1)[0]
+            logger.warning(
+                "%d queries (%.1f ms) in one request to %s; most repeated (%dx): %s",
+                queries.count, queries.seconds * 1000, queries.route, repeats, statement,
+            )
+        return queries
+
+    @staticmethod
+    def current_request() -> Optional[RequestQueries]:
+        """Query counts of the request being handled, if any."""
+        return _current_request.get()
+
+    def statistics(self, limit: int = 50) -> Dict:
+        """
+        The `limit` fingerprints with the highest total time, and the routes
+        flagged for issuing too many statements per request.
+        """
+        with self._lock:
+            statements = sorted(self._statements.items(), key=lambda item: item[1].total_seconds, reverse=True)
+            top = [{"statement": statement, **stats.snapshot()} for statement, stats in statements[:limit]]
+            flagged = dict(self._flagged_routes)
+        return {
+            "statements": top,
+            "fingerprints": len(statements),
+            "n_plus_one_routes": flagged,
+            "settings": {
+                "slow_query_ms": self.settings["slow_query_ms"],
+                "max_queries_per_request": self.settings["max_queries_per_request"],
+            },
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._flagged_routes.clear()
+
+    def _fingerprint(self, statement: str) -> str:
+        key = self._fingerprints.get(statement)
+        if key is None:
+            key = fingerprint(statement)
+            if len(self._fingerprints) >= 4 * self.settings["max_fingerprints"]:
+                self._fingerprints.clear()
+            self._fingerprints[statement] = key
+        return key
+
+    def _stats(self, key: str) -> StatementStats:
+        stats = self._statements.get(key)
+        if stats is None:
+            if len(self._statements) >= self.settings["max_fingerprints"]:
+                key = OTHER_FINGERPRINT
+                stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(self.settings["samples"])
+        return stats
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            self._record(statement, perf_counter() - started)
+
+    def _handle_error(self, exception_context):
+        context = exception_context.execution_context
+        started = getattr(context, "_query_started", None)
+        if started is not None and exception_context.statement:
+            self._record(exception_context.statement, perf_counter() - started, failed=True)
+
+    def _record(self, statement: str, seconds: float, failed: bool = False):
+        key = self._fingerprint(statement)
+        with self._lock:
+            stats = self._stats(key)
+            stats.observe(seconds)
+            if failed:
+                stats.errors += 1
+
+        queries = _current_request.get()
+        if queries is not None:
+            queries.count += 1
+            queries.seconds += seconds
+            queries.fingerprints[key] += 1
+
+        if seconds * 1000 >= self.settings["slow_query_ms"]:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s",
+                seconds * 1000, queries.route if queries is not None else "-", key,
+            )
+
+
+# Shared SQL statistics, fed by every engine in app.config.database
+query_metrics = QueryMetrics()
@@ -0,0 +1,88 @@
+from contextvars import ContextVar
+from itertools import count
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+# Strategies for picking a replica
+REPLICA_STRATEGIES = {"round_robin", "least_connections"}
+
+# Set once the current request (asyncio task / thread context) has written
+_wrote_in_context: ContextVar[bool] = ContextVar("wrote_in_context", default=False)
+
+# Last write time per table in this process, for the read-your-writes window
+_last_write_at: Dict[str, float] = {}
+
+
+def mark_write(table_name: str):
+    """
+    Record a committed write so following reads stay on the primary.
+
+    Reads in the same request always go to the primary afterwards. Reads of the
+    same table from any request in this process go to the primary until the
+    router's read-your-writes window has elapsed.
+
+    Args:
+        table_name (str): Table that was written.
+    """
+    _wrote_in_context.set(True)
+    _last_write_at[table_name] = monotonic()
+
+
+class ReplicaRouter:
+    """
+    Session factory that sends reads to read replicas and keeps recent writers on the primary.
+    """
+
+    def __init__(
+        self,
+        primary_factory,
+        replicas: List[Tuple[object, object]],
+        strategy: str = "round_robin",
+        read_your_writes_seconds: float = 1.0,
+    ):
+        """
+        Args:
+            primary_factory: Session factory bound to the primary.
+            replicas (List[Tuple[object, object]]): `(engine, session_factory)` pairs, one per replica.
+            strategy (str): "round_robin" or "least_connections".
+            read_your_writes_seconds (float): How long after a write to a table its reads stay on the primary.
+        """
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy '{strategy}'.")
+
+        self.primary_factory = primary_factory
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._counter = count()
+        self._lock = Lock()
+
+    def __call__(self, table_name: Optional[str] = None):
+        """
+        Open a session for a read of `table_name`.
+        """
+        if self._use_primary(table_name):
+            return self.primary_factory()
+        return self._pick_replica()()
+
+    def _use_primary(self, table_name: Optional[str]) -> bool:
+        if not self.replicas or _wrote_in_context.get():
+            return True
+        if table_name is None:
+            return False
+        last_write = _last_write_at.get(table_name)
+        return last_write is not None and monotonic() - last_write < self.read_your_writes_seconds
+
+    def _pick_replica(self):
+        if self.strategy == "least_connections":
+            engine, factory = min(self.replicas, key=lambda replica: self._checked_out(replica[0]))
+            return factory
+
+        with self._lock:
+            index = next(self._counter) % len(self.replicas)
+        return self.replicas[index][1]
+
+    @staticmethod
+    def _checked_out(engine) -> int:
+        return getattr(engine, "sync_engine", engine).pool.checkedout()
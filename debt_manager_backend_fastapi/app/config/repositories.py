@@ -0,0 +1,53 @@
+import os
+import uuid
+from typing import Dict
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Storage behind the repositories
+REPOSITORY_BACKENDS = {"postgres", "memory"}
+
+# Repository settings
+REPOSITORY_SETTINGS = {
+    # "postgres", or "memory" to serve the API (and the benchmarks) without a database
+    "backend": os.getenv("REPOSITORY_BACKEND", "postgres").lower(),
+    # Statuses of the memory backend, which has no "Status" table
+    "memory_statuses": [
+        name.strip() for name in os.getenv("REPOSITORY_MEMORY_STATUSES", "pending,paid,overdue").split(",")
+        if name.strip()
+    ],
+}
+
+
+def repository_backend() -> str:
+    """
+    The configured repository backend.
+
+    Raises:
+        ValueError: If REPOSITORY_BACKEND is not a known backend.
+    """
+    backend = REPOSITORY_SETTINGS["backend"]
+    if backend not in REPOSITORY_BACKENDS:
+        raise ValueError(
+            f"Unknown repository backend '{backend}'. Use one of: {', '.join(sorted(REPOSITORY_BACKENDS))}."
+        )
+    return backend
+
+
+def uses_database() -> bool:
+    """Whether the repositories are backed by PostgreSQL (and the database must be reachable)."""
+    return repository_backend() == "postgres"
+
+
+def memory_statuses() -> Dict[str, str]:
+    """
+    Name to ID of the memory backend's statuses. IDs are derived from the names,
+    so they are the same across restarts and workers.
+    """
+    return {
+        name: str(uuid.uuid5(uuid.NAMESPACE_URL, f"debt-manager:status:{name}"))
+        for name in REPOSITORY_SETTINGS["memory_statuses"]
+    }
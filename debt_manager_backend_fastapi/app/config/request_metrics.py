@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Request metrics settings
+REQUEST_METRICS_SETTINGS = {
+    "enabled": os.getenv("REQUEST_METRICS_ENABLED", "true").lower() == "true",
+    # Shared by all the workers of one server; the process manager should empty it on start
+    "multiprocess_dir": os.getenv("PROMETHEUS_MULTIPROC_DIR") or None,
+    # How often each worker publishes its metrics to `multiprocess_dir`
+    "flush_seconds": float(os.getenv("REQUEST_METRICS_FLUSH_SECONDS", 1)),
+}
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Route label of requests that matched no route, so unknown paths do not create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteMetrics:
+    """
+    Request counters by status, in-flight gauge and duration histogram for
+    one method and route template.
+    """
+
+    __slots__ = ("statuses", "bucket_counts", "duration_sum", "in_flight")
+
+    def __init__(self):
+        self.statuses: Dict[str, int] = {}
+        self.bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.in_flight = 0
+
+    def observe(self, status: int, seconds: float):
+        status = str(status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bucket_counts[bisect_left(DURATION_BUCKETS, seconds)] += 1
+        self.duration_sum += seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "statuses": dict(self.statuses),
+            "bucket_counts": list(self.bucket_counts),
+            "duration_sum": self.duration_sum,
+            "in_flight": self.in_flight,
+        }
+
+
+class RequestMetrics:
+    """
+    Per-route request metrics of this worker, rendered in the Prometheus text format.
+
+    Metrics are only updated from the event loop, so no locking is needed.
+    With a `multiprocess_dir`, every worker periodically writes its snapshot
+    there and `/metrics` adds up the snapshots of all workers, whichever
+    worker answers the scrape. Counters of workers that have exited are kept,
+    so totals never go backwards; their in-flight gauges are dropped.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_seconds: float = 1.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_seconds = flush_seconds
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        """The metrics of `method` on the route template `route`, created on first use."""
+        key = (method, route)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes[key] = RouteMetrics()
+        return metrics
+
+    def snapshot(self) -> List[Dict]:
+        """Plain-data copy of this worker's metrics."""
+        return [
+            {"method": method, "route": route, **metrics.to_dict()}
+            for (method, route), metrics in self._routes.items()
+        ]
+
+    async def exposition(self) -> str:
+        """
+        The metrics to report in the Prometheus text format: this worker's, or
+        the sum over all workers in multiprocess mode (files are read in a worker thread).
+        """
+        series = self.snapshot()
+        if self.multiprocess_dir:
+            series = await run_in_threadpool(self._merge, series)
+        return render(series)
+
+    def _merge(self, series: List[Dict]) -> List[Dict]:
+        self._write(os.getpid(), series)
+        merged: Dict[Tuple[str, str], Dict] = {}
+        for pid, worker_series in self._read_all():
+            alive = _process_alive(pid)
+            for entry in worker_series:
+                total = merged.setdefault(
+                    (entry["method"], entry["route"]),
+                    {"method": entry["method"], "route": entry["route"], "statuses": {},
+                     "bucket_counts": [0] * (len(DURATION_BUCKETS) + 1), "duration_sum": 0.0, "in_flight": 0},
+                )
+                for status, count in entry["statuses"].items():
+                    total["statuses"][status] = total["statuses"].get(status, 0) + count
+                total["bucket_counts"] = [a + b for a, b in zip(total["bucket_counts"], entry["bucket_counts"])]
+                total["duration_sum"] += entry["duration_sum"]
+                if alive:
+                    total["in_flight"] += entry["in_flight"]
+        return list(merged.values())
+
+    async def flush(self):
+        """Publish this worker's snapshot to the multiprocess directory."""
+        if self.multiprocess_dir:
+            await run_in_threadpool(self._write, os.getpid(), self.snapshot())
+
+    def start(self):
+        """Start publishing this worker's metrics periodically (multiprocess mode only)."""
+        if self.multiprocess_dir and self._flusher is None:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flush and publish the final snapshot."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error publishing request metrics: {e}")
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"requests_{pid}.json")
+
+    def _write(self, pid: int, series: List[Dict]):
+        # Write then rename, so readers never see a partial file
+        path = self._path(pid)
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(series, file)
+        os.replace(f"{path}.tmp", path)
+
+    def _read_all(self) -> Iterable[Tuple[int, List[Dict]]]:
+        for name in os.listdir(self.multiprocess_dir):
+            if not (name.startswith("requests_") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as file:
+                    yield int(name[len("requests_"):-len(".json")]), json.load(file)
+            except (OSError, ValueError):
+                continue
+
+
+def render(series: List[Dict]) -> str:
+    """Request metrics (as returned by `RequestMetrics.snapshot`) in the Prometheus text format 0.0.4."""
+    series = sorted(series, key=lambda entry: (entry["route"], entry["method"]))
+    lines = [
+        "# HELP http_requests_total Requests handled, by method, route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for entry in series:
+        for status, count in sorted(entry["statuses"].items()):
+            lines.append(f"http_requests_total{_labels(entry, status=status)} {count}")
+
+    lines += [
+        "# HELP http_requests_in_flight Requests currently being handled, by method and route template.",
+        "# TYPE http_requests_in_flight gauge",
+    ]
+    for entry in series:
+        lines.append(f"http_requests_in_flight{_labels(entry)} {entry['in_flight']}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request duration, by method and route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for entry in series:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, entry["bucket_counts"]):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket{_labels(entry, le=repr(bound))} {cumulative}")
+        cumulative += entry["bucket_counts"][-1]
+        lines.append(f"http_request_duration_seconds_bucket{_labels(entry, le='+Inf')} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(entry)} {entry['duration_sum']}")
+        lines.append(f"http_request_duration_seconds_count{_labels(entry)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(entry: Dict, **extra: str) -> str:
+    labels = {"method": entry["method"], "route": entry["route"], **extra}
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+# Shared metrics of this worker, fed by the metrics middleware
+request_metrics = RequestMetrics(
+    REQUEST_METRICS_SETTINGS["multiprocess_dir"], REQUEST_METRICS_SETTINGS["flush_seconds"]
+)
@@ -19,7 +19,7 @@ class AuthController:
         Register a new user.
         """
         try:
-            new_user = self.auth_service.register_user(user)
+            new_user = await self.auth_service.register_user(user)
             return new_user
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -28,6 +28,6 @@ class AuthController:
 
     async def login(self, user: UserRequest):
         try:
-            return self.auth_service.authenticate(user.email, user.password)
+            return await self.auth_service.authenticate(user.email, user.password)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
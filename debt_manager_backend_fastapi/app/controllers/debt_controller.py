@@ -18,7 +18,7 @@ class DebtController:
         Get all debts with pagination and return a list of DebtResponse objects.
         """
         try:
-            debt_responses = self.debt_service.get_all_debts(skip, limit)
+            debt_responses = await self.debt_service.get_all_debts(skip, limit)
             return debt_responses
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
@@ -28,7 +28,7 @@ class DebtController:
         Create a new debt.
         """
         try:
-            return self.debt_service.create_debt(debt)
+            return await self.debt_service.create_debt(debt)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -37,7 +37,7 @@ class DebtController:
         Get a debt by ID.
         """
         try:
-            return self.debt_service.get_debt_by_id(debt_id)
+            return await self.debt_service.get_debt_by_id(debt_id)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -46,7 +46,7 @@ class DebtController:
         Delete a debt by ID.
         """
         try:
-            self.debt_service.delete_debt(debt_id)
+            await self.debt_service.delete_debt(debt_id)
             return {"message": f"Debt {debt_id} deleted successfully."}
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
@@ -56,7 +56,7 @@ class DebtController:
         Paginate debts with metadata.
         """
         try:
-            debts = self.debt_service.paginate_debts(page, page_size)
+            debts = await self.debt_service.paginate_debts(page, page_size)
             return debts
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
@@ -17,7 +17,7 @@ class UserController:
         Get all users with pagination and return a list of UserResponse objects.
         """
         try:
-            user_responses = self.user_service.get_all_users(skip, limit)
+            user_responses = await self.user_service.get_all_users(skip, limit)
             return user_responses
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
@@ -27,7 +27,7 @@ class UserController:
         Create a new user.
         """
         try:
-            return self.user_service.create_user(user)
+            return await self.user_service.create_user(user)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
@@ -36,7 +36,7 @@ class UserController:
         Get a user by ID.
         """
         try:
-            return self.user_service.get_user_by_id(user_id)
+            return await self.user_service.get_user_by_id(user_id)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -45,7 +45,7 @@ class UserController:
         Delete a user by ID.
         """
         try:
-            self.user_service.delete_user(user_id)
+            await self.user_service.delete_user(user_id)
             return {"message": f"User {user_id} deleted successfully."}
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
@@ -56,7 +56,7 @@ class UserController:
         Paginate users with metadata.
         """
         try:
-            users = self.user_service.paginate_users(page, page_size)
+            users = await self.user_service.paginate_users(page, page_size)
             raise HTTPException(status_code=200, detail="Operação realizada com sucesso", data=users)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
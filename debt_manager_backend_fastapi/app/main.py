@@ -1,11 +1,27 @@
 from fastapi import FastAPI
-from app.repositories.debt_repository import DebtRepository
+from app.config.cache import follow_invalidations
+from app.config.database import async_engine, async_replicas
+from app.config.notifications import notification_listener
+from app.config.repositories import memory_statuses, uses_database
+from app.config.request_metrics import request_metrics
+from app.middlewares.compression import CompressionMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.middlewares.query_tracking import QueryTrackingMiddleware
+from app.models.serialization import FastJSONResponse
+from app.repositories.async_debt_repository import AsyncDebtRepository
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.memory_debt_repository import AsyncInMemoryDebtRepository
+from app.repositories.memory_user_repository import AsyncInMemoryUserRepository
+from app.repositories.status_registry import status_registry
 from app.routers.auth_router import AuthRouter
 from app.routers.debt_router import DebtRouter
+from app.routers.internal_router import InternalRouter
+from app.routers.metrics_router import MetricsRouter
 from app.routers.user_router import UserRouter
 from app.services.auth_service import AuthService
-from app.repositories.user_repository import UserRepository
+from app.services.debt_import_service import DebtImportService
 from app.services.debt_service import DebtService
+from app.services.password_hasher import PasswordHasher
 from app.services.user_service import UserService
 
 # FastAPI App Initialization
@@ -16,26 +32,84 @@ app = FastAPI(
         "It provides endpoints for user authentication, debt tracking, and overall debt management."
     ),
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Compress responses (gzip, plus brotli/zstd when installed) per Accept-Encoding
+app.add_middleware(CompressionMiddleware)
+
+# SQL statements per request: N+1 detection, and X-Query-Count headers in debug mode
+app.add_middleware(QueryTrackingMiddleware)
+
+# Per-route request metrics, served on /metrics (outermost, so compression time is included)
+app.add_middleware(MetricsMiddleware, router=app.router)
+
+# Password hashing, on its own bounded worker pool
+password_hasher = PasswordHasher()
+
+# Repositories: PostgreSQL, or in memory with REPOSITORY_BACKEND=memory (no database needed)
+if uses_database():
+    user_repository = AsyncUserRepository()
+    debt_repository = AsyncDebtRepository()
+else:
+    user_repository = AsyncInMemoryUserRepository()
+    debt_repository = AsyncInMemoryDebtRepository()
+
 # Dependency Injection for User
-user_repository = UserRepository()
-user_service = UserService(user_repository)
+user_service = UserService(user_repository, password_hasher)
 user_router = UserRouter(user_service)
 
 # Dependency Injection for Auth
-auth_service = AuthService(user_repository)  # Auth depends on UserRepository
+auth_service = AuthService(user_repository, password_hasher)  # Auth depends on AsyncUserRepository
 auth_router = AuthRouter(auth_service)
 
 # Dependency Injection for Debt
-debt_repository = DebtRepository()
 debt_service = DebtService(debt_repository)
-debt_router = DebtRouter(debt_service)
+debt_import_service = DebtImportService(debt_repository)
+debt_router = DebtRouter(debt_service, debt_import_service)
 
 # Initialize Routers
 user_router.initialize(app)
 auth_router.initialize(app)
 debt_router.initialize(app)
+InternalRouter().initialize(app)
+MetricsRouter().initialize(app)
+
+@app.on_event("startup")
+def start_status_registry():
+    """
+    Load the statuses before serving requests, then follow their changes and the
+    entity cache invalidations sent by the other workers.
+    """
+    if uses_database():
+        follow_invalidations(notification_listener)
+        status_registry.start()
+    else:
+        status_registry.replace(memory_statuses())
+
+@app.on_event("startup")
+async def start_request_metrics():
+    """Publish this worker's request metrics for the other workers' /metrics."""
+    request_metrics.start()
+
+@app.on_event("shutdown")
+async def stop_request_metrics():
+    await request_metrics.stop()
+
+@app.on_event("shutdown")
+def stop_notification_listener():
+    notification_listener.stop()
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Close the async connection pools when the worker stops."""
+    await async_engine.dispose()
+    for replica_engine, _ in async_replicas:
+        await replica_engine.dispose()
 
 if __name__ == "__main__":
     import uvicorn
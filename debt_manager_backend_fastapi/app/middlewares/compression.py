@@ -0,0 +1,300 @@
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.middlewares.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # Opcional: sem ele, "br" não é oferecido
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Opcional: sem ele, "zstd" não é oferecido
+    zstandard = None
+
+# Carregar variáveis de ambiente do arquivo .env
+load_dotenv()
+
+# Configuração da compressão de respostas
+COMPRESSION_SETTINGS = {
+    "enabled": os.getenv("COMPRESSION_ENABLED", "true").lower() == "true",
+    # Corpos menores que isso saem sem compressão
+    "minimum_size": int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)),
+    # Codificações por ordem de preferência do servidor (empates de q no Accept-Encoding)
+    "encodings": [
+        encoding.strip()
+        for encoding in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+        if encoding.strip()
+    ],
+    "gzip_level": int(os.getenv("COMPRESSION_GZIP_LEVEL", 5)),
+    "brotli_quality": int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4)),
+    "zstd_level": int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3)),
+    # Corpos completos acima disso são comprimidos fora do event loop
+    "threadpool_size": int(os.getenv("COMPRESSION_THREADPOOL_SIZE", 256 * 1024)),
+}
+
+# Tipos de conteúdo que valem a pena comprimir; o resto (imagens, zip...) já vem comprimido
+_COMPRESSIBLE_TYPE = re.compile(
+    r"^(text/|application/(json|x-ndjson|xml|javascript|problem\+json)|application/[\w.+-]+\+(json|xml))",
+    re.IGNORECASE,
+)
+
+_NO_BODY_STATUS = {204, 304}
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> Dict[str, Tuple[type, str]]:
+    """
+    Codificadores suportados neste ambiente, com a chave de configuração do nível.
+    """
+    encoders = {"gzip": (GzipEncoder, "gzip_level")}
+    if brotli is not None:
+        encoders["br"] = (BrotliEncoder, "brotli_quality")
+    if zstandard is not None:
+        encoders["zstd"] = (ZstdEncoder, "zstd_level")
+    return encoders
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Lê um cabeçalho Accept-Encoding como {codificação: q}.
+    """
+    accepted = {}
+    for item in (header or "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], preferred: List[str]) -> Optional[str]:
+    """
+    Escolhe a codificação para a resposta: a de maior q aceita pelo cliente,
+    desempatando pela ordem de `preferred`. None se nenhuma servir.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for name in preferred:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime as respostas com gzip, brotli ou zstd,
+    conforme o Accept-Encoding do cliente e as bibliotecas instaladas.
+
+    Respostas de corpo único são comprimidas de uma vez (as grandes numa
+    thread, fora do event loop). Respostas em streaming, como o export, são
+    comprimidas pedaço a pedaço, com um flush por pedaço para que o cliente
+    receba os dados conforme são gerados. Ficam de fora corpos menores que
+    `minimum_size`, tipos já comprimidos e respostas que já têm
+    Content-Encoding.
+
+    Toda resposta leva `Vary: Accept-Encoding`, comprimida ou não, já que o
+    corpo depende do cabeçalho. Uma resposta comprimida ganha o sufixo da
+    codificação na ETag (`"abc-gzip"`), pois é outra representação, assim como
+    o 304 que a valida; as validações condicionais da API
+    (`app.middlewares.etag`) ignoram o sufixo.
+    """
+
+    def __init__(self, app, settings: Optional[Dict] = None):
+        self.app = app
+        self.settings = {**COMPRESSION_SETTINGS, **(settings or {})}
+        encoders = available_encoders()
+        self.encoders = {
+            name: (encoders[name][0], self.settings[encoders[name][1]])
+            for name in self.settings["encodings"]
+            if name in encoders
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.settings["enabled"]:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), list(self.encoders))
+        if encoding is None or scope.get("method") == "HEAD":
+            async def send_with_vary(message):
+                await send(_with_vary(message) if message["type"] == "http.response.start" else message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def encoder(self, encoding: str):
+        encoder_class, level = self.encoders[encoding]
+        return encoder_class(level)
+
+
+def _with_vary(start: Dict) -> Dict:
+    """O início de uma resposta com `Accept-Encoding` no Vary."""
+    headers = MutableHeaders(raw=list(start["headers"]))
+    headers.add_vary_header("Accept-Encoding")
+    return {**start, "headers": headers.raw}
+
+
+class _CompressingResponder:
+    """Estado de uma resposta: decide se comprime ao ver o cabeçalho e o começo do corpo."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start = None
+        self._buffer = b""
+        self._encoder = None
+        self._passthrough = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = (
+                message["status"] in _NO_BODY_STATUS
+                or "content-encoding" in headers
+                or not _COMPRESSIBLE_TYPE.match(headers.get("content-type", ""))
+            )
+            if self._passthrough:
+                if message["status"] == 304 and "etag" in headers:
+                    # Validates the compressed representation, so it carries its ETag
+                    message = {**message, "headers": self._encoded_etag_headers(message)}
+                await self._send(_with_vary(message))
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._encoder is not None:
+            await self._send_chunk(body, more_body)
+            return
+
+        self._buffer += body
+        minimum_size = self.middleware.settings["minimum_size"]
+
+        if not more_body:
+            # Corpo completo: comprime de uma vez, ou envia como está se for pequeno
+            if len(self._buffer) < minimum_size:
+                await self._send_uncompressed()
+                return
+            compressed = await self._compress_whole(self._buffer)
+            await self._send_start(content_length=len(compressed))
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        if len(self._buffer) >= minimum_size:
+            # Streaming: daqui em diante, cada pedaço sai comprimido
+            self._encoder = self.middleware.encoder(self.encoding)
+            await self._send_start(content_length=None)
+            buffered, self._buffer = self._buffer, b""
+            await self._send_chunk(buffered, True)
+
+    async def _send_chunk(self, body: bytes, more_body: bool):
+        data = self._encoder.compress(body)
+        data += self._encoder.flush() if more_body else self._encoder.finish()
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_uncompressed(self):
+        await self._send(_with_vary(self._start))
+        await self._send({"type": "http.response.body", "body": self._buffer})
+
+    async def _send_start(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=list(self._start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+        if content_length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        await self._send({**self._start, "headers": headers.raw})
+
+    def _encoded_etag_headers(self, start: Dict) -> List[Tuple[bytes, bytes]]:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+        return headers.raw
+
+    async def _compress_whole(self, body: bytes) -> bytes:
+        encoder = self.middleware.encoder(self.encoding)
+
+        def compress():
+            return encoder.compress(body) + encoder.finish()
+
+        if len(body) >= self.middleware.settings["threadpool_size"]:
+            return await run_in_threadpool(compress)
+        return compress()
@@ -0,0 +1,100 @@
+import hashlib
+import re
+from typing import Iterable, List, Optional
+
+# Valor de If-Match / If-None-Match que corresponde a qualquer representação
+ANY_ETAG = "*"
+
+_ETAG_PATTERN = re.compile(r'\s*((?:W/)?"[^"]*")\s*(?:,|$)')
+
+# Codificações cujo sufixo a compressão acrescenta à ETag (ex.: `"abc-gzip"`)
+CONTENT_CODINGS = ("gzip", "br", "zstd")
+
+_CODING_SUFFIX = re.compile(rf'-(?:{"|".join(CONTENT_CODINGS)})"$')
+
+
+def version_etag(record_id, version: int) -> str:
+    """
+    ETag forte de um registro versionado: muda a cada atualização da linha.
+
+    Args:
+        record_id: ID do registro.
+        version (int): Versão atual da linha.
+
+    Returns:
+        str: A ETag, já entre aspas.
+    """
+    return f'"{record_id}-v{version}"'
+
+
+def digest_etag(parts: Iterable) -> str:
+    """
+    ETag forte calculada a partir de valores que identificam a representação
+    (ex.: pares ID/versão de uma página), sem serializar o corpo da resposta.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag da representação comprimida com `encoding`: cada codificação é uma
+    representação diferente, então ganha uma ETag própria (`"abc"` -> `"abc-gzip"`).
+    """
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def _opaque_tag(tag: str) -> str:
+    """A ETag sem o prefixo `W/` e sem o sufixo de codificação."""
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return _CODING_SUFFIX.sub('"', tag)
+
+
+def parse_etags(header: Optional[str]) -> List[str]:
+    """
+    Separa a lista de ETags de um cabeçalho If-Match / If-None-Match.
+    """
+    if not header:
+        return []
+    if header.strip() == ANY_ETAG:
+        return [ANY_ETAG]
+    return _ETAG_PATTERN.findall(header)
+
+
+def none_match(header: Optional[str], etag: str) -> bool:
+    """
+    Indica se a condição If-None-Match falha para `etag`, ou seja, se a
+    resposta pode ser 304 (comparação fraca: o prefixo `W/` e o sufixo de
+    codificação são ignorados).
+    """
+    tags = parse_etags(header)
+    if ANY_ETAG in tags:
+        return True
+    weak = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == weak for tag in tags)
+
+
+def version_from_if_match(header: Optional[str], record_id) -> Optional[int]:
+    """
+    Extrai a versão esperada de um If-Match com uma ETag de `version_etag`.
+
+    Returns:
+        Optional[int]: A versão, ou None para `*` (qualquer versão).
+
+    Raises:
+        ValueError: Se nenhuma ETag forte do registro estiver no cabeçalho.
+    """
+    tags = parse_etags(header)
+    if ANY_ETAG in tags:
+        return None
+    pattern = re.compile(rf'"{re.escape(str(record_id))}-v(\d+)"', re.IGNORECASE)
+    for tag in tags:
+        # Tags fracas (W/) nunca satisfazem If-Match; a versão é a mesma em qualquer codificação
+        match = pattern.fullmatch(_CODING_SUFFIX.sub('"', tag))
+        if match:
+            return int(match.group(1))
+    raise ValueError("O If-Match não corresponde a uma versão do recurso.")
@@ -1,6 +1,14 @@
+import hashlib
 import jwt
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
 from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
@@ -11,6 +19,98 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise RuntimeError("SECRET_KEY não foi definido no .env")
 
+# Cache de tokens já verificados
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", 10000))
+# Tempo máximo em cache, inclusive para tokens sem `exp`
+JWT_CACHE_TTL_SECONDS = float(os.getenv("JWT_CACHE_TTL_SECONDS", 300))
+
+
+class VerifiedTokenCache:
+    """
+    Cache LRU limitado de tokens cuja assinatura já foi verificada.
+
+    A chave é o SHA-256 do token (o token em si não fica em memória). Cada
+    entrada vale até o `exp` do token, limitado a `ttl_seconds`, e o cache
+    inteiro é descartado quando a chave secreta muda.
+    """
+
+    def __init__(self, max_entries: int = JWT_CACHE_MAX_ENTRIES, ttl_seconds: float = JWT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self._secret: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str, secret: str) -> Optional[dict]:
+        """
+        Retorna uma cópia do payload verificado, ou None se o token não estiver em cache.
+        """
+        key = self.key(token)
+        with self._lock:
+            if secret != self._secret:
+                self._entries.clear()
+                self._secret = secret
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return dict(payload)
+
+    def set(self, token: str, payload: dict, secret: str):
+        """
+        Guarda o payload de um token recém-verificado com a chave `secret`.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        key = self.key(token)
+        with self._lock:
+            if secret != self._secret:
+                return
+            self._entries[key] = (dict(payload), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def rotate_secret_key(secret_key: str):
+    """
+    Troca a chave secreta usada para assinar e verificar tokens.
+
+    Tokens verificados com a chave anterior deixam de ser aceitos pelo cache.
+    """
+    global SECRET_KEY
+    if not secret_key:
+        raise ValueError("A chave secreta não pode ser vazia.")
+    SECRET_KEY = secret_key
+    verified_tokens.clear()
+
 def generate_jwt(password: str) -> str:
     """
     Gera um token JWT baseado na senha.
@@ -27,6 +127,9 @@ def generate_jwt(password: str) -> str:
 def decode_jwt(token: str) -> dict:
     """
     Decodifica um token JWT assinado usando HS256.
+
+    Tokens já verificados são servidos pelo cache `verified_tokens`, sem nova
+    verificação da assinatura, até expirarem.
     
     Args:
         token (str): Token JWT a ser decodificado.
@@ -34,15 +137,52 @@ def decode_jwt(token: str) -> dict:
     Returns:
         dict: Dados contidos no token JWT.
     """
+    secret_key = SECRET_KEY
+    payload = verified_tokens.get(token, secret_key)
+    if payload is not None:
+        return payload
+
     try:
         # Decodificar o token JWT
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        payload = jwt.decode(token, secret_key, algorithms=["HS256"])
+        verified_tokens.set(token, payload, secret_key)
         return payload
     except jwt.ExpiredSignatureError:
         raise RuntimeError("O token expirou.")
     except jwt.InvalidTokenError:
         raise RuntimeError("Token inválido.")
 
+
+_bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_token_claims(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer_scheme),
+) -> dict:
+    """
+    Dependência do FastAPI que autentica a requisição uma única vez.
+
+    As claims decodificadas ficam em `request.state.claims`, para que outras
+    dependências e os serviços as reutilizem sem decodificar o token de novo.
+
+    Raises:
+        HTTPException: 401 se o token estiver ausente, inválido ou expirado.
+    """
+    claims = getattr(request.state, "claims", None)
+    if claims is not None:
+        return claims
+
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Token não informado.", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        claims = decode_jwt(credentials.credentials)
+    except RuntimeError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+    request.state.claims = claims
+    return claims
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Dados de exemplo (payload)
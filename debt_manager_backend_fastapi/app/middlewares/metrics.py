@@ -0,0 +1,68 @@
+from time import perf_counter
+
+from starlette.routing import Match
+
+from app.config.request_metrics import REQUEST_METRICS_SETTINGS, UNMATCHED_ROUTE, RequestMetrics, request_metrics
+
+# Métodos com série própria; qualquer outro vira "other", para o cliente não criar séries à vontade
+STANDARD_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+OTHER_METHOD = "other"
+
+
+def route_template(routes, scope) -> str:
+    """
+    Caminho parametrizado (ex.: `/debts/{debt_id}`) da rota que atende a
+    requisição, para que cada rota gere uma única série de métricas.
+    """
+    partial = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # Caminho certo, método errado (405)
+    return partial or UNMATCHED_ROUTE
+
+
+def method_label(method: str) -> str:
+    """
+    Rótulo do método HTTP nas métricas: o próprio método, se for um dos padrão.
+    """
+    return method if method in STANDARD_METHODS else OTHER_METHOD
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP por método e rota:
+    contagem por status, requisições em andamento e histograma de duração.
+
+    A duração vai até o último pedaço do corpo ser enviado, então inclui o
+    streaming de respostas como o export.
+    """
+
+    def __init__(self, app, router, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.router = router
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REQUEST_METRICS_SETTINGS["enabled"]:
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics.route(method_label(scope["method"]), route_template(self.router.routes, scope))
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(status, perf_counter() - start)
@@ -0,0 +1,37 @@
+from starlette.datastructures import MutableHeaders
+
+from app.config.query_metrics import QueryMetrics, query_metrics
+
+
+class QueryTrackingMiddleware:
+    """
+    Middleware ASGI que conta as consultas SQL de cada requisição.
+
+    As contagens alimentam o log de N+1 de `QueryMetrics`; em modo debug,
+    também saem nos cabeçalhos `X-Query-Count` e `X-Query-Time-Ms` (medidos
+    até o início da resposta).
+    """
+
+    def __init__(self, app, metrics: QueryMetrics = query_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.settings["enabled"]:
+            await self.app(scope, receive, send)
+            return
+
+        token = self.metrics.begin_request(scope)
+        queries = self.metrics.current_request()
+
+        async def send_with_counts(message):
+            if message["type"] == "http.response.start" and self.metrics.settings["debug_headers"]:
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(queries.count)
+                headers["X-Query-Time-Ms"] = f"{queries.seconds * 1000:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_counts)
+        finally:
+            self.metrics.end_request(token)
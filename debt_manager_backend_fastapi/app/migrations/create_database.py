@@ -1,47 +1,8 @@
-from sqlalchemy import Float, Text, create_engine, Sequence
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func, UUID
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 import psycopg2
 from app.config.vars import DATABASE_URL, DATABASE_CONFIG
-
-# Base for SQLAlchemy models
-Base = declarative_base()
-
-# Example Models for Tables
-class User(Base):
-    __tablename__ = "Users"
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.public.generate_sequential_uuid('public.users_users_uuid_seq'))
-    username = Column(String, nullable=False, unique=True)
-    email = Column(String, nullable=False, unique=True)
-    hashed_password = Column(String, nullable=False)
-
-class Debt(Base):
-    __tablename__ = "Debts"
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.public.generate_sequential_uuid('public.debts_debts_uuid_seq'))
-    user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("Users.id"), nullable=False)
-    description = Column(String(255), nullable=False)
-    amount = Column(Float, nullable=False)
-    debtor_name = Column(String(100), nullable=False)
-    creditor_name = Column(String(100), nullable=False)
-    due_date = Column(DateTime, nullable=True)
-    debt_closing_date = Column(DateTime, nullable=True)
-    status_id = Column(UUID(as_uuid=True), ForeignKey('Status.id'), nullable=False)
-    notes = Column(Text, nullable=True)
-
-class Status(Base):
-    __tablename__ = "Status"
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.public.generate_sequential_uuid('public.status_status_uuid_seq'))
-    name = Column(String, nullable=False, unique=True)
-
-class Logs(Base):
-    __tablename__ = "Logs"
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.public.generate_sequential_uuid('public.logs_debts_uuid_seq'))
-    action = Column(String, nullable=False)
-    details = Column(String, nullable=True)
-    timestamp = Column(DateTime, server_default=func.now(), nullable=False)
-    user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("Users.id"), nullable=True)
+from app.migrations.runner import MigrationRunner
 
 # Database Connection Handler
 class DatabaseConnection:
@@ -127,17 +88,13 @@ class DatabaseCreator:
 
 # Schema Initializer
 class DatabaseInitializer:
-    """Responsible for initializing the database schema."""
+    """Brings the database schema up to the latest migration."""
 
     def __init__(self, engine):
         self.engine = engine
 
     def initialize_schema(self):
-        try:
-            Base.metadata.create_all(bind=self.engine)
-            print("All tables created successfully.")
-        except Exception as e:
-            raise RuntimeError(f"Error initializing the database schema: {e}")
+        MigrationRunner(self.engine).upgrade()
 
 # Database Engine and Session Configuration
 class DatabaseConfig:
@@ -0,0 +1,16 @@
+from time import perf_counter
+
+from app.repositories.debt_summary_repository import DebtSummaryRepository
+
+# Main Function
+def main():
+    """Recompute the debt summary table from scratch."""
+    try:
+        start = perf_counter()
+        rows = DebtSummaryRepository().rebuild()
+        print(f"Debt summary rebuilt: {rows} groups in {perf_counter() - start:.2f}s.")
+    except RuntimeError as e:
+        print(e)
+
+if __name__ == "__main__":
+    main()
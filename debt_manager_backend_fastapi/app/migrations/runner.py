@@ -0,0 +1,255 @@
+import importlib
+import pkgutil
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, List, Optional, Sequence, Union
+
+from sqlalchemy import text
+
+# Table recording the applied migrations
+SCHEMA_MIGRATIONS_TABLE = "Schema_migrations"
+
+# Advisory lock key held while migrating, so two runners never interleave
+MIGRATION_LOCK_KEY = 727274
+
+# Package holding one module per migration
+VERSIONS_PACKAGE = "app.migrations.versions"
+
+
+class Step:
+    """
+    One migration step: a SQL statement, or a callable receiving the connection.
+
+    Transactional steps of a migration run in one transaction together with the
+    version bookkeeping. Non-transactional steps (e.g. `CREATE INDEX CONCURRENTLY`,
+    which PostgreSQL refuses inside a transaction block) run one by one in autocommit.
+    """
+
+    def __init__(self, operation: Union[str, Callable], description: Optional[str] = None, transactional: bool = True):
+        self.operation = operation
+        self.description = description or (operation if isinstance(operation, str) else operation.__name__)
+        self.description = " ".join(self.description.split())
+        self.transactional = transactional
+
+    def run(self, connection):
+        if isinstance(self.operation, str):
+            connection.execute(text(self.operation))
+        else:
+            self.operation(connection)
+
+
+def concurrent_index(name: str, table: str, columns: str, unique: bool = False, using: str = "btree") -> Step:
+    """
+    Step that builds an index with `CREATE INDEX CONCURRENTLY`, without blocking writes.
+
+    An invalid index left by an interrupted build is dropped and rebuilt.
+
+    Args:
+        name (str): Index name.
+        table (str): Table name, as written in SQL (quoted if needed).
+        columns (str): Indexed columns or expressions.
+        unique (bool): Build a unique index.
+        using (str): Index access method (e.g. "btree", "gin").
+    """
+    def create(connection):
+        invalid = connection.execute(text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """), {"name": name}).first()
+        if invalid:
+            connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        connection.execute(text(
+            f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+            f'ON {table} USING {using} ({columns})'
+        ))
+
+    return Step(create, f"create {using} index {name} on {table} concurrently", transactional=False)
+
+
+def drop_concurrent_index(name: str) -> Step:
+    """Step that drops an index with `DROP INDEX CONCURRENTLY`."""
+    return Step(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"', f"drop index {name} concurrently", transactional=False)
+
+
+class Migration:
+    """
+    A numbered schema change with its upgrade and downgrade steps.
+    """
+
+    def __init__(self, version: int, name: str, up: Sequence[Union[Step, str]], down: Sequence[Union[Step, str]] = ()):
+        self.version = version
+        self.name = name
+        self.up = [step if isinstance(step, Step) else Step(step) for step in up]
+        self.down = [step if isinstance(step, Step) else Step(step) for step in down]
+
+
+def load_migrations(package: str = VERSIONS_PACKAGE) -> List[Migration]:
+    """
+    Import every module of the versions package and return their `migration`, ordered by version.
+
+    Raises:
+        RuntimeError: If two migrations share a version.
+    """
+    module = importlib.import_module(package)
+    migrations = []
+    for info in pkgutil.iter_modules(module.__path__):
+        migration = getattr(importlib.import_module(f"{package}.{info.name}"), "migration", None)
+        if migration is not None:
+            migrations.append(migration)
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {package}: {versions}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Applies and reverts versioned migrations, recording the schema version in the database.
+    """
+
+    def __init__(self, engine, migrations: Optional[List[Migration]] = None):
+        self.engine = engine
+        self.migrations = migrations if migrations is not None else load_migrations()
+
+    def applied_versions(self, connection) -> List[int]:
+        result = connection.execute(text(f'SELECT version FROM "{SCHEMA_MIGRATIONS_TABLE}" ORDER BY version'))
+        return [version for (version,) in result]
+
+    def current_version(self) -> int:
+        """The highest applied version, or 0 on an empty database."""
+        with self.engine.connect() as connection:
+            self._ensure_table(connection)
+            versions = self.applied_versions(connection)
+        return versions[-1] if versions else 0
+
+    def upgrade(self, target: Optional[int] = None):
+        """
+        Apply, in order, every pending migration up to `target` (default: the latest).
+        """
+        with self._locked() as connection:
+            applied = set(self.applied_versions(connection))
+            pending = [
+                migration for migration in self.migrations
+                if migration.version not in applied and (target is None or migration.version <= target)
+            ]
+            if not pending:
+                print("Schema is up to date.")
+            for migration in pending:
+                self._apply(connection, migration, migration.up, upgrading=True)
+
+    def downgrade(self, target: int):
+        """
+        Revert, newest first, every applied migration above `target`.
+        """
+        with self._locked() as connection:
+            applied = set(self.applied_versions(connection))
+            for migration in reversed(self.migrations):
+                if migration.version in applied and migration.version > target:
+                    self._apply(connection, migration, migration.down, upgrading=False)
+
+    def status(self):
+        """Print every known migration and whether it is applied."""
+        with self.engine.connect() as connection:
+            self._ensure_table(connection)
+            applied = set(self.applied_versions(connection))
+        for migration in self.migrations:
+            mark = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d} {migration.name}: {mark}")
+
+    def _apply(self, connection, migration: Migration, steps: List[Step], upgrading: bool):
+        print(f"{'Applying' if upgrading else 'Reverting'} {migration.version:04d} {migration.name}")
+        start = perf_counter()
+
+        transaction = connection.begin()
+        try:
+            for step in steps:
+                if not step.transactional:
+                    # Commit what came before: the step cannot run inside a transaction block
+                    transaction.commit()
+                    with self.engine.connect() as autocommit:
+                        self._run_step(autocommit.execution_options(isolation_level="AUTOCOMMIT"), step)
+                    transaction = connection.begin()
+                    continue
+                self._run_step(connection, step)
+
+            if upgrading:
+                connection.execute(
+                    text(f"""
+                        INSERT INTO "{SCHEMA_MIGRATIONS_TABLE}" (version, name, duration_ms)
+                        VALUES (:version, :name, :duration_ms)
+                    """),
+                    {"version": migration.version, "name": migration.name,
+                     "duration_ms": int((perf_counter() - start) * 1000)}
+                )
+            else:
+                connection.execute(
+                    text(f'DELETE FROM "{SCHEMA_MIGRATIONS_TABLE}" WHERE version = :version'),
+                    {"version": migration.version}
+                )
+            transaction.commit()
+        except Exception as e:
+            transaction.rollback()
+            raise RuntimeError(f"Migration {migration.version:04d} {migration.name} failed: {e}") from e
+
+        print(f"{'Applied' if upgrading else 'Reverted'} {migration.version:04d} in {perf_counter() - start:.2f}s")
+
+    @staticmethod
+    def _run_step(connection, step: Step):
+        start = perf_counter()
+        step.run(connection)
+        print(f"  {step.description} ({perf_counter() - start:.2f}s)")
+
+    @staticmethod
+    def _ensure_table(connection):
+        with connection.begin():
+            connection.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS "{SCHEMA_MIGRATIONS_TABLE}" (
+                    version integer PRIMARY KEY,
+                    name varchar(255) NOT NULL,
+                    applied_at timestamp NOT NULL DEFAULT now(),
+                    duration_ms integer NOT NULL
+                )
+            """))
+
+    @contextmanager
+    def _locked(self):
+        """Connection holding the migration advisory lock for the duration of the block."""
+        with self.engine.connect() as connection:
+            self._ensure_table(connection)
+            with connection.begin():
+                connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield connection
+            finally:
+                with connection.begin():
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+# Main Function
+def main(argv: Optional[List[str]] = None):
+    """
+    Usage: python -m app.migrations.runner [upgrade [version] | downgrade <version> | status]
+    """
+    from app.migrations.create_database import DatabaseConfig
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "upgrade"
+    runner = MigrationRunner(DatabaseConfig.get_engine())
+
+    try:
+        if command == "upgrade":
+            runner.upgrade(int(argv[1]) if len(argv) > 1 else None)
+        elif command == "downgrade" and len(argv) > 1:
+            runner.downgrade(int(argv[1]))
+        elif command == "status":
+            runner.status()
+        else:
+            print(main.__doc__.strip())
+    except RuntimeError as e:
+        print(e)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from app.migrations.runner import Migration
+
+# Tables previously created by `Base.metadata.create_all`; IF NOT EXISTS adopts existing databases
+migration = Migration(
+    version=1,
+    name="baseline schema",
+    up=[
+        """
+        CREATE TABLE IF NOT EXISTS "Users" (
+            id UUID PRIMARY KEY DEFAULT public.generate_sequential_uuid('public.users_users_uuid_seq'),
+            username VARCHAR(50) NOT NULL UNIQUE,
+            email VARCHAR(100) NOT NULL UNIQUE,
+            name VARCHAR(100) NOT NULL,
+            hashed_password VARCHAR NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Status" (
+            id UUID PRIMARY KEY DEFAULT public.generate_sequential_uuid('public.status_status_uuid_seq'),
+            name VARCHAR NOT NULL UNIQUE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Debts" (
+            id UUID PRIMARY KEY DEFAULT public.generate_sequential_uuid('public.debts_debts_uuid_seq'),
+            user_id UUID NOT NULL REFERENCES "Users" (id),
+            description VARCHAR(255) NOT NULL,
+            amount FLOAT NOT NULL,
+            debtor_name VARCHAR(100) NOT NULL,
+            creditor_name VARCHAR(100) NOT NULL,
+            due_date TIMESTAMP WITHOUT TIME ZONE,
+            debt_closing_date TIMESTAMP WITHOUT TIME ZONE,
+            status_id UUID NOT NULL REFERENCES "Status" (id),
+            notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Logs" (
+            id UUID PRIMARY KEY DEFAULT public.generate_sequential_uuid('public.logs_debts_uuid_seq'),
+            action VARCHAR NOT NULL,
+            details VARCHAR,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            user_id UUID REFERENCES "Users" (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Debt_summary" (
+            user_id UUID NOT NULL,
+            status_id UUID NOT NULL,
+            creditor_name VARCHAR(100) NOT NULL,
+            debt_count BIGINT NOT NULL DEFAULT 0,
+            total_amount NUMERIC NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, status_id, creditor_name)
+        )
+        """,
+        # Count the debts that already exist: writes only apply deltas to the summary
+        'LOCK TABLE "Debts" IN SHARE MODE',
+        'DELETE FROM "Debt_summary"',
+        """
+        INSERT INTO "Debt_summary" (user_id, status_id, creditor_name, debt_count, total_amount)
+        SELECT user_id, status_id, creditor_name, count(*), sum(CAST(amount AS numeric))
+        FROM "Debts"
+        GROUP BY user_id, status_id, creditor_name
+        """,
+    ],
+    down=[
+        'DROP TABLE IF EXISTS "Debt_summary"',
+        'DROP TABLE IF EXISTS "Logs"',
+        'DROP TABLE IF EXISTS "Debts"',
+        'DROP TABLE IF EXISTS "Status"',
+        'DROP TABLE IF EXISTS "Users"',
+    ],
+)
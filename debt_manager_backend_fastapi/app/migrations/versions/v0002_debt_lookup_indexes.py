@@ -0,0 +1,21 @@
+from app.migrations.runner import Migration, concurrent_index, drop_concurrent_index
+
+# Indexes behind the repository lookups, filters and keyset orderings (`sort_column, id`)
+INDEXES = [
+    ("ix_debts_user_id_id", '"Debts"', "user_id, id"),
+    ("ix_debts_status_id", '"Debts"', "status_id"),
+    ("ix_debts_description_id", '"Debts"', "description, id"),
+    ("ix_debts_due_date", '"Debts"', "due_date"),
+    ("ix_debts_amount_id", '"Debts"', "amount, id"),
+    ("ix_debts_debtor_name_id", '"Debts"', "debtor_name, id"),
+    ("ix_debts_creditor_name_id", '"Debts"', "creditor_name, id"),
+    ("ix_users_username_id", '"Users"', "username, id"),
+    ("ix_users_email_id", '"Users"', "email, id"),
+]
+
+migration = Migration(
+    version=2,
+    name="debt lookup indexes",
+    up=[concurrent_index(name, table, columns) for name, table, columns in INDEXES],
+    down=[drop_concurrent_index(name) for name, _, _ in reversed(INDEXES)],
+)
@@ -0,0 +1,24 @@
+from app.migrations.runner import Migration, concurrent_index, drop_concurrent_index
+
+# Weighted document searched by GET /debts/search; must match `DebtRepository.search_vector_sql`
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(notes, '')), 'B')"
+)
+
+migration = Migration(
+    version=3,
+    name="debt search indexes",
+    up=[
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        # Expression index: kept up to date by PostgreSQL on every write, without a stored column
+        concurrent_index("ix_debts_search_vector", '"Debts"', f"({SEARCH_VECTOR})", using="gin"),
+        concurrent_index("ix_debts_debtor_name_trgm", '"Debts"', "debtor_name gin_trgm_ops", using="gin"),
+        concurrent_index("ix_debts_creditor_name_trgm", '"Debts"', "creditor_name gin_trgm_ops", using="gin"),
+    ],
+    down=[
+        drop_concurrent_index("ix_debts_creditor_name_trgm"),
+        drop_concurrent_index("ix_debts_debtor_name_trgm"),
+        drop_concurrent_index("ix_debts_search_vector"),
+    ],
+)
@@ -0,0 +1,27 @@
+from app.migrations.runner import Migration
+
+# Notifies the "status_changed" channel, watched by the in-process status registry
+migration = Migration(
+    version=4,
+    name="status change notify",
+    up=[
+        """
+        CREATE OR REPLACE FUNCTION notify_status_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('status_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        'DROP TRIGGER IF EXISTS status_changed ON "Status"',
+        """
+        CREATE TRIGGER status_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "Status"
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_status_changed()
+        """,
+    ],
+    down=[
+        'DROP TRIGGER IF EXISTS status_changed ON "Status"',
+        "DROP FUNCTION IF EXISTS notify_status_changed()",
+    ],
+)
@@ -0,0 +1,10 @@
+from app.migrations.runner import Migration
+
+# Row version bumped by every `GenericRepository.update`; backs the debt ETags and If-Match.
+# A constant default makes ADD COLUMN a catalog-only change, without rewriting the table.
+migration = Migration(
+    version=5,
+    name="debt row version",
+    up=['ALTER TABLE "Debts" ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1'],
+    down=['ALTER TABLE "Debts" DROP COLUMN IF EXISTS version'],
+)
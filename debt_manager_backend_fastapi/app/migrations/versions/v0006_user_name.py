@@ -0,0 +1,18 @@
+from app.migrations.runner import Migration, concurrent_index, drop_concurrent_index
+
+# Databases migrated before the baseline declared `name` (and the model's column lengths)
+# get them here; existing users are named after their username. `name` is sortable, so it
+# gets a keyset index like the other `sort_column, id` orderings. Reverting drops only the
+# index: the column is part of the baseline schema.
+migration = Migration(
+    version=6,
+    name="user name",
+    up=[
+        'ALTER TABLE "Users" ADD COLUMN IF NOT EXISTS name VARCHAR(100)',
+        'UPDATE "Users" SET name = username WHERE name IS NULL',
+        'ALTER TABLE "Users" ALTER COLUMN name SET NOT NULL',
+        'ALTER TABLE "Users" ALTER COLUMN username TYPE VARCHAR(50), ALTER COLUMN email TYPE VARCHAR(100)',
+        concurrent_index("ix_users_name_id", '"Users"', "name, id"),
+    ],
+    down=[drop_concurrent_index("ix_users_name_id")],
+)
@@ -3,12 +3,15 @@ from uuid import UUID
 
 from sqlalchemy import Date
 
-from sqlalchemy import Column, String, Float, Text, Date, ForeignKey
+from sqlalchemy import Column, String, Float, Text, Date, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import foreign, relationship
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
+from app.models.status import Status
+from app.models.user import User
+
 Base = declarative_base()
 
 class Debt(Base):
@@ -24,10 +27,13 @@ class Debt(Base):
     debt_closing_date = Column(Date, nullable=True)
     status_id = Column(UUID(as_uuid=True), ForeignKey('Status.id'), nullable=False)
     notes = Column(Text, nullable=True)
+    # Incremented on every update; see `GenericRepository.update`
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
-    user = relationship("User", back_populates="debts")
+    # User and Status are declared on their own bases, so the classes and joins are given explicitly
+    user = relationship(User, primaryjoin=lambda: foreign(Debt.user_id) == User.id, viewonly=True)
 
-    status = relationship("Status")
+    status = relationship(Status, primaryjoin=lambda: foreign(Debt.status_id) == Status.id, viewonly=True)
 
     def to_dict(self) -> dict:
         """
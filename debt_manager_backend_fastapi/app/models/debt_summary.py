@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+class DebtSummary(Base):
+    """
+    Debt count and total amount per user, status and creditor, maintained incrementally.
+    """
+    __tablename__ = 'Debt_summary'
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    status_id = Column(UUID(as_uuid=True), primary_key=True)
+    creditor_name = Column(String(100), primary_key=True)
+    debt_count = Column(BigInteger, nullable=False, default=0)
+    total_amount = Column(Numeric, nullable=False, default=0)
@@ -0,0 +1,118 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, FrozenSet, Optional
+from uuid import UUID
+
+from starlette.responses import JSONResponse
+
+from app.repositories.model_metadata import get_model_metadata
+
+try:
+    import orjson
+except ImportError:  # Optional: without it responses fall back to the standard json module
+    orjson = None
+
+
+def _default(value: Any):
+    """Encode the values neither encoder writes natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize `content` to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with `dumps`.
+
+    Returned directly from an endpoint, it also skips FastAPI's
+    `jsonable_encoder` pass and the `response_model` validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RecordSerializer:
+    """
+    Prepares repository records of one model for JSON output.
+
+    Built once per model from its column types: only the columns whose values
+    the encoder cannot write natively get a converter, and hidden columns are
+    dropped, so each record costs a single pass with no per-value type dispatch.
+    """
+
+    def __init__(self, model, hidden: FrozenSet[str] = frozenset()):
+        metadata = get_model_metadata(model)
+        self.hidden = frozenset(hidden)
+        self.converters: Dict[str, Callable] = {}
+        for column in metadata.columns:
+            converter = self._converter_for(metadata.python_types.get(column))
+            if column not in self.hidden and converter is not None:
+                self.converters[column] = converter
+
+    def record(self, record: Dict) -> Dict:
+        """A JSON-ready copy of one record."""
+        output = {key: value for key, value in record.items() if key not in self.hidden}
+        for column, convert in self.converters.items():
+            value = output.get(column)
+            if value is not None:
+                output[column] = convert(value)
+        return output
+
+    def content(self, content: Dict) -> Dict:
+        """
+        A JSON-ready copy of a response payload: its `records` list if it has
+        one (pages, search results, batch-gets), otherwise the payload as a record.
+        """
+        if isinstance(content.get("records"), list):
+            return {**content, "records": [self.record(record) for record in content["records"]]}
+        return self.record(content)
+
+    @staticmethod
+    def _converter_for(python_type) -> Optional[Callable]:
+        if python_type is None:
+            return None
+        if issubclass(python_type, Decimal):
+            return float
+        if orjson is None:
+            if issubclass(python_type, UUID):
+                return str
+            if issubclass(python_type, (date, time)):
+                return python_type.isoformat
+        return None
+
+
+_serializers: Dict[type, RecordSerializer] = {}
+
+
+def get_record_serializer(model, hidden: FrozenSet[str] = frozenset()) -> RecordSerializer:
+    """The serializer of `model`, built on first use."""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = RecordSerializer(model, hidden)
+    return serializer
+
+
+def trusted_response(content: Dict, serializer: RecordSerializer, headers: Optional[Dict[str, str]] = None):
+    """
+    Response for repository output that is already well formed.
+
+    Opt-in fast path: the payload is converted by the model's precompiled
+    serializer and rendered straight to JSON, skipping the re-validation
+    against the endpoint's `response_model`.
+    """
+    return FastJSONResponse(serializer.content(content), headers=headers)
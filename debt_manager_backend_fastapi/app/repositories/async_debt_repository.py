@@ -0,0 +1,104 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
+from uuid import UUID
+from app.config.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.models.debt import Debt, DebtCreate
+from app.repositories.async_generic_repository import AsyncGenericRepository
+from app.repositories.debt_repository import DebtRepository
+from app.repositories.interfaces.debt_repository_interface import DebtRepositoryInterface
+
+class AsyncDebtRepository(AsyncGenericRepository[Debt], DebtRepositoryInterface):
+    """
+    Async variant of DebtRepository, running its queries on the async engine.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[DebtRepository] = None,
+        session_factory=AsyncSessionLocal,
+        read_session_factory=AsyncReadSessionLocal,
+    ):
+        super().__init__(
+            session_factory=session_factory,
+            repository=repository or DebtRepository(),
+            read_session_factory=read_session_factory,
+        )
+
+    async def get_by_id(self, debt_id: str, fields: Optional[Iterable[str]] = None) -> Union[Debt, str]:
+        """
+        Retrieve a debt by ID, optionally only some of its columns.
+        """
+        return await super().get_by_id(debt_id, fields)
+
+    async def find_by_description(self, description: str) -> Optional[Debt]:
+        """
+        Find a debt by its description.
+        """
+        return await self.run_read(self.repository._find_by_description, description)
+
+    async def create(self, data: DebtCreate) -> Optional[Debt]:
+        """
+        Create a new debt record.
+        """
+        return await self.run(self.repository._create, data)
+
+    async def create_many(
+        self,
+        items: Iterable,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Create many debt records in one transaction, returning their IDs in input order.
+        """
+        return await self.run(self.repository._create_many, items, batch_size, copy_threshold)
+
+    async def search(
+        self,
+        q: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> dict:
+        """
+        Ranked search over debts. See `DebtRepository.search`.
+        """
+        return await self.run_read(self.repository._search, q, per_page, cursor, user_id, status)
+
+    async def export(self, batch_size: Optional[int] = None, **filters) -> AsyncIterator[Sequence]:
+        """
+        Stream the debts matching `filters` from a server-side cursor.
+        See `DebtRepository.export`.
+        """
+        query, params = self.repository.export_statement(**filters)
+        async with self.read_session() as session:
+            result = await session.stream(query, params)
+            async for partition in result.partitions(batch_size or self.repository.export_batch_size):
+                yield partition
+
+    async def import_batch(self, rows: List[Dict]) -> Dict:
+        """
+        Load one batch of validated import rows. See `DebtRepository.import_batch`.
+        """
+        return await self.run(self.repository._import_batch, rows)
+
+    async def summarize(self, group_by: Sequence[str] = ()) -> Dict:
+        """
+        Debt count and total amount per group. See `DebtSummaryRepository.summarize`.
+        """
+        return await self.run_read(self.repository.summary_repository._summarize, group_by)
+
+    async def save(self, debt: Debt):
+        """
+        Save a debt to the database.
+        """
+        return await super().save(debt, "public.debts_debts_uuid_seq", debt)
+
+    async def delete(self, debt_id: str) -> bool:
+        """
+        Delete a debt by ID.
+        """
+        return await super().delete(debt_id)
+
+    def add_debt(self, debt: Debt):
+        self.repository.add_debt(debt)
@@ -0,0 +1,140 @@
+from typing import Dict, Generic, Iterable, List, Optional, TypeVar, Union
+
+from app.repositories.generic_repository import GenericRepository
+from app.repositories.pagination import DEFAULT_COUNT_CAP
+
+T = TypeVar("T")  # Tipo genérico
+
+class AsyncGenericRepository(Generic[T]):
+    def __init__(self, session_factory, repository: GenericRepository[T], read_session_factory=None):
+        """
+        Variante assíncrona do repositório genérico.
+
+        Cada operação abre uma `AsyncSession` (driver asyncpg) e executa o método
+        correspondente do repositório síncrono via `AsyncSession.run_sync`. O SQL
+        continua definido em um único lugar, mas cada ida ao banco é aguardada no
+        event loop em vez de bloqueá-lo.
+
+        Args:
+            session_factory: Função para criar sessões assíncronas do banco de dados.
+            repository: Repositório síncrono que define as consultas do modelo.
+            read_session_factory: Fábrica de sessões assíncronas para leituras, chamada com o
+                nome da tabela (ex.: `ReplicaRouter`). Padrão: `session_factory`.
+        """
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.repository = repository
+        self.model = repository.model
+
+    async def run(self, operation, *args, **kwargs):
+        """
+        Executa uma operação `operation(session, *args, **kwargs)` em uma nova sessão assíncrona.
+
+        Args:
+            operation: Método do repositório síncrono que recebe a sessão como primeiro argumento.
+
+        Returns:
+            O retorno da operação.
+        """
+        async with self.session_factory() as session:
+            return await session.run_sync(operation, *args, **kwargs)
+
+    async def run_read(self, operation, *args, **kwargs):
+        """
+        Executa uma operação somente de leitura em uma sessão de leitura (réplica, quando houver).
+
+        Args:
+            operation: Método do repositório síncrono que recebe a sessão como primeiro argumento.
+
+        Returns:
+            O retorno da operação.
+        """
+        async with self.read_session() as session:
+            return await session.run_sync(operation, *args, **kwargs)
+
+    def read_session(self):
+        """
+        Abre uma sessão assíncrona para leitura: em uma réplica, ou no primário se não
+        houver réplicas ou se a tabela foi alterada há pouco (leia-suas-escritas).
+        """
+        if self.read_session_factory is None:
+            return self.session_factory()
+        return self.read_session_factory(self.model.__tablename__.capitalize())
+
+    async def find_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = DEFAULT_COUNT_CAP,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Recupera registros do modelo com paginação. Veja `GenericRepository.find_all`.
+        """
+        return await self.run_read(
+            self.repository._find_all, page=page, per_page=per_page, cursor=cursor, sort_by=sort_by,
+            order=order, mode=mode, count=count, count_cap=count_cap, fields=fields
+        )
+
+    async def get_by_id(self, id: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Union[dict, int]]:
+        """
+        Recupera um registro específico pelo ID. Veja `GenericRepository.get_by_id`.
+        """
+        columns = self.repository._projection(fields)
+        cached, generation = self.repository._cached_get(id)
+        if cached is not None:
+            return self.repository._project_result(cached, fields, columns)
+
+        result = await self.run_read(self.repository._get_by_id, id, columns)
+        if fields is None:
+            self.repository._cache_result(id, result, generation)
+        return result
+
+    async def get_many(self, ids: List[str]) -> Dict[str, Union[dict, int]]:
+        """
+        Recupera vários registros pelo ID em uma única consulta. Veja `GenericRepository.get_many`.
+        """
+        ids = self.repository._normalize_ids(ids)
+        found, generations = self.repository._cached_many(ids)
+        if generations:
+            fetched = await self.run_read(self.repository._get_many, list(generations))
+            found.update(self.repository._cache_many(fetched, generations))
+        return self.repository._many_result(ids, found)
+
+    async def save(self, data, sequence_name: str, entity_class=None):
+        """
+        Salva um registro e retorna o ID gerado. Veja `GenericRepository.save`.
+        """
+        return await self.run(self.repository._save, data, sequence_name, entity_class)
+
+    async def save_many(
+        self,
+        items,
+        sequence_name: str,
+        entity_class=None,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Salva vários registros e retorna os IDs na ordem de entrada. Veja `GenericRepository.save_many`.
+        """
+        return await self.run(
+            self.repository._save_many, items, sequence_name, entity_class, batch_size, copy_threshold
+        )
+
+    async def update(self, record_id: str, data, entity_class=None, expected_version: Optional[int] = None):
+        """
+        Atualiza um registro pelo ID, opcionalmente condicionado à versão. Veja `GenericRepository.update`.
+        """
+        return await self.run(self.repository._update, record_id, data, entity_class, expected_version)
+
+    async def delete(self, record_id: str) -> bool:
+        """
+        Remove um registro pelo ID. Veja `GenericRepository.delete`.
+        """
+        return await self.run(self.repository._delete, record_id)
@@ -0,0 +1,53 @@
+from typing import Optional, Union
+from app.config.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.models.user import User, UserCreate
+from app.repositories.async_generic_repository import AsyncGenericRepository
+from app.repositories.interfaces.user_repository_interface import UserRepositoryInterface
+from app.repositories.user_repository import UserRepository
+
+class AsyncUserRepository(AsyncGenericRepository[User], UserRepositoryInterface):
+    """
+    Async variant of UserRepository, running its queries on the async engine.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[UserRepository] = None,
+        session_factory=AsyncSessionLocal,
+        read_session_factory=AsyncReadSessionLocal,
+    ):
+        super().__init__(
+            session_factory=session_factory,
+            repository=repository or UserRepository(),
+            read_session_factory=read_session_factory,
+        )
+
+    async def find_by_id(self, id: str) -> Union[User, str]:
+        return await self.get_by_id(id)
+
+    async def get_verify_password(self, password: str) -> Union[User, str]:
+        return await self.run(self.repository._get_verify_password, password)
+
+    def get_verify_token(self, hashed_password: str) -> Union[User, str]:
+        return self.repository.get_verify_token(hashed_password)
+
+    async def find_by_email(self, email: str) -> Union[User, str]:
+        return await self.run_read(self.repository._find_by_email, email)
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        return await self.run_read(self.repository._get_by_email, email)
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        return await self.run(self.repository._update_password, user_id, hashed_password)
+
+    def add_user(self, user: User):
+        self.repository.add_user(user)
+
+    async def save(self, user: User):
+        return await super().save(user, "public.users_users_uuid_seq", user)
+
+    def find_by_username(self, username: str) -> Optional[User]:
+        return self.repository.find_by_username(username)
+
+    async def create(self, data: UserCreate, hashed_password: str) -> Optional[User]:
+        return await self.run(self.repository._create, data, hashed_password)
@@ -0,0 +1,99 @@
+import io
+from typing import Iterable, Iterator, List, Sequence
+
+from sqlalchemy.util import await_only
+
+# Limite de parâmetros por comando; o asyncpg aceita no máximo 32767
+MAX_BIND_PARAMETERS = 32000
+
+
+def batched(rows: Sequence, batch_size: int) -> Iterator[Sequence]:
+    """
+    Divide uma sequência em lotes de tamanho fixo.
+    """
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def csv_value(value) -> str:
+    """
+    Formata um valor para o modo CSV do COPY.
+
+    Valores nulos saem sem aspas (NULL no CSV do PostgreSQL) e todos os demais
+    saem entre aspas, o que distingue NULL de texto vazio.
+    """
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class CsvCopyStream(io.TextIOBase):
+    """
+    Arquivo somente-leitura que gera as linhas CSV sob demanda.
+
+    Usado pelo `copy_expert` do psycopg2, que lê o conteúdo em blocos, de modo
+    que o lote inteiro nunca é materializado como um único texto em memória.
+    """
+
+    def __init__(self, rows: Iterable[Sequence]):
+        self._lines = (",".join(csv_value(value) for value in row) + "\n" for row in rows)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+
+        if size < 0:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
+
+
+def copy_rows(session, table_name: str, columns: List[str], rows: List[Sequence]) -> bool:
+    """
+    Carrega linhas em uma tabela com `COPY FROM STDIN`, dentro da transação da sessão.
+
+    Funciona com o psycopg2 (`copy_expert`) e com o asyncpg (`copy_records_to_table`,
+    aguardado a partir da fachada síncrona usada por `AsyncSession.run_sync`).
+
+    Args:
+        session: Sessão ativa do banco de dados.
+        table_name (str): Nome da tabela de destino.
+        columns (List[str]): Colunas, na mesma ordem dos valores de cada linha.
+        rows (List[Sequence]): Linhas a carregar.
+
+    Returns:
+        bool: True se o COPY foi executado, False se o driver não oferece COPY.
+    """
+    fairy = session.connection().connection
+    dbapi_connection = getattr(fairy, "dbapi_connection", None) or fairy.connection
+
+    driver_connection = getattr(dbapi_connection, "driver_connection", None)
+    if driver_connection is not None and hasattr(driver_connection, "copy_records_to_table"):
+        await_only(driver_connection.copy_records_to_table(table_name, records=rows, columns=columns))
+        return True
+
+    cursor = dbapi_connection.cursor()
+    if not hasattr(cursor, "copy_expert"):
+        cursor.close()
+        return False
+
+    column_list = ", ".join(columns)
+    try:
+        cursor.copy_expert(
+            f'COPY "{table_name}" ({column_list}) FROM STDIN WITH (FORMAT csv)',
+            CsvCopyStream(rows),
+        )
+    finally:
+        cursor.close()
+    return True
@@ -1,10 +1,19 @@
 from fastapi import HTTPException
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, Union
-from app.config.database import SessionLocal
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+from app.config.cache import get_entity_cache
+from app.config.database import ReadSessionLocal, SessionLocal
+from app.config.replica_router import mark_write
 from app.models.debt import Debt, DebtCreate
+from app.repositories.bulk import copy_rows
+from app.repositories.debt_summary_repository import SUMMARY_COLUMNS, DebtSummaryRepository
 from app.repositories.generic_repository import GenericRepository
+from app.repositories.pagination import decode_cursor, encode_cursor
+from app.repositories.status_registry import status_registry
 from app.repositories.interfaces.debt_repository_interface import DebtRepositoryInterface
 
 class CaseNotFoundError(HTTPException):
@@ -17,68 +26,423 @@ class CaseNotFoundError(HTTPException):
         self.message = message     
         
 class DebtRepository(GenericRepository[Debt], DebtRepositoryInterface):
+    # Non-nullable columns that can back a stable keyset ordering
+    sortable_columns = {"id", "description", "amount", "debtor_name", "creditor_name"}
+
+    # Columns written by `export`, in output order; `status` is the status name
+    export_columns = (
+        "id", "user_id", "description", "amount", "debtor_name", "creditor_name",
+        "due_date", "debt_closing_date", "status", "notes",
+    )
+
+    # Rows fetched from the server-side cursor per round trip during an export
+    export_batch_size = 2000
+
+    # Searched document; must match the expression indexed by migration 0003
+    search_vector_sql = (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(d.description, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(d.notes, '')), 'B')"
+    )
+
+    # Staging table used by `import_batch`, dropped when each batch commits
+    import_staging_table = "debts_import_staging"
+    import_staging_columns = (
+        "row_number", "user_id", "description", "amount", "debtor_name", "creditor_name", "status_id",
+    )
 
     def __init__(self, detail: str = "Item encontrado, não pode inserir", data: str = ""):
-        super().__init__(session_factory=SessionLocal, model=Debt)
+        super().__init__(
+            session_factory=SessionLocal,
+            model=Debt,
+            read_session_factory=ReadSessionLocal,
+            entity_cache=get_entity_cache("Debts"),
+        )
+        self.summary_repository = DebtSummaryRepository(SessionLocal, ReadSessionLocal)
         self.session_factory = SessionLocal
  
 
-    def get_by_id(self, debt_id: str) -> Union[Debt, str]:
+    def get_by_id(self, debt_id: str, fields: Optional[Iterable[str]] = None) -> Union[Debt, str]:
         """
-        Retrieve a debt by ID.
+        Retrieve a debt by ID, optionally only some of its columns.
         """
-        return super().get_by_id(id=debt_id)
+        return super().get_by_id(id=debt_id, fields=fields)
 
     def find_by_description(self, description: str) -> Optional[Debt]:
         """
         Find a debt by its description.
         """
-        with self.session_factory() as session:
-            result = session.execute(
-                text('SELECT * FROM "Debts" WHERE description = :description'),
-                {"description": description}
-            )
-            row = result.fetchone()
-            return Debt(**row) if row else None
+        with self.read_session() as session:
+            return self._find_by_description(session, description)
+
+    def _find_by_description(self, session, description: str) -> Optional[Debt]:
+        result = session.execute(
+            text('SELECT * FROM "Debts" WHERE description = :description'),
+            {"description": description}
+        )
+        row = result.fetchone()
+        return Debt(**row) if row else None
 
     def create(self, data: DebtCreate) -> Optional[Debt]:
         """
         Create a new debt record.
         """
+        with self.session_factory() as session:
+            return self._create(session, data)
+
+    def _create(self, session, data: DebtCreate) -> Optional[Debt]:
         try:
-            debt = Debt(**data.dict())
-            debt.id = super().save(debt, sequence_name="public.debts_debts_uuid_seq", entity_class=Debt)
+            values = data.dict()
+            status = values.pop("status")
+            debt = Debt(**values, status_id=status_registry.require_id(status))
+            debt.id = self._save(session, debt, sequence_name="public.debts_debts_uuid_seq", entity_class=Debt)
             return debt
         except SQLAlchemyError as e:
             print(f"Error creating debt: {e}")
             return None
 
+    def create_many(
+        self,
+        items: Iterable,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Create many debt records in one transaction, returning their IDs in input order.
+        """
+        with self.session_factory() as session:
+            return self._create_many(session, items, batch_size, copy_threshold)
+
+    def _create_many(
+        self,
+        session,
+        items: Iterable,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        return self._save_many(
+            session, items, "public.debts_debts_uuid_seq", Debt,
+            batch_size=batch_size, copy_threshold=copy_threshold
+        )
+
+    def search(
+        self,
+        q: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> dict:
+        """
+        Ranked search over debts.
+
+        Matches full-text terms in `description` (weighted higher) and `notes`,
+        and approximate (trigram) matches of `debtor_name` or `creditor_name`,
+        so small typos in names still match. Results are ordered by relevance,
+        then ID, and paginated with the `next_cursor` of the previous page.
+
+        Args:
+            q (str): Search text (web search syntax: quoted phrases, `or`, `-term`).
+            per_page (int): Number of results per page.
+            cursor (Optional[str]): `next_cursor` of a previous page of the same search.
+            user_id (Optional[UUID]): Only debts of this user.
+            status (Optional[str]): Only debts with this status name.
+
+        Returns:
+            dict: Ranked records and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor does not belong to this search.
+        """
+        with self.read_session() as session:
+            return self._search(session, q, per_page, cursor, user_id, status)
+
+    def _search(
+        self,
+        session,
+        q: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> dict:
+        if per_page < 1:
+            raise ValueError("per_page must be greater than zero.")
+        sort_key = self._search_sort_key(q, user_id, status)
+
+        params = {"q": q, "limit": per_page + 1}
+        filters = []
+        if user_id is not None:
+            filters.append("d.user_id = :user_id")
+            params["user_id"] = str(user_id)
+        if status is not None:
+            filters.append("d.status_id = :status_id")
+            params["status_id"] = status_registry.require_id(status)
+
+        after = ""
+        if cursor:
+            values = decode_cursor(cursor, sort_key, "desc")["values"]
+            params["cursor_rank"] = float(values[0])
+            params["cursor_id"] = str(values[1])
+            after = "WHERE rank < :cursor_rank OR (rank = :cursor_rank AND id > CAST(:cursor_id AS uuid))"
+
+        filter_clause = "".join(f" AND {condition}" for condition in filters)
+        query = text(f"""
+            SELECT * FROM (
+                SELECT d.*,
+                       CAST(ts_rank_cd({self.search_vector_sql}, tsq)
+                            + greatest(similarity(d.debtor_name, :q), similarity(d.creditor_name, :q))
+                            AS double precision) AS rank
+                FROM "Debts" d, websearch_to_tsquery('simple', :q) AS tsq
+                WHERE ({self.search_vector_sql} @@ tsq OR d.debtor_name % :q OR d.creditor_name % :q)
+                {filter_clause}
+            ) AS matches
+            {after}
+            ORDER BY rank DESC, id ASC
+            LIMIT :limit
+        """)
+
+        try:
+            result = session.execute(query, params).fetchall()
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Error searching debts: {e}") from e
+
+        records = self._rows_to_records(result)
+        has_more = len(records) > per_page
+        records = records[:per_page]
+        last = records[-1] if records else None
+
+        return {
+            "records": records,
+            "pagination": {
+                "per_page": per_page,
+                "next_cursor": encode_cursor(sort_key, "desc", [last["rank"], last["id"]], "next")
+                if has_more else None,
+            },
+        }
+
+    @staticmethod
+    def _search_sort_key(q: str, user_id: Optional[UUID], status: Optional[str]) -> str:
+        """Sort key stored in search cursors, so a cursor is bound to the search it came from."""
+        fingerprint = hashlib.sha1(f"{q}|{user_id}|{status}".encode("utf-8")).hexdigest()[:12]
+        return f"rank:{fingerprint}"
+
+    def export_statement(
+        self,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+    ) -> Tuple[text, Dict]:
+        """
+        Build the export query and its parameters for the given filters.
+
+        Args:
+            user_id (Optional[UUID]): Only debts of this user.
+            status (Optional[str]): Only debts with this status name.
+            due_from (Optional[date]): Only debts due on or after this date.
+            due_to (Optional[date]): Only debts due on or before this date.
+
+        Returns:
+            Tuple[text, Dict]: The statement, ordered by ID, and its bind parameters.
+        """
+        conditions, params = [], {}
+        if user_id is not None:
+            conditions.append("d.user_id = :user_id")
+            params["user_id"] = str(user_id)
+        if status is not None:
+            conditions.append("d.status_id = :status_id")
+            params["status_id"] = status_registry.require_id(status)
+        if due_from is not None:
+            conditions.append("d.due_date >= :due_from")
+            params["due_from"] = due_from
+        if due_to is not None:
+            conditions.append("d.due_date <= :due_to")
+            params["due_to"] = due_to
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = text(f"""
+            SELECT d.id, d.user_id, d.description, d.amount, d.debtor_name, d.creditor_name,
+                   d.due_date, d.debt_closing_date, s.name AS status, d.notes
+            FROM "Debts" d
+            JOIN "Status" s ON s.id = d.status_id
+            {where}
+            ORDER BY d.id
+        """)
+        return query, params
+
+    def export(self, batch_size: Optional[int] = None, **filters) -> Iterator[Sequence]:
+        """
+        Stream the debts matching `filters` (see `export_statement`) from a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory stays constant
+        whatever the size of the export.
+
+        Yields:
+            Sequence: A batch of rows, with the columns in `export_columns`.
+        """
+        query, params = self.export_statement(**filters)
+        with self.read_session() as session:
+            result = session.execute(query.execution_options(stream_results=True), params)
+            yield from result.partitions(batch_size or self.export_batch_size)
+
+    def import_batch(self, rows: List[Dict]) -> Dict:
+        """
+        Load one batch of validated import rows in a single transaction.
+
+        Status names are resolved through the in-memory status registry and
+        descriptions that already exist are rejected with one set-based query. The remaining rows are copied into a temporary staging
+        table and merged into "Debts" with a single INSERT ... SELECT.
+
+        Args:
+            rows (List[Dict]): Rows with `row`, `user_id`, `description`, `amount`,
+                `debtor_name`, `creditor_name` and `status` (the status name).
+
+        Returns:
+            Dict: `imported` (rows inserted) and `rejected` ((row, reason) pairs).
+        """
+        with self.session_factory() as session:
+            return self._import_batch(session, rows)
+
+    def _import_batch(self, session, rows: List[Dict]) -> Dict:
+        try:
+            result = session.execute(
+                text('SELECT description FROM "Debts" WHERE description = ANY(:descriptions)'),
+                {"descriptions": [row["description"] for row in rows]}
+            )
+            existing = {description for (description,) in result}
+
+            rejected, staged = [], []
+            for row in rows:
+                status_id = status_registry.id_for(row["status"])
+                if status_id is None:
+                    rejected.append((row["row"], f"Unknown status '{row['status']}'."))
+                elif row["description"] in existing:
+                    rejected.append((row["row"], f"Debt with description '{row['description']}' already exists."))
+                else:
+                    staged.append((
+                        row["row"], row["user_id"], row["description"], row["amount"],
+                        row["debtor_name"], row["creditor_name"], status_id,
+                    ))
+
+            imported = set()
+            if staged:
+                self._stage_import_rows(session, staged)
+                result = session.execute(text(f"""
+                    INSERT INTO "Debts" (id, user_id, description, amount, debtor_name, creditor_name, status_id)
+                    SELECT generate_sequential_uuid('public.debts_debts_uuid_seq'), s.user_id, s.description,
+                           s.amount, s.debtor_name, s.creditor_name, s.status_id
+                    FROM {self.import_staging_table} s
+                    WHERE NOT EXISTS (SELECT 1 FROM "Debts" d WHERE d.description = s.description)
+                    ORDER BY s.row_number
+                    RETURNING id, description
+                """))
+                inserted = result.fetchall()
+                imported = {description for _, description in inserted}
+                self._after_write(session, "Debts", [debt_id for debt_id, _ in inserted])
+
+                # Rows inserted concurrently by another writer since the duplicate check
+                rejected.extend(
+                    (row[0], f"Debt with description '{row[2]}' already exists.")
+                    for row in staged if row[2] not in imported
+                )
+
+            session.commit()
+            if imported:
+                mark_write("Debts")
+            return {"imported": len(imported), "rejected": rejected}
+
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Error importing debts: {e}") from e
+
+    def _stage_import_rows(self, session, staged: List[Tuple]):
+        session.execute(text(f"""
+            CREATE TEMPORARY TABLE {self.import_staging_table} (
+                row_number integer NOT NULL,
+                user_id uuid NOT NULL,
+                description varchar(255) NOT NULL,
+                amount double precision NOT NULL,
+                debtor_name varchar(100) NOT NULL,
+                creditor_name varchar(100) NOT NULL,
+                status_id uuid NOT NULL
+            ) ON COMMIT DROP
+        """))
+
+        columns = list(self.import_staging_columns)
+        if not copy_rows(session, self.import_staging_table, columns, staged):
+            placeholders = ", ".join(f":{column}" for column in columns)
+            session.execute(
+                text(f"INSERT INTO {self.import_staging_table} ({', '.join(columns)}) VALUES ({placeholders})"),
+                [dict(zip(columns, row)) for row in staged]
+            )
+
     def save(self, debt: Debt):
         """
         Save a debt to the database.
         """
         return super().save(debt, "public.debts_debts_uuid_seq", debt)
 
-    def find_all(self, page: int = 1, per_page: int = 10) -> dict:
+    def find_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = 10000,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Retrieve all debts with offset or cursor pagination, optionally only some of their columns.
+        """
+        return super().find_all(
+            page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+            count=count, count_cap=count_cap, fields=fields
+        )
+
+    def _resolve_references(self, data, values: dict) -> dict:
+        """
+        Fill `status_id` from a `status` name, using the in-memory status registry.
+
+        Raises:
+            ValueError: If the status name is unknown.
+        """
+        status = data.get("status") if isinstance(data, dict) else getattr(data, "status", None)
+        if isinstance(status, str) and values.get("status_id") is None:
+            values["status_id"] = status_registry.require_id(status)
+        return values
+
+    def _before_write(self, session, table_name: str, record_ids: List, columns: Optional[Iterable[str]] = None):
         """
-        Retrieve all debts with pagination.
+        Take the debts out of the summary before they are updated or deleted.
         """
-        return super().find_all(page=page, per_page=per_page)
+        if self._changes_summary(table_name, columns):
+            self.summary_repository.apply_delta(session, record_ids, -1)
 
-    def delete(self, debt_id: str) -> None:
+    def _after_write(self, session, table_name: str, record_ids: List, columns: Optional[Iterable[str]] = None):
+        """
+        Count the debts in the summary once they are inserted or updated.
+        """
+        if self._changes_summary(table_name, columns):
+            self.summary_repository.apply_delta(session, record_ids, 1)
+
+    @staticmethod
+    def _changes_summary(table_name: str, columns: Optional[Iterable[str]]) -> bool:
+        return table_name == "Debts" and (columns is None or not SUMMARY_COLUMNS.isdisjoint(columns))
+
+    def summarize(self, group_by: Sequence[str] = ()) -> Dict:
+        """
+        Debt count and total amount per group. See `DebtSummaryRepository.summarize`.
+        """
+        return self.summary_repository.summarize(group_by)
+
+    def delete(self, debt_id: str) -> bool:
         """
         Delete a debt by ID.
         """
-        try:
-            with self.session_factory() as session:
-                session.execute(
-                    text('DELETE FROM "Debts" WHERE id = :id'),
-                    {"id": debt_id}
-                )
-                session.commit()
-        except SQLAlchemyError as e:
-            print(f"Error deleting debt: {e}")
-            raise e
+        return super().delete(debt_id)
         
     def add_debt(self, debt: Debt):
         self.users.append(debt)
\ No newline at end of file
@@ -0,0 +1,155 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.config.database import ReadSessionLocal, SessionLocal
+from app.models.debt_summary import DebtSummary
+
+# Grouping dimensions accepted by `summarize`, and the expression behind each
+SUMMARY_GROUPS = {
+    "user_id": "s.user_id",
+    "status": "st.name",
+    "creditor_name": "s.creditor_name",
+}
+
+# Debt columns that decide which summary row a debt is counted in, or by how much
+SUMMARY_COLUMNS = frozenset({"user_id", "status_id", "creditor_name", "amount"})
+
+class DebtSummaryRepository:
+    """
+    Maintains and reads the "Debt_summary" table: debt count and total amount
+    per (user, status, creditor).
+
+    Writes to "Debts" apply deltas to the summary in their own transaction, so
+    reading totals costs O(groups) instead of scanning every debt.
+    """
+
+    table_name = DebtSummary.__tablename__
+
+    def __init__(self, session_factory=SessionLocal, read_session_factory=ReadSessionLocal):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+
+    def apply_delta(self, session, debt_ids: Iterable, sign: int):
+        """
+        Add (`sign=1`) or subtract (`sign=-1`) the given debts to or from the summary.
+
+        Runs in the caller's transaction. Subtracting locks the debt rows, so it
+        should be called before the rows are updated or deleted; adding reads
+        them after they are inserted or updated.
+
+        Args:
+            session: Active session of the write.
+            debt_ids (Iterable): IDs of the debts being written.
+            sign (int): 1 to add the debts, -1 to subtract them.
+        """
+        ids = [str(debt_id) for debt_id in debt_ids]
+        if not ids:
+            return
+
+        lock = "FOR UPDATE" if sign < 0 else ""
+        session.execute(text(f"""
+            WITH changed AS (
+                SELECT user_id, status_id, creditor_name, amount
+                FROM "Debts"
+                WHERE id = ANY(CAST(:ids AS uuid[]))
+                {lock}
+            )
+            INSERT INTO "{self.table_name}" (user_id, status_id, creditor_name, debt_count, total_amount)
+            SELECT user_id, status_id, creditor_name, {sign} * count(*), {sign} * sum(CAST(amount AS numeric))
+            FROM changed
+            GROUP BY user_id, status_id, creditor_name
+            ORDER BY user_id, status_id, creditor_name
+            ON CONFLICT (user_id, status_id, creditor_name) DO UPDATE
+            SET debt_count = "{self.table_name}".debt_count + EXCLUDED.debt_count,
+                total_amount = "{self.table_name}".total_amount + EXCLUDED.total_amount
+        """), {"ids": ids})
+
+    def summarize(self, group_by: Sequence[str] = ()) -> Dict:
+        """
+        Debt count and total amount per group.
+
+        Args:
+            group_by (Sequence[str]): Dimensions among "user_id", "status" and
+                "creditor_name". Empty for the grand total.
+
+        Returns:
+            Dict: The grouping and one entry per non-empty group. A negative
+                count means the summary drifted from "Debts" and needs a rebuild.
+
+        Raises:
+            ValueError: If a dimension is unknown or repeated.
+        """
+        # Routed like "Debts" reads, whose writes are what change the summary
+        with self.read_session_factory("Debts") as session:
+            return self._summarize(session, group_by)
+
+    def _summarize(self, session, group_by: Sequence[str] = ()) -> Dict:
+        group_by = self._validate_group_by(group_by)
+
+        expressions = ", ".join(SUMMARY_GROUPS[dimension] for dimension in group_by)
+        selected = "".join(f"{SUMMARY_GROUPS[dimension]} AS {dimension}, " for dimension in group_by)
+        join = 'JOIN "Status" st ON st.id = s.status_id' if "status" in group_by else ""
+        grouping = f"GROUP BY {expressions}" if group_by else ""
+        ordering = f"ORDER BY {expressions}" if group_by else ""
+
+        result = session.execute(text(f"""
+            SELECT {selected}sum(s.debt_count) AS debt_count, sum(s.total_amount) AS total_amount
+            FROM "{self.table_name}" s
+            {join}
+            {grouping}
+            HAVING sum(s.debt_count) <> 0
+            {ordering}
+        """))
+
+        groups = []
+        for row in result:
+            group = dict(row._mapping)
+            group["debt_count"] = int(group["debt_count"])
+            group["total_amount"] = float(group["total_amount"])
+            if "user_id" in group:
+                group["user_id"] = str(group["user_id"])
+            groups.append(group)
+
+        return {"group_by": group_by, "groups": groups}
+
+    @staticmethod
+    def _validate_group_by(group_by: Sequence[str]) -> List[str]:
+        """
+        Raises:
+            ValueError: If a dimension is unknown or repeated.
+        """
+        group_by = list(group_by)
+        unknown = [dimension for dimension in group_by if dimension not in SUMMARY_GROUPS]
+        if unknown:
+            raise ValueError(
+                f"Invalid group_by '{', '.join(unknown)}'. Use any of: {', '.join(SUMMARY_GROUPS)}."
+            )
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("group_by must not repeat a dimension.")
+        return group_by
+
+    def rebuild(self) -> int:
+        """
+        Recompute the whole summary from "Debts".
+
+        Writers to "Debts" are blocked (SHARE lock) until the rebuild commits,
+        so no delta is lost between the scan and the swap.
+
+        Returns:
+            int: Number of summary rows written.
+        """
+        with self.session_factory() as session:
+            try:
+                session.execute(text('LOCK TABLE "Debts" IN SHARE MODE'))
+                session.execute(text(f'DELETE FROM "{self.table_name}"'))
+                result = session.execute(text(f"""
+                    INSERT INTO "{self.table_name}" (user_id, status_id, creditor_name, debt_count, total_amount)
+                    SELECT user_id, status_id, creditor_name, count(*), sum(CAST(amount AS numeric))
+                    FROM "Debts"
+                    GROUP BY user_id, status_id, creditor_name
+                """))
+                session.commit()
+                return result.rowcount
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise RuntimeError(f"Error rebuilding the debt summary: {e}") from e
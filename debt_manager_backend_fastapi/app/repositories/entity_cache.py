@@ -0,0 +1,263 @@
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Dict, Hashable, Optional, Tuple
+from zlib import crc32
+
+try:
+    import redis
+except ImportError:  # Dependência opcional, só necessária com o backend compartilhado Redis
+    redis = None
+
+# Contadores de geração por faixa de chaves: colisões só fazem uma carga deixar de ser gravada
+GENERATION_STRIPES = 4096
+
+
+class CacheStats:
+    """
+    Contadores de acertos, falhas, remoções por capacidade e invalidações de um cache.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "remote_invalidations": self.remote_invalidations,
+            }
+
+
+class LocalLRUCache:
+    """
+    Cache LRU em memória do processo, com expiração por TTL.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0, stats: Optional[CacheStats] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = stats or CacheStats()
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable):
+        """Retorna o valor em cache ou None, descartando-o se já expirou."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                self.stats.increment("expirations")
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value, ttl_seconds: Optional[float] = None):
+        """Grava o valor, removendo os menos usados recentemente se o cache estiver cheio."""
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.increment("evictions", evicted)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InMemorySharedBackend:
+    """
+    Substituto local de um backend compartilhado (ex.: Redis), para desenvolvimento e testes.
+
+    Guarda os valores serializados, como um servidor externo faria, de modo que
+    quem lê recebe sempre uma cópia.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[0] <= monotonic():
+                self._values.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        with self._lock:
+            self._values[key] = (monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+
+class RedisSharedBackend:
+    """
+    Backend compartilhado entre processos, sobre um servidor Redis.
+    """
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("O backend de cache Redis requer o pacote 'redis'.")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        self.client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+
+class EntityCache:
+    """
+    Cache read-through de registros por ID: LRU local e, opcionalmente, um backend compartilhado.
+
+    As leituras consultam o LRU local, depois o backend compartilhado e, por
+    último, o banco. As escritas invalidam a chave nas duas camadas. Uma carga
+    iniciada antes de uma invalidação não é gravada, para que uma leitura lenta
+    não reponha no cache um valor já alterado.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local: LocalLRUCache,
+        shared=None,
+        shared_ttl_seconds: Optional[float] = None,
+        broadcast_channel: Optional[str] = None,
+    ):
+        """
+        Args:
+            namespace (str): Prefixo das chaves (normalmente o nome da tabela).
+            local (LocalLRUCache): Cache em memória do processo.
+            shared: Backend compartilhado com `get`, `set` e `delete`, ou None.
+            shared_ttl_seconds (Optional[float]): TTL no backend compartilhado. Padrão: o TTL local.
+            broadcast_channel (Optional[str]): Canal NOTIFY em que as escritas avisam os outros
+                processos, que então removem a chave do LRU local (`evict_local`). Sem canal,
+                os outros processos só deixam de ver o valor antigo quando o TTL local expira.
+        """
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.shared_ttl_seconds = local.ttl_seconds if shared_ttl_seconds is None else shared_ttl_seconds
+        self.broadcast_channel = broadcast_channel
+        self.stats = local.stats
+        self._generations = [0] * GENERATION_STRIPES
+        self._lock = Lock()
+
+    def key(self, record_id) -> str:
+        return f"{self.namespace}:{str(record_id).lower()}"
+
+    @staticmethod
+    def _stripe(key: str) -> int:
+        return crc32(key.encode()) % GENERATION_STRIPES
+
+    def get(self, record_id) -> Tuple[Optional[dict], int]:
+        """
+        Busca um registro no cache.
+
+        Returns:
+            Tuple[Optional[dict], int]: O registro (uma cópia) ou None, e a geração
+            da chave, a ser repassada a `set` após carregar o registro do banco.
+        """
+        key = self.key(record_id)
+        with self._lock:
+            generation = self._generations[self._stripe(key)]
+
+        record = self.local.get(key)
+        if record is None and self.shared is not None:
+            payload = self.shared.get(key)
+            if payload is not None:
+                record = pickle.loads(payload)
+                self.local.set(key, record)
+
+        if record is None:
+            self.stats.increment("misses")
+            return None, generation
+
+        self.stats.increment("hits")
+        return dict(record), generation
+
+    def set(self, record_id, record: dict, generation: int):
+        """
+        Grava um registro carregado do banco, a menos que a chave tenha sido invalidada desde `get`.
+        """
+        key = self.key(record_id)
+        with self._lock:
+            if self._generations[self._stripe(key)] != generation:
+                return
+
+        record = dict(record)
+        self.local.set(key, record)
+        if self.shared is not None:
+            self.shared.set(key, pickle.dumps(record), self.shared_ttl_seconds)
+
+    def invalidate(self, record_id):
+        """
+        Remove um registro das duas camadas após uma escrita.
+        """
+        key = self.key(record_id)
+        with self._lock:
+            self._generations[self._stripe(key)] += 1
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+        self.stats.increment("invalidations")
+
+    def evict_local(self, key: str):
+        """
+        Remove do LRU local uma chave (já no formato de `key`) alterada por outro processo.
+        """
+        with self._lock:
+            self._generations[self._stripe(key)] += 1
+        self.local.delete(key)
+        self.stats.increment("remote_invalidations")
+
+    def clear_local(self):
+        """
+        Esvazia o LRU local, quando avisos de outros processos podem ter sido perdidos.
+        """
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+        self.local.clear()
+
+    def statistics(self) -> Dict:
+        return {**self.stats.snapshot(), "entries": len(self.local), "max_entries": self.local.max_entries}
@@ -1,145 +1,737 @@
-from typing import Dict, Generic, List, Type, TypeVar, Union
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+from uuid import UUID
 from sqlalchemy.sql import text
-from math import ceil
+
+from app.config.replica_router import mark_write
+from app.repositories.bulk import MAX_BIND_PARAMETERS, batched, copy_rows
+from app.repositories.model_metadata import VERSION_COLUMN, cached_statement, get_model_metadata
+
+from app.repositories.pagination import (
+    COUNT_STRATEGIES,
+    DEFAULT_COUNT_CAP,
+    PAGINATION_MODES,
+    SORT_ORDERS,
+    build_count_metadata,
+    cursor_from_record,
+    decode_cursor,
+)
 
 T = TypeVar("T")  # Tipo genérico
 
 from sqlalchemy.exc import SQLAlchemyError
 
+class InvalidFieldsError(ValueError):
+    """
+    Os campos pedidos (`fields`) não são colunas visíveis do modelo: um erro do
+    cliente, distinto de um registro não encontrado.
+    """
+
+
+class VersionConflictError(Exception):
+    """
+    A atualização condicional falhou: o registro está em outra versão.
+    """
+
+    def __init__(self, record_id, expected_version: int, current_version: int):
+        super().__init__(
+            f"O registro '{record_id}' está na versão {current_version}, e não na versão {expected_version}."
+        )
+        self.record_id = record_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
 class GenericRepository(Generic[T]):
-    def __init__(self, session_factory, model: Type[T]):
+    # Colunas permitidas para ordenação; o `id` é sempre usado como critério de desempate.
+    sortable_columns = {"id"}
+
+    # Registros por INSERT multi-linha em `save_many`, e quantidade a partir da qual usar COPY
+    bulk_batch_size = 1000
+    copy_threshold = 5000
+
+    # Máximo de IDs por chamada de `get_many`
+    max_get_many = 1000
+
+    # Colunas nunca retornadas nas leituras (ex.: hashes de senha)
+    hidden_fields = frozenset()
+
+    def __init__(self, session_factory, model: Type[T], read_session_factory=None, entity_cache=None):
         """
         Repositório genérico para buscar registros de qualquer modelo.
 
         Args:
-            session_factory: Função para criar sessões do banco de dados.
+            session_factory: Função para criar sessões do banco de dados (primário).
             model: Classe do modelo SQLAlchemy.
+            read_session_factory: Fábrica de sessões para leituras, chamada com o nome da
+                tabela (ex.: `ReplicaRouter`). Padrão: `session_factory`.
+            entity_cache: Cache read-through de `get_by_id` (`EntityCache`), invalidado
+                nas escritas. Padrão: sem cache.
         """
         self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.entity_cache = entity_cache
         self.model = model
         self.entities = []  # Lista simulada para armazenar as entidades (pode ser substituído por um banco de dados)
 
-        
- 
-    def find_all(self, page: int = 1, per_page: int = 10) -> dict:
+    def read_session(self):
+        """
+        Abre uma sessão para leitura: em uma réplica, ou no primário se não houver
+        réplicas ou se a tabela foi alterada há pouco (leia-suas-escritas).
+        """
+        if self.read_session_factory is None:
+            return self.session_factory()
+        return self.read_session_factory(self.model.__tablename__.capitalize())
+
+    def find_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = DEFAULT_COUNT_CAP,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
         """
         Recupera registros do modelo genérico com paginação.
 
+        No modo "offset" a página é calculada com LIMIT/OFFSET. No modo "cursor"
+        (ativado também quando um `cursor` é informado) a busca usa a última chave
+        de ordenação vista, de modo que qualquer página custa o mesmo que a primeira.
+
         Args:
-            page (int): Página atual (1-indexed).
+            page (int): Página atual (1-indexed), usada apenas no modo "offset".
             per_page (int): Número de registros por página.
+            cursor (Optional[str]): Cursor opaco (`next_cursor`/`prev_cursor`) de uma resposta anterior.
+            sort_by (str): Coluna de ordenação, dentre `sortable_columns`. O `id` é usado como desempate.
+            order (str): Direção da ordenação ("asc" ou "desc").
+            mode (str): Modo de paginação ("offset" ou "cursor").
+            count (Optional[str]): Estratégia de contagem do total ("exact", "estimated",
+                "capped" ou "none"). Padrão: "exact" no modo "offset" e "none" no modo "cursor".
+            count_cap (int): Limite usado pela estratégia "capped".
+            fields (Optional[Iterable[str]]): Colunas a buscar e retornar. O `id`, a versão e a
+                coluna de ordenação são sempre incluídos. Padrão: todas, exceto `hidden_fields`.
 
         Returns:
             Dict: Dados paginados com registros e informações de paginação.
+
+        Raises:
+            ValueError: Se os parâmetros de ordenação, o modo, a contagem, o cursor ou os campos forem inválidos.
+        """
+        with self.read_session() as session:
+            return self._find_all(
+                session, page=page, per_page=per_page, cursor=cursor, sort_by=sort_by,
+                order=order, mode=mode, count=count, count_cap=count_cap, fields=fields
+            )
+
+    def _find_all(
+        self,
+        session,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = DEFAULT_COUNT_CAP,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
         """
+        Executa `find_all` na sessão informada (síncrona ou a fachada síncrona de uma sessão assíncrona).
+        """
+        if cursor is not None:
+            mode = "cursor"
+        if count is None:
+            count = "none" if mode == "cursor" else "exact"
+        self._validate_pagination(per_page, sort_by, order, mode)
+        self._validate_count(count, count_cap)
+        columns = self._projection(fields, required=("id", sort_by))
+
+        if mode == "cursor":
+            decoded = decode_cursor(cursor, sort_by, order) if cursor else None
+            return self._find_all_keyset(session, per_page, decoded, sort_by, order, count, count_cap, columns)
+
         try:
             if page < 1:
                 page = 1  # Garante que a página seja, no mínimo, 1
 
-            with self.session_factory() as session:
-                # Garantir que o nome da tabela tenha a primeira letra maiúscula
-                table_name = self.model.__tablename__.capitalize()
-
-                # Query para contar o total de registros
-                total_query = f'SELECT COUNT(*) FROM "{table_name}"'
-                total_records = session.execute(text(total_query)).scalar()
-
-                # Query para buscar registros com paginação
-                query = f"""
-                    SELECT * FROM "{table_name}"
-                    ORDER BY id LIMIT :limit OFFSET :offset
-                """
-                offset = (page - 1) * per_page
-                result = session.execute(
-                    text(query),
-                    {"limit": per_page, "offset": offset}
-                ).fetchall()
-
-                # Assuming each row has a `_fields` attribute containing the column names
-                # and `result` is your list of rows
-                field_names = []
-
-                # Extracting `_fields` from the first row (assuming all rows have the same fields)
-                if result and hasattr(result[0], '_fields'):
-                    field_names = list(result[0]._fields)
-
-                # Printing the extracted field names
-                print("Field Names:", field_names)
-
-                # Example: converting the rows to dictionaries using field_names
-                records = [
-                    {field: value for field, value in zip(field_names, row)}
-                    for row in result
-]
-                # Total de registros
-                total_records = len(result)
-
-                # Construir a resposta
-                total_pages = ceil(total_records / per_page)
-                
-                # Resposta final com status_code
-
-                value = {
-                    "status_code": 200,
-                    "data": {
-                        "records": records,
-                        "pagination": {
-                            "page": page,
-                            "per_page": per_page,
-                            "total_pages": total_pages,
-                            "total_records": total_records,
-                        },
-                    },
-                }
+            # Garantir que o nome da tabela tenha a primeira letra maiúscula
+            table_name = self.model.__tablename__.capitalize()
+
+            # Query para buscar registros com paginação
+            query = cached_statement(
+                (self.model, "find_all_offset", sort_by, order, columns),
+                lambda: text(f"""
+                    SELECT {self._select_list(columns)} FROM "{table_name}"
+                    ORDER BY {self._order_by_clause(sort_by, order)}
+                    LIMIT :limit OFFSET :offset
+                """)
+            )
+            offset = (page - 1) * per_page
+            result = session.execute(
+                query,
+                {"limit": per_page, "offset": offset}
+            ).fetchall()
 
-                dictValue = dict(value)
+            records = self._rows_to_records(result)
 
-                return dictValue
+            # Total de registros conforme a estratégia de contagem escolhida
+            count_metadata = self._count_metadata(session, count, count_cap, per_page)
+
+            # Resposta final com status_code
+            return self._offset_result(records, page, per_page, sort_by, order, count_metadata)
             
         except Exception as e:
             raise RuntimeError(f"Erro ao buscar registros com paginação: {e}")
+
+    @staticmethod
+    def _offset_result(
+        records: List[dict],
+        page: int,
+        per_page: int,
+        sort_by: str,
+        order: str,
+        count_metadata: dict,
+    ) -> dict:
+        """
+        Monta a resposta de uma página por offset.
+        """
+        return {
+            "status_code": 200,
+            "data": {
+                "records": records,
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "sort_by": sort_by,
+                    "order": order,
+                    **count_metadata,
+                },
+            },
+        }
+
+    def _find_all_keyset(
+        self,
+        session,
+        per_page: int,
+        decoded: Optional[dict],
+        sort_by: str,
+        order: str,
+        count: str = "none",
+        count_cap: int = DEFAULT_COUNT_CAP,
+        columns: Optional[Tuple[str, ...]] = None,
+    ) -> dict:
+        """
+        Busca uma página usando paginação por chave (keyset).
+
+        Args:
+            session: Sessão ativa do banco de dados.
+            per_page (int): Número de registros por página.
+            decoded (Optional[dict]): Cursor decodificado, ou None para a primeira página.
+            sort_by (str): Coluna de ordenação.
+            order (str): Direção da ordenação.
+            count (str): Estratégia de contagem do total.
+            count_cap (int): Limite usado pela estratégia "capped".
+            columns (Optional[Tuple[str, ...]]): Colunas buscadas (veja `_projection`).
+
+        Returns:
+            Dict: Registros da página e os cursores `next_cursor`/`prev_cursor`.
+        """
+        columns = columns or self._projection(None)
+        direction = decoded["direction"] if decoded else "next"
+        forward = (order == "asc") == (direction == "next")
+        comparator = ">" if forward else "<"
+        sql_order = "ASC" if forward else "DESC"
+
+        params = {"limit": per_page + 1}
+        where_clause = ""
+        if decoded:
+            values = decoded["values"]
+            params["cursor_id"] = self._coerce_column_value("id", values[-1])
+            if sort_by == "id":
+                where_clause = f"WHERE id {comparator} :cursor_id"
+            else:
+                params["cursor_value"] = self._coerce_column_value(sort_by, values[0])
+                where_clause = f"WHERE ({sort_by}, id) {comparator} (:cursor_value, :cursor_id)"
+
+        order_by = f"id {sql_order}" if sort_by == "id" else f"{sort_by} {sql_order}, id {sql_order}"
+
+        try:
+            table_name = self.model.__tablename__.capitalize()
+
+            query = cached_statement(
+                (self.model, "find_all_keyset", sort_by, comparator, bool(decoded), columns),
+                lambda: text(f"""
+                    SELECT {self._select_list(columns)} FROM "{table_name}"
+                    {where_clause}
+                    ORDER BY {order_by}
+                    LIMIT :limit
+                """)
+            )
+            result = session.execute(query, params).fetchall()
+            count_metadata = self._count_metadata(session, count, count_cap, per_page)
+        except Exception as e:
+            raise RuntimeError(f"Erro ao buscar registros com paginação: {e}")
+
+        return self._keyset_result(
+            self._rows_to_records(result), per_page, decoded, sort_by, order, count_metadata
+        )
+
+    @staticmethod
+    def _keyset_result(
+        records: List[dict],
+        per_page: int,
+        decoded: Optional[dict],
+        sort_by: str,
+        order: str,
+        count_metadata: dict,
+    ) -> dict:
+        """
+        Monta a resposta de uma página keyset a partir dos registros lidos na direção
+        navegada (até `per_page + 1`; a linha extra indica se há mais uma página).
+        """
+        direction = decoded["direction"] if decoded else "next"
+        has_more = len(records) > per_page
+        records = records[:per_page]
+        if direction == "prev":
+            records.reverse()
+
+        first = records[0] if records else None
+        last = records[-1] if records else None
+        if direction == "next":
+            next_anchor = last if has_more else None
+            prev_anchor = first if decoded else None
+        else:
+            next_anchor = last
+            prev_anchor = first if has_more else None
+
+        return {
+            "status_code": 200,
+            "data": {
+                "records": records,
+                "pagination": {
+                    "per_page": per_page,
+                    "sort_by": sort_by,
+                    "order": order,
+                    "next_cursor": cursor_from_record(next_anchor, sort_by, order, "next"),
+                    "prev_cursor": cursor_from_record(prev_anchor, sort_by, order, "prev"),
+                    **count_metadata,
+                },
+            },
+        }
+
+    def _validate_pagination(self, per_page: int, sort_by: str, order: str, mode: str):
+        """
+        Valida os parâmetros de paginação e ordenação.
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido.
+        """
+        if mode not in PAGINATION_MODES:
+            raise ValueError(f"Modo de paginação inválido: '{mode}'.")
+        if order not in SORT_ORDERS:
+            raise ValueError(f"Ordenação inválida: '{order}'. Use 'asc' ou 'desc'.")
+        if sort_by not in self.sortable_columns:
+            allowed = ", ".join(sorted(self.sortable_columns))
+            raise ValueError(f"Coluna de ordenação inválida: '{sort_by}'. Permitidas: {allowed}.")
+        if per_page < 1:
+            raise ValueError("`per_page` deve ser maior que zero.")
+
+    @staticmethod
+    def _validate_count(count: str, count_cap: int):
+        """
+        Valida a estratégia de contagem.
+
+        Raises:
+            ValueError: Se a estratégia ou o limite forem inválidos.
+        """
+        if count not in COUNT_STRATEGIES:
+            allowed = ", ".join(sorted(COUNT_STRATEGIES))
+            raise ValueError(f"Estratégia de contagem inválida: '{count}'. Permitidas: {allowed}.")
+        if count == "capped" and count_cap < 1:
+            raise ValueError("`count_cap` deve ser maior que zero.")
+
+    def _count_metadata(self, session, count: str, count_cap: int, per_page: int) -> dict:
+        """
+        Conta os registros da tabela conforme a estratégia escolhida.
+
+        Args:
+            session: Sessão ativa do banco de dados.
+            count (str): Estratégia de contagem.
+            count_cap (int): Limite usado pela estratégia "capped".
+            per_page (int): Número de registros por página.
+
+        Returns:
+            dict: Campos de contagem do payload de paginação.
+        """
+        table_name = self.model.__tablename__.capitalize()
+
+        if count == "none":
+            return build_count_metadata(count, None, per_page)
+
+        if count == "estimated":
+            # Estimativa do planner; -1 (nunca analisada) ou 0 caem para a contagem exata,
+            # que é barata justamente em tabelas pequenas ou recém-criadas.
+            estimate = session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(CAST(:table_name AS text) AS regclass)"),
+                {"table_name": f'"{table_name}"'}
+            ).scalar()
+            if estimate is not None and estimate > 0:
+                return build_count_metadata(count, int(estimate), per_page)
+            count = "exact"
+
+        if count == "capped":
+            # Conta no máximo `count_cap + 1` linhas para saber se o limite foi ultrapassado
+            total_records = session.execute(
+                text(f'SELECT COUNT(*) FROM (SELECT 1 FROM "{table_name}" LIMIT :cap) AS capped'),
+                {"cap": count_cap + 1}
+            ).scalar()
+            if total_records > count_cap:
+                return build_count_metadata(count, count_cap, per_page, capped=True)
+            return build_count_metadata(count, total_records, per_page)
+
+        total_records = session.execute(text(f'SELECT COUNT(*) FROM "{table_name}"')).scalar()
+        return build_count_metadata(count, total_records, per_page)
+
+    @staticmethod
+    def _order_by_clause(sort_by: str, order: str) -> str:
+        """
+        Monta a cláusula ORDER BY com o `id` como critério de desempate.
+        """
+        direction = order.upper()
+        if sort_by == "id":
+            return f"id {direction}"
+        return f"{sort_by} {direction}, id {direction}"
+
+    def _coerce_column_value(self, column_name: str, value):
+        """
+        Converte um valor vindo do cursor para o tipo Python da coluna.
+        """
+        python_type = get_model_metadata(self.model).python_types.get(column_name)
+        if python_type is None or value is None or isinstance(value, python_type):
+            return value
+        try:
+            return python_type(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Cursor inválido.") from e
+
+    def _projection(self, fields: Optional[Iterable[str]], required: Iterable[str] = ("id",)) -> Tuple[str, ...]:
+        """
+        Valida os campos pedidos e retorna as colunas a buscar, na ordem do modelo.
+
+        Args:
+            fields (Optional[Iterable[str]]): Campos pedidos, ou None para todas as colunas visíveis.
+            required (Iterable[str]): Colunas sempre incluídas (ex.: o `id`), além da versão.
+
+        Raises:
+            InvalidFieldsError: Se algum campo não for uma coluna visível do modelo.
+        """
+        metadata = get_model_metadata(self.model)
+        visible = [column for column in metadata.columns if column not in self.hidden_fields]
+        if fields is None:
+            return tuple(visible)
+
+        requested = set(fields)
+        invalid = requested.difference(visible)
+        if invalid:
+            allowed = ", ".join(visible)
+            raise InvalidFieldsError(f"Campos inválidos: {', '.join(sorted(invalid))}. Permitidos: {allowed}.")
+        requested.update(required)
+        requested.add(VERSION_COLUMN)
+        # A ordem do modelo mantém uma única instrução em cache por conjunto de colunas
+        return tuple(column for column in visible if column in requested)
+
+    def _select_list(self, columns: Tuple[str, ...]) -> str:
+        """
+        Monta a lista do SELECT para as colunas informadas.
+        """
+        column_names = get_model_metadata(self.model).column_names
+        return ", ".join(
+            column if column_names[column] == column else f'{column_names[column]} AS "{column}"'
+            for column in columns
+        )
+
+    @staticmethod
+    def _rows_to_records(result) -> List[dict]:
+        """
+        Converte as linhas retornadas pelo banco em dicionários.
+        """
+        # Extracting `_fields` from the first row (assuming all rows have the same fields)
+        field_names = list(result[0]._fields) if result and hasattr(result[0], '_fields') else []
+        return [
+            {field: value for field, value in zip(field_names, row)}
+            for row in result
+        ]
         
-    def get_by_id(self, id: str) -> Dict[str, Union[dict, int]]:
+    def get_by_id(self, id: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Union[dict, int]]:
         """
         Recupera um registro específico pelo ID.
 
         Args:
             id (str): O ID do registro a ser buscado.
+            fields (Optional[Iterable[str]]): Colunas a retornar (o `id` e a versão são sempre incluídos).
+                Padrão: todas, exceto `hidden_fields`. Leituras parciais não entram no cache.
 
         Returns:
             Dict[str, Union[dict, int]]: Um dicionário contendo o status_code e o registro encontrado.
+
+        Raises:
+            InvalidFieldsError: Se algum campo for inválido.
+        """
+        columns = self._projection(fields)
+        cached, generation = self._cached_get(id)
+        if cached is not None:
+            return self._project_result(cached, fields, columns)
+
+        with self.read_session() as session:
+            result = self._get_by_id(session, id, columns)
+        if fields is None:
+            self._cache_result(id, result, generation)
+        return result
+
+    @staticmethod
+    def _project_result(result: dict, fields: Optional[Iterable[str]], columns: Tuple[str, ...]) -> dict:
+        """
+        Reduz um resultado completo de `get_by_id` às colunas pedidas.
+        """
+        if fields is None:
+            return result
+        return {**result, "data": {column: result["data"].get(column) for column in columns}}
+
+    def _cached_get(self, id: str):
+        """
+        Consulta o cache de entidades antes do banco.
+
+        Returns:
+            O resultado de `get_by_id` (ou None, se não estiver em cache) e a geração a repassar a `_cache_result`.
+        """
+        if self.entity_cache is None:
+            return None, 0
+        record, generation = self.entity_cache.get(self._cache_key(id))
+        if record is None:
+            return None, generation
+        return {"status_code": 200, "data": record}, generation
+
+    def _cache_result(self, id: str, result: dict, generation: int):
+        """
+        Grava no cache de entidades um registro lido do banco.
+        """
+        if self.entity_cache is not None and result["status_code"] == 200:
+            self.entity_cache.set(self._cache_key(id), result["data"], generation)
+
+    @staticmethod
+    def _canonical_id(id) -> Optional[str]:
+        """
+        Forma canônica de um ID (o texto do UUID em minúsculas, com hífens), ou None
+        se não for um UUID. Grafias aceitas pelo banco, como maiúsculas, sem hífens
+        ou entre chaves, viram a mesma forma.
         """
         try:
-            with self.session_factory() as session:
-                # Garantir que o nome da tabela tenha a primeira letra maiúscula
-                table_name = self.model.__tablename__.capitalize()
+            return str(UUID(str(id)))
+        except ValueError:
+            return None
+
+    @classmethod
+    def _cache_key(cls, id) -> str:
+        """
+        Chave de um ID no cache de entidades. Leituras, gravações e invalidações usam
+        esta mesma chave, para que um registro nunca fique em cache sob duas grafias.
+        """
+        return cls._canonical_id(id) or str(id)
+
+    def _resolve_references(self, data, values: dict) -> dict:
+        """
+        Gancho para completar os valores gravados a partir dos dados recebidos
+        (ex.: trocar um nome por um ID de chave estrangeira). Chamado em `save`,
+        `save_many` e `update`, antes de montar a instrução.
+
+        Args:
+            data: Dados recebidos (objeto com atributos ou dicionário).
+            values (dict): Valores das colunas já extraídos de `data`.
+
+        Returns:
+            dict: Os valores a gravar.
+        """
+        return values
+
+    def _before_write(self, session, table_name: str, record_ids: List, columns: Optional[Iterable[str]] = None):
+        """
+        Gancho executado na transação da escrita, antes de alterar ou remover registros.
+
+        Args:
+            session: Sessão da escrita.
+            table_name (str): Tabela alterada.
+            record_ids (List): IDs dos registros alterados.
+            columns (Optional[Iterable[str]]): Colunas alteradas, ou None se o registro inteiro muda.
+        """
+
+    def _after_write(self, session, table_name: str, record_ids: List, columns: Optional[Iterable[str]] = None):
+        """
+        Gancho executado na transação da escrita, após inserir ou alterar registros e antes do commit.
+        Recebe os mesmos argumentos de `_before_write`.
+        """
+
+    def _invalidate_cached(self, table_name: str, record_id):
+        """
+        Remove do cache de entidades um registro alterado.
+        """
+        if self.entity_cache is not None and self.entity_cache.namespace == table_name:
+            self.entity_cache.invalidate(self._cache_key(record_id))
 
-                # Query para buscar o registro pelo ID
-                query = f'SELECT * FROM "{table_name}" WHERE id = :id'
-                result = session.execute(text(query), {"id": id}).fetchone()
+    def _publish_invalidation(self, session, table_name: str, record_id):
+        """
+        Avisa os outros processos, na transação da escrita, que o registro mudou:
+        o `pg_notify` só é entregue no commit, e cada processo remove o registro do
+        seu cache local (ver `app.config.cache.follow_invalidations`).
+        """
+        cache = self.entity_cache
+        if cache is not None and cache.namespace == table_name and cache.broadcast_channel:
+            session.execute(
+                text("SELECT pg_notify(:channel, :key)"),
+                {"channel": cache.broadcast_channel, "key": cache.key(self._cache_key(record_id))},
+            )
 
-                # Verifica se o registro foi encontrado
-                if result is None:
-                    return {
-                        "status_code": 404,
-                        "message": f"Registro com ID '{id}' não encontrado."
-                    }
+    def _get_by_id(self, session, id: str, columns: Optional[Tuple[str, ...]] = None) -> Dict[str, Union[dict, int]]:
+        """
+        Executa `get_by_id` na sessão informada.
+        """
+        try:
+            columns = columns or self._projection(None)
 
-                # Extrai os nomes dos campos (field_names)
-                field_names = list(result._fields) if hasattr(result, '_fields') else []
+            # Garantir que o nome da tabela tenha a primeira letra maiúscula
+            table_name = self.model.__tablename__.capitalize()
 
-                # Converte o registro encontrado em um dicionário
-                record = {field: value for field, value in zip(field_names, result)}
+            # Query para buscar o registro pelo ID
+            query = cached_statement(
+                (self.model, "get_by_id", columns),
+                lambda: text(f'SELECT {self._select_list(columns)} FROM "{table_name}" WHERE id = :id')
+            )
+            result = session.execute(query, {"id": id}).fetchone()
 
-                # Retorna o registro com um status_code de sucesso
+            # Verifica se o registro foi encontrado
+            if result is None:
                 return {
-                    "status_code": 200,
-                    "data": record
+                    "status_code": 404,
+                    "message": f"Registro com ID '{id}' não encontrado."
                 }
 
+            # Extrai os nomes dos campos (field_names)
+            field_names = list(result._fields) if hasattr(result, '_fields') else []
+
+            # Converte o registro encontrado em um dicionário
+            record = {field: value for field, value in zip(field_names, result)}
+
+            # Retorna o registro com um status_code de sucesso
+            return {
+                "status_code": 200,
+                "data": record
+            }
+
         except Exception as e:
             raise RuntimeError(f"Erro ao buscar registro por ID: {str(e)}")
 
+    def get_many(self, ids: List[str]) -> Dict[str, Union[dict, int]]:
+        """
+        Recupera vários registros pelo ID em uma única consulta.
+
+        IDs repetidos são considerados uma vez, e os registros já presentes no
+        cache de entidades não são buscados no banco.
+
+        Args:
+            ids (List[str]): IDs dos registros, na ordem desejada.
+
+        Returns:
+            Dict[str, Union[dict, int]]: O status_code e, em `data`, os registros na ordem
+            de `ids` (`records`) e os IDs não encontrados (`missing`).
+
+        Raises:
+            ValueError: Se a lista estiver vazia, exceder `max_get_many` ou contiver IDs inválidos.
+        """
+        ids = self._normalize_ids(ids)
+        found, generations = self._cached_many(ids)
+        if generations:
+            with self.read_session() as session:
+                fetched = self._get_many(session, list(generations))
+            found.update(self._cache_many(fetched, generations))
+        return self._many_result(ids, found)
+
+    def _get_many(self, session, ids: List[str]) -> Dict[str, dict]:
+        """
+        Executa a consulta de `get_many` na sessão informada.
+
+        Returns:
+            Dict[str, dict]: Os registros encontrados, por ID.
+        """
+        try:
+            table_name = self.model.__tablename__.capitalize()
+
+            columns = self._projection(None)
+
+            # Um único parâmetro do tipo array: a instrução é a mesma para qualquer quantidade de IDs
+            query = cached_statement(
+                (self.model, "get_many"),
+                lambda: text(
+                    f'SELECT {self._select_list(columns)} FROM "{table_name}" '
+                    f'WHERE id = ANY(CAST(:ids AS uuid[]))'
+                )
+            )
+            result = session.execute(query, {"ids": ids}).fetchall()
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Erro ao buscar registros por ID: {e}") from e
+
+        return {str(record["id"]).lower(): record for record in self._rows_to_records(result)}
+
+    def _normalize_ids(self, ids: List[str]) -> List[str]:
+        """
+        Valida os IDs de `get_many`, retornando-os na forma canônica e sem repetições.
+        """
+        if not isinstance(ids, list) or not ids:
+            raise ValueError("Informe ao menos um ID.")
+        if len(ids) > self.max_get_many:
+            raise ValueError(f"No máximo {self.max_get_many} IDs por consulta.")
+
+        normalized = []
+        for id in ids:
+            canonical = self._canonical_id(id)
+            if canonical is None:
+                raise ValueError(f"ID inválido: '{id}'.")
+            normalized.append(canonical)
+        return list(dict.fromkeys(normalized))
+
+    def _cached_many(self, ids: List[str]) -> Tuple[Dict[str, dict], Dict[str, int]]:
+        """
+        Separa os IDs de `get_many` entre os registros em cache e os que faltam buscar
+        (com a geração a repassar a `_cache_many`).
+        """
+        found, generations = {}, {}
+        for id in ids:
+            cached, generation = self._cached_get(id)
+            if cached is not None:
+                found[id] = cached["data"]
+            else:
+                generations[id] = generation
+        return found, generations
+
+    def _cache_many(self, fetched: Dict[str, dict], generations: Dict[str, int]) -> Dict[str, dict]:
+        """
+        Grava no cache de entidades os registros lidos por `get_many`.
+        """
+        for id, record in fetched.items():
+            self._cache_result(id, {"status_code": 200, "data": record}, generations[id])
+        return fetched
+
+    @staticmethod
+    def _many_result(ids: List[str], found: Dict[str, dict]) -> Dict[str, Union[dict, int]]:
+        return {
+            "status_code": 200,
+            "data": {
+                "records": [found[id] for id in ids if id in found],
+                "missing": [id for id in ids if id not in found],
+            },
+        }
+
             
     
 
@@ -155,125 +747,295 @@ class GenericRepository(Generic[T]):
         Returns:
             str: ID gerado para o registro.
         """
+        with self.session_factory() as session:
+            return self._save(session, data, sequence_name, entity_class)
+
+    def _save(self, session, data, sequence_name: str, entity_class=None):
+        """
+        Executa `save` na sessão informada.
+        """
         try:
-            if not entity_class:
-                raise ValueError("A `entity_class` deve ser fornecida para determinar o nome da tabela.")
+            table_name = self._table_name_for(entity_class)
+            metadata = get_model_metadata(entity_class)
+            filtered_data = self._resolve_references(data, metadata.extract(data, metadata.insertable))
+            keys = tuple(filtered_data.keys())
 
-            # Obter o nome da tabela da classe
-            if not hasattr(entity_class, "__tablename__"):
-                raise AttributeError(f"A classe `{entity_class.__name__}` não define o atributo `__tablename__` para o nome da tabela.")
-            
-            table_name = entity_class.__tablename__.capitalize()
+            def build_query():
+                # Montar os campos e os placeholders dinamicamente
+                columns = ', '.join(metadata.column_names[key] for key in keys)
+                placeholders = ', '.join([f":{key}" for key in keys])
+
+                # Query genérica para inserção
+                return text(f"""
+                    INSERT INTO "{table_name}" (id, {columns})
+                    VALUES (generate_sequential_uuid('{sequence_name}'), {placeholders})
+                    RETURNING id
+                """)
+
+            query = cached_statement((metadata.model, "insert", sequence_name, keys), build_query)
+
+            # Executar a query de inserção
+            result = session.execute(query, filtered_data)
+
+            # Obter o ID gerado
+            generated_id = result.scalar()
+            self._after_write(session, table_name, [generated_id])
+            session.commit()
+            mark_write(table_name)
+            self._invalidate_cached(table_name, generated_id)
+            return generated_id
+
+        except SQLAlchemyError as e:
+            session.rollback()  # Reverte as alterações no banco em caso de erro
+            raise RuntimeError(f"Erro ao salvar no banco: {e}") from e
+
+    def save_many(
+        self,
+        items: Iterable,
+        sequence_name: str,
+        entity_class=None,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Salva vários registros em uma única transação e retorna os IDs na ordem de entrada.
+
+        Os IDs são reservados de uma vez com `generate_sequential_uuid` e os registros
+        são gravados com INSERT multi-linha em lotes; a partir de `copy_threshold`
+        registros, a carga é feita via `COPY FROM STDIN`. Os valores são convertidos para
+        o tipo de cada coluna e as colunas omitidas recebem o valor padrão do banco.
 
-            # Extrair atributos da entidade
-            entity_attributes = {key for key in dir(entity_class) if not key.startswith("_") and not callable(getattr(entity_class, key))}
+        Args:
+            items (Iterable): Objetos com atributos ou dicionários a serem inseridos.
+            sequence_name (str): Nome da sequência para gerar os IDs.
+            entity_class: A classe associada à tabela.
+            batch_size (Optional[int]): Registros por INSERT. Padrão: `bulk_batch_size`.
+            copy_threshold (Optional[int]): Quantidade a partir da qual usar COPY. Padrão: `copy_threshold`.
 
-            # Converter o objeto em um dicionário se necessário
-            if not isinstance(data, dict):
-                data = {key: getattr(data, key) for key in dir(data) if not key.startswith("_") and not callable(getattr(data, key))}
+        Returns:
+            List: IDs gerados, na mesma ordem de `items`.
 
-            # Atributos a serem excluídos
-            excluded_attributes = {"metadata", "registry", "id"}
+        Raises:
+            ValueError: Se algum valor não puder ser convertido para o tipo da coluna.
+        """
+        with self.session_factory() as session:
+            return self._save_many(session, items, sequence_name, entity_class, batch_size, copy_threshold)
 
-            # Filtrar apenas atributos válidos, que não sejam coleções, e não estejam na lista de exclusão
-            filtered_data = {
-                key: value
-                for key, value in data.items()
-                if key in entity_attributes
-                and not isinstance(value, (list, dict, set, tuple))
-                and key not in excluded_attributes
+    def _save_many(
+        self,
+        session,
+        items: Iterable,
+        sequence_name: str,
+        entity_class=None,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Executa `save_many` na sessão informada.
+        """
+        batch_size = batch_size or self.bulk_batch_size
+        copy_threshold = self.copy_threshold if copy_threshold is None else copy_threshold
+
+        table_name = self._table_name_for(entity_class)
+        metadata = get_model_metadata(entity_class)
+        rows = [
+            {
+                column: metadata.coerce(column, value)
+                for column, value in self._resolve_references(item, metadata.extract(item, metadata.insertable)).items()
             }
+            for item in items
+        ]
+        if not rows:
+            return []
+
+        try:
+            # Reserva todos os IDs em uma única ida ao banco
+            ids = session.execute(
+                text("SELECT generate_sequential_uuid(:sequence_name) FROM generate_series(1, :total)"),
+                {"sequence_name": sequence_name, "total": len(rows)}
+            ).scalars().all()
+
+            # Registros agrupados pelas colunas informadas: as omitidas ficam com o valor
+            # padrão do banco (ex.: `version`), em vez de NULL
+            groups: Dict[Tuple[str, ...], List[list]] = {}
+            for record_id, row in zip(ids, rows):
+                columns = tuple(column for column in metadata.columns if column in row)
+                groups.setdefault(columns, []).append([record_id] + [row[column] for column in columns])
 
-            # Montar os campos e os placeholders dinamicamente
-            columns = ', '.join(filtered_data.keys())
-            placeholders = ', '.join([f":{key}" for key in filtered_data.keys()])
+            for columns, values in groups.items():
+                all_columns = ["id"] + [metadata.column_names[column] for column in columns]
 
-            # Query genérica para inserção
-            query = text(f"""
-                INSERT INTO "{table_name}" (id, {columns})
-                VALUES (generate_sequential_uuid('{sequence_name}'), {placeholders})
-                RETURNING id
-            """)
+                copied = len(values) >= copy_threshold and copy_rows(session, table_name, all_columns, values)
+                if not copied:
+                    # Respeita o limite de parâmetros por comando do driver
+                    group_batch_size = max(1, min(batch_size, MAX_BIND_PARAMETERS // len(all_columns)))
+                    for batch in batched(values, group_batch_size):
+                        params = {}
+                        placeholders = []
+                        for index, row in enumerate(batch):
+                            names = [f"p{index}_{position}" for position in range(len(all_columns))]
+                            params.update(zip(names, row))
+                            placeholders.append("(" + ", ".join(f":{name}" for name in names) + ")")
 
-            with self.session_factory() as session:
-                # Executar a query de inserção
-                result = session.execute(query, filtered_data)
+                        session.execute(
+                            text(f'INSERT INTO "{table_name}" ({", ".join(all_columns)}) VALUES {", ".join(placeholders)}'),
+                            params
+                        )
 
-                # Obter o ID gerado
-                generated_id = result.scalar()
-                session.commit()
-                return generated_id
+            self._after_write(session, table_name, ids)
+            session.commit()
+            mark_write(table_name)
+            return ids
 
         except SQLAlchemyError as e:
             session.rollback()  # Reverte as alterações no banco em caso de erro
-            raise RuntimeError(f"Erro ao salvar no banco: {e}") from e
+            raise RuntimeError(f"Erro ao salvar registros em lote no banco: {e}") from e
 
-    def update(self, record_id: str, data, entity_class=None):
+    def update(self, record_id: str, data, entity_class=None, expected_version: Optional[int] = None):
         """
         Atualiza um registro genérico no banco de dados usando SQL ANSI.
 
+        Se o modelo tem a coluna `version`, ela é incrementada na mesma instrução.
+        Com `expected_version`, a atualização só é aplicada se o registro ainda
+        estiver nessa versão (controle de concorrência otimista), em um único
+        `UPDATE ... WHERE version = :expected_version`.
+
         Args:
             record_id (str): O ID do registro a ser atualizado.
             data: Dados a serem atualizados como um objeto com atributos ou dicionário.
             entity_class: A classe associada à tabela para acessar os atributos e o nome da tabela.
+                Padrão: o modelo do repositório.
+            expected_version (Optional[int]): Versão que o registro deve ter.
 
         Returns:
-            bool: True se a atualização for bem-sucedida, False caso contrário.
+            bool: True se a atualização for bem-sucedida, False se o registro não existir.
+
+        Raises:
+            VersionConflictError: Se o registro existir em outra versão.
+        """
+        with self.session_factory() as session:
+            return self._update(session, record_id, data, entity_class, expected_version)
+
+    def _update(self, session, record_id: str, data, entity_class=None, expected_version: Optional[int] = None):
         """
+        Executa `update` na sessão informada.
+        """
+        entity_class = entity_class or self.model
         try:
-            if not entity_class:
-                raise ValueError("A `entity_class` deve ser fornecida para determinar o nome da tabela.")
+            table_name = self._table_name_for(entity_class)
+            metadata = get_model_metadata(entity_class)
+            filtered_data = self._resolve_references(data, metadata.extract(data, metadata.updatable))
 
-            # Obter o nome da tabela da classe
-            if not hasattr(entity_class, "__tablename__"):
-                raise AttributeError(f"A classe `{entity_class.__name__}` não define o atributo `__tablename__` para o nome da tabela.")
-            
-            table_name = entity_class.__tablename__.capitalize()
+            if not filtered_data:
+                raise ValueError("Nenhum dado válido para atualização.")
 
-            # Extrair atributos da entidade
-            entity_attributes = {key for key in dir(entity_class) if not key.startswith("_") and not callable(getattr(entity_class, key))}
+            if expected_version is not None and not metadata.versioned:
+                raise ValueError(f"A tabela {table_name} não tem coluna de versão.")
 
-            # Converter o objeto em um dicionário se necessário
-            if not isinstance(data, dict):
-                data = {key: getattr(data, key) for key in dir(data) if not key.startswith("_") and not callable(getattr(data, key))}
+            keys = tuple(filtered_data.keys())
+            conditional = expected_version is not None
 
-            # Atributos a serem excluídos
-            excluded_attributes = {"metadata", "registry", "id"}
+            def build_query():
+                # Montar os campos para o SET dinamicamente
+                assignments = [f"{metadata.column_names[key]} = :{key}" for key in keys]
+                if metadata.versioned:
+                    assignments.append(f"{VERSION_COLUMN} = {VERSION_COLUMN} + 1")
+                condition = "id = :record_id"
+                if conditional:
+                    condition += f" AND {VERSION_COLUMN} = :expected_version"
 
-            # Filtrar apenas atributos válidos, que não sejam coleções, e não estejam na lista de exclusão
-            filtered_data = {
-                key: value
-                for key, value in data.items()
-                if key in entity_attributes
-                and not isinstance(value, (list, dict, set, tuple))
-                and key not in excluded_attributes
-            }
+                # Query genérica para atualização
+                return text(f"""
+                    UPDATE "{table_name}"
+                    SET {', '.join(assignments)}
+                    WHERE {condition}
+                """)
 
-            if not filtered_data:
-                raise ValueError("Nenhum dado válido para atualização.")
+            query = cached_statement((metadata.model, "update", keys, conditional), build_query)
 
-            # Montar os campos para o SET dinamicamente
-            set_clause = ', '.join([f"{key} = :{key}" for key in filtered_data.keys()])
+            # Adicionar o ID do registro ao conjunto de dados
+            filtered_data["record_id"] = record_id
+            if conditional:
+                filtered_data["expected_version"] = expected_version
 
-            # Query genérica para atualização
-            query = text(f"""
-                UPDATE "{table_name}"
-                SET {set_clause}
-                WHERE id = :record_id
-            """)
+            # Executar a query de atualização
+            self._before_write(session, table_name, [record_id], keys)
+            result = session.execute(query, filtered_data)
 
-            with self.session_factory() as session:
-                # Adicionar o ID do registro ao conjunto de dados
-                filtered_data["record_id"] = record_id
+            # Confirmar se a atualização afetou alguma linha
+            updated = result.rowcount > 0
+            if updated:
+                self._after_write(session, table_name, [record_id], keys)
+            elif conditional:
+                # Só no caminho de falha: distinguir registro inexistente de versão divergente
+                current_version = session.execute(
+                    text(f'SELECT {VERSION_COLUMN} FROM "{table_name}" WHERE id = :record_id'),
+                    {"record_id": record_id}
+                ).scalar()
+                if current_version is not None:
+                    session.rollback()
+                    raise VersionConflictError(record_id, expected_version, current_version)
+            if updated:
+                self._publish_invalidation(session, table_name, record_id)
+            session.commit()
+            mark_write(table_name)
+            self._invalidate_cached(table_name, record_id)
+            return updated
 
-                # Executar a query de atualização
-                result = session.execute(query, filtered_data)
+        except SQLAlchemyError as e:
+            session.rollback()  # Reverte as alterações no banco em caso de erro
+            raise RuntimeError(f"Erro ao atualizar no banco: {e}") from e
 
-                # Confirmar se a atualização afetou alguma linha
-                updated = result.rowcount > 0
-                session.commit()
-                return updated
+    def delete(self, record_id: str) -> bool:
+        """
+        Remove um registro pelo ID.
+
+        Args:
+            record_id (str): O ID do registro a ser removido.
+
+        Returns:
+            bool: True se um registro foi removido, False caso contrário.
+        """
+        with self.session_factory() as session:
+            return self._delete(session, record_id)
+
+    def _delete(self, session, record_id: str) -> bool:
+        """
+        Executa `delete` na sessão informada.
+        """
+        try:
+            table_name = self.model.__tablename__.capitalize()
+            query = cached_statement(
+                (self.model, "delete"),
+                lambda: text(f'DELETE FROM "{table_name}" WHERE id = :id')
+            )
+            self._before_write(session, table_name, [record_id])
+            deleted = session.execute(query, {"id": record_id}).rowcount > 0
+            if deleted:
+                self._publish_invalidation(session, table_name, record_id)
+            session.commit()
+            mark_write(table_name)
+            self._invalidate_cached(table_name, record_id)
+            return deleted
 
         except SQLAlchemyError as e:
             session.rollback()  # Reverte as alterações no banco em caso de erro
-            raise RuntimeError(f"Erro ao atualizar no banco: {e}") from e
+            raise RuntimeError(f"Erro ao remover do banco: {e}") from e
+
+    @staticmethod
+    def _table_name_for(entity_class) -> str:
+        """
+        Obtém o nome da tabela a partir da classe da entidade.
+
+        Raises:
+            ValueError: Se a classe não for informada.
+            AttributeError: Se a classe não definir `__tablename__`.
+        """
+        if not entity_class:
+            raise ValueError("A `entity_class` deve ser fornecida para determinar o nome da tabela.")
+
+        # Obter o nome da tabela da classe
+        if not hasattr(entity_class, "__tablename__"):
+            raise AttributeError(f"A classe `{entity_class.__name__}` não define o atributo `__tablename__` para o nome da tabela.")
+
+        return entity_class.__tablename__.capitalize()
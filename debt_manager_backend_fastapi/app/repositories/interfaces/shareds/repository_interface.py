@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, TypeVar
+from typing import Dict, Generic, List, Optional, TypeVar
 
 T = TypeVar('T')  # Tipo genérico
 
 class RepositoryInterface(ABC, Generic[T]):
     @abstractmethod
-    def find_all(self, page: int = 1, per_page: int = 10) -> dict:
+    def find_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = 10000,
+    ) -> dict:
         """Recupera todos os itens com paginação."""
         pass
 
@@ -21,4 +31,8 @@ class RepositoryInterface(ABC, Generic[T]):
 
     def get_by_id(self, id: T) -> T:
         """Recupera uma unico registro."""
-        pass
\ No newline at end of file
+        pass
+
+    def get_many(self, ids: List[str]) -> dict:
+        """Recupera vários registros pelo ID."""
+        pass
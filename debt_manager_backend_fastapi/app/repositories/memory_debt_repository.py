@@ -0,0 +1,325 @@
+import re
+from decimal import Decimal
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from app.models.debt import Debt
+from app.repositories.async_debt_repository import AsyncDebtRepository
+from app.repositories.debt_repository import DebtRepository
+from app.repositories.debt_summary_repository import DebtSummaryRepository
+from app.repositories.memory_repository import InMemoryRepository, MemoryConstraintError, MemorySession, MemoryTable
+from app.repositories.pagination import decode_cursor, encode_cursor
+from app.repositories.status_registry import status_registry
+
+# Minimum trigram similarity for a fuzzy name match (pg_trgm's default threshold)
+SIMILARITY_THRESHOLD = 0.3
+
+# Weight of a search term found in the description or only in the notes
+DESCRIPTION_WEIGHT = 1.0
+NOTES_WEIGHT = 0.4
+
+
+def _words(value: Optional[str]) -> List[str]:
+    return re.findall(r"\w+", (value or "").lower())
+
+
+def _trigrams(value: Optional[str]) -> Set[str]:
+    """Trigrams of each word, padded like pg_trgm does."""
+    trigrams = set()
+    for word in _words(value):
+        padded = f"  {word} "
+        trigrams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return trigrams
+
+
+def _similarity(left: Set[str], right: Set[str]) -> float:
+    union = left | right
+    return len(left & right) / len(union) if union else 0.0
+
+
+def _parse_search(q: str) -> Tuple[List[Set[str]], Set[str]]:
+    """
+    Split a web search query into alternatives (joined by `or`), each a set of
+    words that must all match, and the words excluded with `-word`. Quoted
+    phrases are matched as their words.
+    """
+    alternatives, excluded = [set()], set()
+    for token in re.findall(r'-?"[^"]*"|-?[^\s"]+', q.lower()):
+        if token == "or":
+            alternatives.append(set())
+        elif token.startswith("-"):
+            excluded.update(_words(token))
+        else:
+            alternatives[-1].update(_words(token))
+    return [words for words in alternatives if words], excluded
+
+
+class InMemoryDebtSummaryRepository(DebtSummaryRepository):
+    """
+    Debt count and total amount per (user, status, creditor), kept in memory
+    from the write deltas of the in-memory debt table.
+    """
+
+    def __init__(self, table: MemoryTable):
+        super().__init__(session_factory=MemorySession, read_session_factory=lambda table_name: MemorySession())
+        self.table = table
+        self._groups: Dict[Tuple, List] = {}
+
+    def apply_delta(self, session, debt_ids: Iterable, sign: int):
+        """
+        Add (`sign=1`) or subtract (`sign=-1`) the given debts to or from the summary.
+        Called under the table's lock, like `DebtSummaryRepository.apply_delta` runs in the write's transaction.
+        """
+        with self.table.lock:
+            for debt_id in debt_ids:
+                debt = self.table.get(debt_id)
+                if debt is None:
+                    continue
+                key = (debt["user_id"], debt["status_id"], debt["creditor_name"])
+                group = self._groups.setdefault(key, [0, Decimal(0)])
+                group[0] += sign
+                group[1] += sign * Decimal(str(debt["amount"]))
+                if group[0] == 0:
+                    del self._groups[key]
+
+    def _summarize(self, session, group_by: Sequence[str] = ()) -> Dict:
+        group_by = self._validate_group_by(group_by)
+
+        totals: Dict[Tuple, List] = {}
+        with self.table.lock:
+            for (user_id, status_id, creditor_name), (debt_count, total_amount) in self._groups.items():
+                dimensions = {
+                    "user_id": str(user_id),
+                    "status": status_registry.name_for(status_id),
+                    "creditor_name": creditor_name,
+                }
+                total = totals.setdefault(tuple(dimensions[dimension] for dimension in group_by), [0, Decimal(0)])
+                total[0] += debt_count
+                total[1] += total_amount
+
+        groups = []
+        for key in sorted(totals, key=lambda values: [(value is None, value) for value in values]):
+            debt_count, total_amount = totals[key]
+            if debt_count != 0:
+                groups.append({
+                    **dict(zip(group_by, key)),
+                    "debt_count": debt_count,
+                    "total_amount": float(total_amount),
+                })
+        return {"group_by": group_by, "groups": groups}
+
+    def rebuild(self) -> int:
+        """
+        Recompute the whole summary from the debt table.
+
+        Returns:
+            int: Number of summary groups.
+        """
+        with self.table.lock:
+            self._groups = {}
+            self.apply_delta(None, self.table.ids(), 1)
+            return len(self._groups)
+
+
+class InMemoryDebtRepository(InMemoryRepository[Debt], DebtRepository):
+    """
+    DebtRepository on an in-memory table, selected with REPOSITORY_BACKEND=memory.
+
+    Debts are hash-indexed by ID, description, user and status, and sorted by
+    each of `sortable_columns`. Creating, importing, summarizing and exporting
+    behave as on the database; the search ranks with a simplified scorer (see `_search`).
+    """
+
+    def __init__(self):
+        InMemoryRepository.__init__(self, Debt, indexed=("description", "user_id", "status_id"))
+        self.summary_repository = InMemoryDebtSummaryRepository(self.table)
+
+    def _find_by_description(self, session, description: str) -> Optional[Debt]:
+        rows = self.table.find("description", description)
+        return Debt(**rows[0]) if rows else None
+
+    def _search(
+        self,
+        session,
+        q: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> dict:
+        """
+        Ranked search over the debts, with the same filters, ordering and cursors as
+        `DebtRepository.search`. Without a full-text index, each candidate debt is
+        scored: terms found in the description weigh more than terms only in the
+        notes, plus the trigram similarity of the debtor or creditor name.
+        """
+        if per_page < 1:
+            raise ValueError("per_page must be greater than zero.")
+        sort_key = self._search_sort_key(q, user_id, status)
+
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, sort_key, "desc")["values"]
+            after = (float(values[0]), str(values[1]))
+
+        status_id = status_registry.require_id(status) if status is not None else None
+        alternatives, excluded = _parse_search(q)
+        query_trigrams = _trigrams(q)
+
+        matches = []
+        for debt in self._search_candidates(user_id, status_id):
+            rank = self._search_rank(debt, alternatives, excluded, query_trigrams)
+            if rank is None:
+                continue
+            key = (-rank, str(debt["id"]))
+            if after is None or key > (-after[0], after[1]):
+                matches.append((key, debt, rank))
+
+        matches.sort(key=lambda match: match[0])
+        columns = self._projection(None)
+        records = [{**self._project(debt, columns), "rank": rank} for _, debt, rank in matches[:per_page + 1]]
+
+        has_more = len(records) > per_page
+        records = records[:per_page]
+        last = records[-1] if records else None
+
+        return {
+            "records": records,
+            "pagination": {
+                "per_page": per_page,
+                "next_cursor": encode_cursor(sort_key, "desc", [last["rank"], last["id"]], "next")
+                if has_more else None,
+            },
+        }
+
+    def _search_candidates(self, user_id: Optional[UUID], status_id: Optional[str]) -> Iterator[dict]:
+        if user_id is not None:
+            debts = self.table.find("user_id", user_id)
+        elif status_id is not None:
+            debts = self.table.find("status_id", status_id)
+        else:
+            debts = (self.table.get(debt_id) for debt_id in self.table.ids())
+        for debt in debts:
+            if debt is not None and (status_id is None or str(debt["status_id"]) == status_id):
+                yield debt
+
+    @staticmethod
+    def _search_rank(
+        debt: dict,
+        alternatives: List[Set[str]],
+        excluded: Set[str],
+        query_trigrams: Set[str],
+    ) -> Optional[float]:
+        """Relevance of a debt for the parsed query, or None if it does not match."""
+        description = set(_words(debt["description"]))
+        notes = set(_words(debt["notes"]))
+        document = description | notes
+
+        text_rank = None
+        if not excluded & document:
+            for words in alternatives:
+                if words <= document:
+                    rank = sum(DESCRIPTION_WEIGHT if word in description else NOTES_WEIGHT for word in words)
+                    text_rank = max(text_rank or 0.0, rank / len(words))
+
+        similarity = max(
+            _similarity(query_trigrams, _trigrams(debt["debtor_name"])),
+            _similarity(query_trigrams, _trigrams(debt["creditor_name"])),
+        )
+        if text_rank is None and similarity < SIMILARITY_THRESHOLD:
+            return None
+        return (text_rank or 0.0) + similarity
+
+    def export(
+        self,
+        batch_size: Optional[int] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        due_from=None,
+        due_to=None,
+    ) -> Iterator[Sequence]:
+        """
+        Stream the debts matching the filters (see `DebtRepository.export_statement`), ordered by ID.
+
+        Yields:
+            Sequence: A batch of rows, with the columns in `export_columns`.
+        """
+        batch_size = batch_size or self.export_batch_size
+        status_id = status_registry.require_id(status) if status is not None else None
+        if user_id is not None:
+            debts = self.table.find("user_id", user_id)
+        else:
+            debts = (self.table.get(debt_id) for debt_id in self.table.ids())
+
+        batch = []
+        for debt in debts:
+            if debt is None or (status_id is not None and str(debt["status_id"]) != status_id):
+                continue
+            if due_from is not None and (debt["due_date"] is None or debt["due_date"] < due_from):
+                continue
+            if due_to is not None and (debt["due_date"] is None or debt["due_date"] > due_to):
+                continue
+            batch.append(tuple(
+                status_registry.name_for(debt["status_id"]) if column == "status" else debt[column]
+                for column in self.export_columns
+            ))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _import_batch(self, session, rows: List[Dict]) -> Dict:
+        """
+        Load one batch of validated import rows. See `DebtRepository.import_batch`.
+        """
+        with self.table.lock:
+            rejected, staged, staged_descriptions = [], [], set()
+            for row in rows:
+                status_id = status_registry.id_for(row["status"])
+                if status_id is None:
+                    rejected.append((row["row"], f"Unknown status '{row['status']}'."))
+                elif row["description"] in staged_descriptions or self.table.find("description", row["description"]):
+                    rejected.append((row["row"], f"Debt with description '{row['description']}' already exists."))
+                else:
+                    staged_descriptions.add(row["description"])
+                    staged.append({
+                        "user_id": row["user_id"],
+                        "description": row["description"],
+                        "amount": row["amount"],
+                        "debtor_name": row["debtor_name"],
+                        "creditor_name": row["creditor_name"],
+                        "status_id": status_id,
+                    })
+
+            if staged:
+                try:
+                    ids = self.table.insert_many(staged)
+                except MemoryConstraintError as e:
+                    raise RuntimeError(f"Error importing debts: {e}") from e
+                self._after_write(session, self.table.name, ids)
+            return {"imported": len(staged), "rejected": rejected}
+
+    def add_debt(self, debt: Debt):
+        self.save(debt)
+
+
+class AsyncInMemoryDebtRepository(AsyncDebtRepository):
+    """
+    AsyncDebtRepository over `InMemoryDebtRepository`: each operation runs
+    directly on the event loop, as none of them waits for I/O.
+    """
+
+    def __init__(self, repository: Optional[InMemoryDebtRepository] = None):
+        super().__init__(
+            repository=repository or InMemoryDebtRepository(),
+            session_factory=MemorySession,
+            read_session_factory=None,
+        )
+
+    async def export(self, batch_size: Optional[int] = None, **filters) -> AsyncIterator[Sequence]:
+        """
+        Stream the debts matching `filters`. See `InMemoryDebtRepository.export`.
+        """
+        for partition in self.repository.export(batch_size, **filters):
+            yield partition
@@ -0,0 +1,529 @@
+import threading
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import inspect
+
+from app.repositories.generic_repository import GenericRepository, VersionConflictError
+from app.repositories.model_metadata import VERSION_COLUMN, get_model_metadata
+from app.repositories.pagination import DEFAULT_COUNT_CAP, build_count_metadata, decode_cursor
+
+T = TypeVar("T")  # Tipo genérico
+
+
+class MemoryConstraintError(Exception):
+    """
+    Uma escrita violou uma restrição da tabela em memória (coluna obrigatória,
+    valor único ou tipo), o equivalente ao `IntegrityError` do banco.
+    """
+
+
+class MemorySession:
+    """
+    Sessão das operações em memória: não há conexão nem transação.
+
+    Serve como `session_factory` síncrona (`with`) e assíncrona (`async with`),
+    e `run_sync` executa a operação direto no event loop, já que ela não espera
+    por E/S (veja `AsyncGenericRepository.run`).
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run_sync(self, operation, *args, **kwargs):
+        return operation(self, *args, **kwargs)
+
+
+class SortedIndex:
+    """
+    Chaves `(valor, id)` de uma coluna em uma lista ordenada.
+
+    As páginas por offset e por chave (keyset) são fatias da lista, localizadas
+    por busca binária, sem ordenar a tabela a cada leitura.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, value, record_id: str):
+        insort(self._keys, (value, record_id))
+
+    def add_many(self, keys: List[Tuple]):
+        """
+        Adiciona várias chaves `(valor, id)`. Em lote, anexar e reordenar (o Timsort
+        aproveita a parte já ordenada) evita deslocar a lista a cada inserção.
+        """
+        if len(keys) == 1:
+            insort(self._keys, keys[0])
+        else:
+            self._keys.extend(keys)
+            self._keys.sort()
+
+    def remove(self, value, record_id: str):
+        key = (value, record_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def page(self, offset: int, limit: int, descending: bool = False) -> List[str]:
+        """
+        IDs da página `offset`/`limit`, na ordem pedida.
+        """
+        if descending:
+            end = max(len(self._keys) - offset, 0)
+            keys = self._keys[max(end - limit, 0):end]
+            keys.reverse()
+        else:
+            keys = self._keys[offset:offset + limit]
+        return [record_id for _, record_id in keys]
+
+    def after(self, key: Optional[Tuple], limit: int, forward: bool = True) -> List[str]:
+        """
+        IDs de até `limit` chaves estritamente depois de `key` em ordem crescente ou,
+        com `forward=False`, estritamente antes dela em ordem decrescente. Sem `key`,
+        começa pela ponta correspondente.
+        """
+        if forward:
+            start = 0 if key is None else bisect_right(self._keys, key)
+            keys = self._keys[start:start + limit]
+        else:
+            end = len(self._keys) if key is None else bisect_left(self._keys, key)
+            keys = self._keys[max(end - limit, 0):end]
+            keys.reverse()
+        return [record_id for _, record_id in keys]
+
+    def ids(self) -> List[str]:
+        """
+        Todos os IDs, em ordem crescente.
+        """
+        return [record_id for _, record_id in self._keys]
+
+
+class MemoryTable:
+    """
+    Tabela em memória de um modelo SQLAlchemy.
+
+    Os registros ficam em um dicionário por ID, com índices hash (únicos ou não)
+    para buscas por igualdade e índices ordenados (`SortedIndex`) para a paginação.
+    As escritas, e as leituras que combinam mais de uma estrutura, são serializadas
+    por um `RLock`, que os repositórios também usam para agrupar escrita e ganchos.
+    Um registro nunca é alterado no lugar (a atualização troca o dicionário), então
+    os dicionários já lidos podem ser usados fora do lock.
+    """
+
+    def __init__(
+        self,
+        model,
+        unique: Iterable[str] = (),
+        indexed: Iterable[str] = (),
+        sortable: Iterable[str] = ("id",),
+    ):
+        """
+        Args:
+            model: Classe do modelo SQLAlchemy.
+            unique (Iterable[str]): Colunas com valor único, indexadas por hash.
+            indexed (Iterable[str]): Colunas indexadas por hash, com valores repetidos.
+            sortable (Iterable[str]): Colunas com índice ordenado (o `id` sempre tem).
+        """
+        self.model = model
+        self.metadata = get_model_metadata(model)
+        self.name = self.metadata.table_name
+        self.lock = threading.RLock()
+
+        self._rows: Dict[str, dict] = {}
+        self._unique: Dict[str, Dict] = {column: {} for column in unique}
+        self._indexed: Dict[str, Dict] = {column: {} for column in indexed}
+        self._sorted: Dict[str, SortedIndex] = {column: SortedIndex() for column in {"id", *sortable}}
+
+        # Colunas NOT NULL sem valor padrão, que toda inserção deve informar
+        self.required = tuple(
+            key
+            for key, column in inspect(model).columns.items()
+            if not column.nullable and not column.primary_key
+            and column.default is None and column.server_default is None
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def key(record_id) -> Optional[str]:
+        """
+        Forma canônica de um ID (texto do UUID em minúsculas), ou None se o ID for inválido.
+        """
+        if isinstance(record_id, uuid.UUID):
+            return str(record_id)
+        try:
+            return str(uuid.UUID(str(record_id)))
+        except ValueError:
+            return None
+
+    def get(self, record_id) -> Optional[dict]:
+        """
+        O registro com este ID, ou None. O dicionário é o da tabela e não deve ser alterado.
+        """
+        key = self.key(record_id)
+        return self._rows.get(key) if key is not None else None
+
+    def find(self, column: str, value) -> List[dict]:
+        """
+        Registros com `column` igual a `value`, em ordem de ID; pelo índice hash
+        da coluna, quando houver, ou percorrendo a tabela.
+        """
+        value = self._coerce(column, value)
+        with self.lock:
+            if column in self._unique:
+                record_id = self._unique[column].get(value)
+                return [self._rows[record_id]] if record_id is not None else []
+            if column in self._indexed:
+                return [self._rows[record_id] for record_id in sorted(self._indexed[column].get(value, ()))]
+            return [row for _, row in sorted(self._rows.items()) if row[column] == value]
+
+    def page(self, sort_by: str, offset: int, limit: int, descending: bool = False) -> List[dict]:
+        """
+        Registros da página `offset`/`limit`, ordenados por `sort_by` e pelo `id`.
+        """
+        with self.lock:
+            return [self._rows[record_id] for record_id in self._sorted[sort_by].page(offset, limit, descending)]
+
+    def after(self, sort_by: str, key: Optional[Tuple], limit: int, forward: bool = True) -> List[dict]:
+        """
+        Registros depois (ou antes, com `forward=False`) da chave `(valor, id)`. Veja `SortedIndex.after`.
+        """
+        with self.lock:
+            return [self._rows[record_id] for record_id in self._sorted[sort_by].after(key, limit, forward)]
+
+    def ids(self) -> List[str]:
+        """
+        Cópia dos IDs, em ordem crescente (para percorrer a tabela enquanto ela recebe escritas).
+        """
+        with self.lock:
+            return self._sorted["id"].ids()
+
+    def insert(self, values: dict) -> uuid.UUID:
+        """
+        Insere um registro e retorna o ID gerado.
+
+        Raises:
+            MemoryConstraintError: Se faltar uma coluna obrigatória, um valor único
+                já existir ou um valor não for do tipo da coluna.
+        """
+        return self.insert_many([values])[0]
+
+    def insert_many(self, rows: List[dict]) -> List[uuid.UUID]:
+        """
+        Insere vários registros de uma vez: se algum violar uma restrição, nenhum é inserido.
+        Registros com `id` o mantêm (ex.: cargas com IDs determinísticos); os demais recebem um novo.
+
+        Returns:
+            List[uuid.UUID]: IDs dos registros, na ordem de `rows`.
+        """
+        prepared = [self._prepare(values) for values in rows]
+        with self.lock:
+            for column, index in {"id": self._rows, **self._unique}.items():
+                seen = set()
+                for row in prepared:
+                    value = row[column]
+                    if value in index or value in seen:
+                        raise MemoryConstraintError(f"Valor duplicado para '{column}': '{value}'.")
+                    seen.add(value)
+
+            keys = [str(row["id"]) for row in prepared]
+            for key, row in zip(keys, prepared):
+                self._rows[key] = row
+                self._add_to_hash_indexes(key, row)
+            for column, index in self._sorted.items():
+                index.add_many([(key if column == "id" else row[column], key) for key, row in zip(keys, prepared)])
+        return [row["id"] for row in prepared]
+
+    def update(self, record_id, values: dict) -> bool:
+        """
+        Atualiza colunas de um registro e incrementa a versão, se o modelo a tiver.
+
+        Returns:
+            bool: True se o registro existia.
+
+        Raises:
+            MemoryConstraintError: Se um valor único já existir em outro registro ou
+                um valor não for do tipo da coluna. O registro não é alterado.
+        """
+        values = {column: self._coerce(column, value) for column, value in values.items()}
+        self._check_required(values)
+        with self.lock:
+            current = self.get(record_id)
+            if current is None:
+                return False
+            key = str(current["id"])
+            for column, index in self._unique.items():
+                value = values.get(column, current[column])
+                owner = index.get(value)
+                if owner is not None and owner != key:
+                    raise MemoryConstraintError(f"Valor duplicado para '{column}': '{value}'.")
+
+            row = {**current, **values}
+            if self.metadata.versioned:
+                row[VERSION_COLUMN] = current[VERSION_COLUMN] + 1
+            self._remove(key, current)
+            self._add(key, row)
+        return True
+
+    def delete(self, record_id) -> bool:
+        """
+        Remove um registro. Retorna True se ele existia.
+        """
+        with self.lock:
+            current = self.get(record_id)
+            if current is None:
+                return False
+            self._remove(str(current["id"]), current)
+        return True
+
+    def _prepare(self, values: dict) -> dict:
+        """
+        Monta a linha completa de uma inserção: todas as colunas, ID e versão inicial.
+        """
+        row = dict.fromkeys(self.metadata.columns)
+        row.update((column, self._coerce(column, value)) for column, value in values.items())
+        missing = [column for column in self.required if row[column] is None]
+        if missing:
+            raise MemoryConstraintError(f"Colunas obrigatórias sem valor: {', '.join(missing)}.")
+        if row["id"] is None:
+            row["id"] = uuid.uuid4()
+        if self.metadata.versioned:
+            row[VERSION_COLUMN] = 1
+        return row
+
+    def _check_required(self, values: dict):
+        missing = [column for column in self.required if column in values and values[column] is None]
+        if missing:
+            raise MemoryConstraintError(f"Colunas obrigatórias sem valor: {', '.join(missing)}.")
+
+    def _coerce(self, column: str, value):
+        """
+        Converte o valor para o tipo Python da coluna, como o banco faria ao gravá-lo.
+        """
+        try:
+            return self.metadata.coerce(column, value)
+        except ValueError as e:
+            raise MemoryConstraintError(str(e)) from e
+
+    def _add(self, key: str, row: dict):
+        self._rows[key] = row
+        self._add_to_hash_indexes(key, row)
+        for column, index in self._sorted.items():
+            index.add(key if column == "id" else row[column], key)
+
+    def _add_to_hash_indexes(self, key: str, row: dict):
+        for column, index in self._unique.items():
+            index[row[column]] = key
+        for column, index in self._indexed.items():
+            index.setdefault(row[column], set()).add(key)
+
+    def _remove(self, key: str, row: dict):
+        del self._rows[key]
+        for column, index in self._unique.items():
+            index.pop(row[column], None)
+        for column, index in self._indexed.items():
+            ids = index.get(row[column])
+            if ids is not None:
+                ids.discard(key)
+                if not ids:
+                    del index[row[column]]
+        for column, index in self._sorted.items():
+            index.remove(key if column == "id" else row[column], key)
+
+
+class InMemoryRepository(GenericRepository[T]):
+    """
+    Repositório genérico sobre uma `MemoryTable`, sem banco de dados.
+
+    Substitui as operações que recebem a sessão (`_find_all`, `_get_by_id`, `_save`, ...),
+    de modo que a API pública, as validações e a projeção de colunas continuam as de
+    `GenericRepository`, assim como os ganchos `_resolve_references`, `_before_write`
+    e `_after_write` das subclasses. As respostas têm o mesmo formato das do banco.
+
+    Limitação: textos são ordenados pela comparação do Python, e não pela collation do banco.
+    """
+
+    def __init__(self, model, unique: Iterable[str] = (), indexed: Iterable[str] = ()):
+        """
+        Args:
+            model: Classe do modelo SQLAlchemy.
+            unique (Iterable[str]): Colunas com valor único, indexadas por hash.
+            indexed (Iterable[str]): Outras colunas indexadas por hash.
+        """
+        # Chamada explícita: as subclasses também herdam de um repositório do banco
+        GenericRepository.__init__(self, session_factory=MemorySession, model=model)
+        self.table = MemoryTable(model, unique=unique, indexed=indexed, sortable=self.sortable_columns)
+
+    def _project(self, row: dict, columns: Tuple[str, ...]) -> dict:
+        return {column: row[column] for column in columns}
+
+    def _find_all(
+        self,
+        session,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = DEFAULT_COUNT_CAP,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Executa `find_all` sobre os índices ordenados da tabela. Veja `GenericRepository.find_all`.
+        """
+        if cursor is not None:
+            mode = "cursor"
+        if count is None:
+            count = "none" if mode == "cursor" else "exact"
+        self._validate_pagination(per_page, sort_by, order, mode)
+        self._validate_count(count, count_cap)
+        columns = self._projection(fields, required=("id", sort_by))
+        count_metadata = self._count_metadata(session, count, count_cap, per_page)
+
+        if mode == "cursor":
+            decoded = decode_cursor(cursor, sort_by, order) if cursor else None
+            direction = decoded["direction"] if decoded else "next"
+            forward = (order == "asc") == (direction == "next")
+            rows = self.table.after(sort_by, self._cursor_key(sort_by, decoded), per_page + 1, forward)
+            records = [self._project(row, columns) for row in rows]
+            return self._keyset_result(records, per_page, decoded, sort_by, order, count_metadata)
+
+        page = max(page, 1)
+        rows = self.table.page(sort_by, (page - 1) * per_page, per_page, descending=order == "desc")
+        records = [self._project(row, columns) for row in rows]
+        return self._offset_result(records, page, per_page, sort_by, order, count_metadata)
+
+    def _cursor_key(self, sort_by: str, decoded: Optional[dict]) -> Optional[Tuple]:
+        """
+        Chave `(valor, id)` do índice ordenado correspondente ao cursor.
+        """
+        if not decoded:
+            return None
+        values = decoded["values"]
+        record_id = str(self._coerce_column_value("id", values[-1]))
+        if sort_by == "id":
+            return record_id, record_id
+        return self._coerce_column_value(sort_by, values[0]), record_id
+
+    def _count_metadata(self, session, count: str, count_cap: int, per_page: int) -> dict:
+        """
+        Campos de contagem do payload de paginação. Em memória o total exato custa O(1),
+        então a estratégia "estimated" também o usa.
+        """
+        if count == "none":
+            return build_count_metadata(count, None, per_page)
+        total_records = len(self.table)
+        if count == "capped" and total_records > count_cap:
+            return build_count_metadata(count, count_cap, per_page, capped=True)
+        return build_count_metadata(count, total_records, per_page)
+
+    def _get_by_id(self, session, id: str, columns: Optional[Tuple[str, ...]] = None) -> Dict:
+        """
+        Executa `get_by_id` pelo dicionário de registros da tabela.
+        """
+        row = self.table.get(id)
+        if row is None:
+            return {
+                "status_code": 404,
+                "message": f"Registro com ID '{id}' não encontrado."
+            }
+        return {"status_code": 200, "data": self._project(row, columns or self._projection(None))}
+
+    def _get_many(self, session, ids: List[str]) -> Dict[str, dict]:
+        """
+        Executa a busca de `get_many` pelo dicionário de registros da tabela.
+        """
+        columns = self._projection(None)
+        found = {}
+        for id in ids:
+            row = self.table.get(id)
+            if row is not None:
+                found[id] = self._project(row, columns)
+        return found
+
+    def _save(self, session, data, sequence_name: str, entity_class=None):
+        """
+        Executa `save` na tabela em memória. O ID é um UUID aleatório (`sequence_name` é ignorado).
+        """
+        return self._save_many(session, [data], sequence_name, entity_class)[0]
+
+    def _save_many(
+        self,
+        session,
+        items: Iterable,
+        sequence_name: str,
+        entity_class=None,
+        batch_size: Optional[int] = None,
+        copy_threshold: Optional[int] = None,
+    ) -> List:
+        """
+        Executa `save_many` na tabela em memória: todos os registros ou nenhum.
+        """
+        metadata = get_model_metadata(entity_class or self.model)
+        rows = [self._resolve_references(item, metadata.extract(item, metadata.insertable)) for item in items]
+        if not rows:
+            return []
+
+        with self.table.lock:
+            try:
+                ids = self.table.insert_many(rows)
+            except MemoryConstraintError as e:
+                raise RuntimeError(f"Erro ao salvar no banco: {e}") from e
+            self._after_write(session, self.table.name, ids)
+        return ids
+
+    def _update(self, session, record_id: str, data, entity_class=None, expected_version: Optional[int] = None):
+        """
+        Executa `update` na tabela em memória. Veja `GenericRepository.update`.
+        """
+        metadata = get_model_metadata(entity_class or self.model)
+        values = self._resolve_references(data, metadata.extract(data, metadata.updatable))
+        if not values:
+            raise ValueError("Nenhum dado válido para atualização.")
+        if expected_version is not None and not metadata.versioned:
+            raise ValueError(f"A tabela {self.table.name} não tem coluna de versão.")
+
+        keys = tuple(values.keys())
+        with self.table.lock:
+            current = self.table.get(record_id)
+            if current is None:
+                return False
+            if expected_version is not None and current[VERSION_COLUMN] != expected_version:
+                raise VersionConflictError(record_id, expected_version, current[VERSION_COLUMN])
+
+            self._before_write(session, self.table.name, [record_id], keys)
+            try:
+                self.table.update(record_id, values)
+            except MemoryConstraintError as e:
+                # O registro não mudou: desfaz o gancho anterior à escrita
+                self._after_write(session, self.table.name, [record_id], keys)
+                raise RuntimeError(f"Erro ao atualizar no banco: {e}") from e
+            self._after_write(session, self.table.name, [record_id], keys)
+        return True
+
+    def _delete(self, session, record_id: str) -> bool:
+        """
+        Executa `delete` na tabela em memória.
+        """
+        with self.table.lock:
+            if self.table.get(record_id) is None:
+                return False
+            self._before_write(session, self.table.name, [record_id])
+            return self.table.delete(record_id)
@@ -0,0 +1,51 @@
+from typing import Optional, Union
+
+from app.middlewares.jwt_middleware import decode_jwt
+from app.models.user import User
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.memory_repository import InMemoryRepository, MemorySession
+from app.repositories.user_repository import UserRepository
+
+
+class InMemoryUserRepository(InMemoryRepository[User], UserRepository):
+    """
+    UserRepository on an in-memory table, selected with REPOSITORY_BACKEND=memory.
+
+    Users are hash-indexed by ID and by their unique email and username, and
+    sorted by each of `sortable_columns`.
+    """
+
+    def __init__(self):
+        InMemoryRepository.__init__(self, User, unique=("email", "username"))
+
+    def _find_by_email(self, session, email: str) -> bool:
+        """Whether a user with this email exists (see `UserService.create_user`)."""
+        return bool(self.table.find("email", email))
+
+    def _get_by_email(self, session, email: str) -> Optional[dict]:
+        rows = self.table.find("email", email)
+        return dict(rows[0]) if rows else None
+
+    def _get_verify_password(self, session, password: str) -> Union[User, str]:
+        return bool(self.table.find("hashed_password", decode_jwt(password)))
+
+    def find_by_username(self, username: str) -> Optional[User]:
+        rows = self.table.find("username", username)
+        return User(**rows[0]) if rows else None
+
+    def add_user(self, user: User):
+        self.save(user)
+
+
+class AsyncInMemoryUserRepository(AsyncUserRepository):
+    """
+    AsyncUserRepository over `InMemoryUserRepository`: each operation runs
+    directly on the event loop, as none of them waits for I/O.
+    """
+
+    def __init__(self, repository: Optional[InMemoryUserRepository] = None):
+        super().__init__(
+            repository=repository or InMemoryUserRepository(),
+            session_factory=MemorySession,
+            read_session_factory=None,
+        )
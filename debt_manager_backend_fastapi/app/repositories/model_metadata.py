@@ -0,0 +1,131 @@
+import uuid
+from datetime import date, datetime
+from threading import Lock
+from typing import Callable, Dict, Hashable
+
+from sqlalchemy import inspect
+from sqlalchemy.sql.elements import TextClause
+
+# Coluna de versão da linha, incrementada a cada atualização quando o modelo a define
+VERSION_COLUMN = "version"
+
+# Atributos nunca gravados a partir dos dados recebidos
+EXCLUDED_ATTRIBUTES = frozenset({"metadata", "registry", "id", VERSION_COLUMN})
+
+# Valores que não são gravados como coluna
+COLLECTION_TYPES = (list, dict, set, tuple)
+
+_MISSING = object()
+
+
+class ModelMetadata:
+    """
+    Metadados de colunas de um modelo SQLAlchemy, calculados uma única vez por classe.
+    """
+
+    def __init__(self, model):
+        mapper = inspect(model)
+
+        self.model = model
+        self.table_name = model.__tablename__.capitalize()
+
+        # Atributos mapeados para colunas (relacionamentos ficam de fora). `mapper.columns`
+        # não configura os mappers, ao contrário de `column_attrs`, então um relacionamento
+        # ainda não resolvível não impede a leitura dos metadados.
+        columns = tuple(mapper.columns.items())
+        self.columns = tuple(key for key, _ in columns)
+        self.column_names = {key: column.name for key, column in columns}
+        self.excluded = EXCLUDED_ATTRIBUTES
+        self.insertable = frozenset(key for key in self.columns if key not in self.excluded)
+        self.updatable = frozenset(key for key in self.columns if key not in self.excluded)
+        self.versioned = VERSION_COLUMN in self.columns
+
+        self.python_types = {}
+        for key, column in columns:
+            try:
+                self.python_types[key] = column.type.python_type
+            except NotImplementedError:
+                self.python_types[key] = None
+
+    def coerce(self, column: str, value):
+        """
+        Converte o valor para o tipo Python da coluna (ex.: texto para UUID ou data),
+        como o banco faria ao gravá-lo. Drivers com protocolo binário, como o COPY
+        do asyncpg, não aceitam o texto no lugar do tipo.
+
+        Raises:
+            ValueError: Se o valor não puder ser convertido.
+        """
+        python_type = self.python_types.get(column)
+        if value is None or python_type is None or isinstance(value, python_type):
+            return value
+        try:
+            if python_type is uuid.UUID:
+                return uuid.UUID(str(value))
+            if python_type is datetime:
+                return datetime.fromisoformat(str(value))
+            if python_type is date:
+                return date.fromisoformat(str(value))
+            return python_type(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Valor inválido para '{column}': '{value}'.") from e
+
+    def extract(self, data, allowed: frozenset) -> dict:
+        """
+        Converte os dados em dicionário mantendo apenas as colunas permitidas.
+
+        Args:
+            data: Objeto com atributos ou dicionário.
+            allowed (frozenset): Colunas aceitas (`insertable` ou `updatable`).
+
+        Returns:
+            dict: Valores das colunas permitidas, sem coleções.
+        """
+        if isinstance(data, dict):
+            items = ((key, value) for key, value in data.items() if key in allowed)
+        else:
+            items = ((key, getattr(data, key, _MISSING)) for key in self.columns if key in allowed)
+
+        return {
+            key: value
+            for key, value in items
+            if value is not _MISSING and not isinstance(value, COLLECTION_TYPES)
+        }
+
+
+_metadata_cache: Dict[type, ModelMetadata] = {}
+_statement_cache: Dict[Hashable, TextClause] = {}
+_lock = Lock()
+
+
+def get_model_metadata(model) -> ModelMetadata:
+    """
+    Retorna os metadados em cache do modelo (aceita a classe ou uma instância).
+    """
+    model_class = model if isinstance(model, type) else type(model)
+    metadata = _metadata_cache.get(model_class)
+    if metadata is None:
+        with _lock:
+            metadata = _metadata_cache.get(model_class)
+            if metadata is None:
+                metadata = ModelMetadata(model_class)
+                _metadata_cache[model_class] = metadata
+    return metadata
+
+
+def cached_statement(key: Hashable, build: Callable[[], TextClause]) -> TextClause:
+    """
+    Retorna a instrução em cache para a chave, construindo-a na primeira vez.
+
+    Args:
+        key (Hashable): Chave da instrução (modelo, operação e conjunto de colunas).
+        build (Callable[[], TextClause]): Função que monta a instrução.
+
+    Returns:
+        TextClause: Instrução pronta para execução.
+    """
+    statement = _statement_cache.get(key)
+    if statement is None:
+        statement = build()
+        _statement_cache[key] = statement
+    return statement
@@ -0,0 +1,130 @@
+import base64
+import binascii
+import json
+from math import ceil
+from typing import Any, List, Optional
+
+# Modos de paginação suportados pelos repositórios
+PAGINATION_MODES = {"offset", "cursor"}
+
+# Direções de ordenação permitidas
+SORT_ORDERS = {"asc", "desc"}
+
+# Direções de navegação codificadas no cursor
+CURSOR_DIRECTIONS = {"next", "prev"}
+
+# Estratégias de contagem do total de registros:
+# - "exact": COUNT(*) completo;
+# - "estimated": estimativa do planner em `pg_class.reltuples`;
+# - "capped": conta até um limite e informa "N+" acima dele;
+# - "none": não conta.
+COUNT_STRATEGIES = {"exact", "estimated", "capped", "none"}
+
+# Limite padrão da estratégia "capped"
+DEFAULT_COUNT_CAP = 10000
+
+
+def encode_cursor(sort_by: str, order: str, values: List[Any], direction: str) -> str:
+    """
+    Gera um cursor opaco a partir da última chave de ordenação vista.
+
+    Args:
+        sort_by (str): Coluna usada na ordenação.
+        order (str): Direção da ordenação ("asc" ou "desc").
+        values (List[Any]): Valores da chave de ordenação, sempre terminando com o `id`.
+        direction (str): Direção da navegação ("next" ou "prev").
+
+    Returns:
+        str: Cursor codificado em base64 seguro para URLs.
+    """
+    payload = {"s": sort_by, "o": order, "v": values, "d": direction}
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> dict:
+    """
+    Decodifica e valida um cursor gerado por `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor recebido do cliente.
+        sort_by (str): Coluna de ordenação da requisição atual.
+        order (str): Direção de ordenação da requisição atual.
+
+    Returns:
+        dict: Dados do cursor com as chaves `values` e `direction`.
+
+    Raises:
+        ValueError: Se o cursor for inválido ou não corresponder à ordenação pedida.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Cursor inválido.") from e
+
+    if not isinstance(payload, dict) or payload.get("d") not in CURSOR_DIRECTIONS:
+        raise ValueError("Cursor inválido.")
+
+    values = payload.get("v")
+    expected_size = 1 if sort_by == "id" else 2
+    if not isinstance(values, list) or len(values) != expected_size:
+        raise ValueError("Cursor inválido.")
+
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise ValueError("O cursor não corresponde à ordenação solicitada.")
+
+    return {"values": values, "direction": payload["d"]}
+
+
+def cursor_from_record(record: dict, sort_by: str, order: str, direction: str) -> Optional[str]:
+    """
+    Gera o cursor que aponta para um registro já retornado.
+
+    Args:
+        record (dict): Registro usado como âncora do cursor.
+        sort_by (str): Coluna de ordenação.
+        order (str): Direção da ordenação.
+        direction (str): Direção da navegação ("next" ou "prev").
+
+    Returns:
+        Optional[str]: Cursor codificado, ou None se não houver registro.
+    """
+    if not record:
+        return None
+    values = [record["id"]] if sort_by == "id" else [record[sort_by], record["id"]]
+    return encode_cursor(sort_by, order, values, direction)
+
+
+def build_count_metadata(strategy: str, total_records: Optional[int], per_page: int, capped: bool = False) -> dict:
+    """
+    Monta os campos de contagem do payload de paginação.
+
+    Args:
+        strategy (str): Estratégia de contagem usada.
+        total_records (Optional[int]): Total obtido, ou None se não houve contagem.
+        per_page (int): Número de registros por página.
+        capped (bool): Indica se a contagem atingiu o limite da estratégia "capped".
+
+    Returns:
+        dict: Campos de total, número de páginas, texto de exibição e estratégia usada.
+    """
+    if total_records is None:
+        return {
+            "count_strategy": strategy,
+            "total_records": None,
+            "total_pages": None,
+            "total_records_display": None,
+            "total_records_capped": False,
+            "total_records_estimated": False,
+        }
+
+    display = f"{total_records:,}+" if capped else f"{total_records:,}"
+    return {
+        "count_strategy": strategy,
+        "total_records": total_records,
+        "total_pages": ceil(total_records / per_page),
+        "total_records_display": display,
+        "total_records_capped": capped,
+        "total_records_estimated": strategy == "estimated",
+    }
@@ -0,0 +1,148 @@
+import threading
+from time import monotonic, sleep
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app.config.database import SessionLocal
+from app.config.notifications import notification_listener
+
+# Channel notified by the "Status" table trigger (migration 0004)
+STATUS_CHANNEL = "status_changed"
+
+
+class StatusRegistry:
+    """
+    Process-wide map between status names and IDs, loaded once from the "Status" table.
+
+    Lookups are plain dictionary reads and never query the database: they run
+    on request paths, some of them on the event loop thread. The process'
+    notification listener delivers the change notifications sent by the table's
+    trigger and the map is reloaded; it is also reloaded every `refresh_seconds`
+    as a safety net for missed notifications (e.g. while reconnecting). A name
+    that is not in the map is reported as unknown right away, and schedules one
+    reload in a background thread (at most every `miss_reload_seconds`), so a
+    status created before its notification arrives is found shortly after.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        listener=notification_listener,
+        refresh_seconds: float = 300.0,
+        miss_reload_seconds: float = 5.0,
+        start_attempts: int = 5,
+        start_retry_seconds: float = 2.0,
+    ):
+        self.session_factory = session_factory
+        self.listener = listener
+        self.refresh_seconds = refresh_seconds
+        self.miss_reload_seconds = miss_reload_seconds
+        self.start_attempts = start_attempts
+        self.start_retry_seconds = start_retry_seconds
+        self._by_name: Dict[str, str] = {}
+        self._by_id: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        # Set once the map comes from the database; `replace` alone never reloads on a miss
+        self._database_backed = False
+        self._miss_reloaded_at: Optional[float] = None
+        self._miss_lock = threading.Lock()
+        self._miss_reload: Optional[threading.Thread] = None
+        self._subscribed = False
+
+    def id_for(self, name: str) -> Optional[str]:
+        """The ID of the status called `name`, or None."""
+        status_id = self._by_name.get(name)
+        if status_id is None:
+            self._schedule_reload_after_miss()
+        return status_id
+
+    def name_for(self, status_id) -> Optional[str]:
+        """The name of the status with this ID, or None."""
+        return self._by_id.get(str(status_id))
+
+    def require_id(self, name: str) -> str:
+        """
+        The ID of the status called `name`.
+
+        Raises:
+            ValueError: If there is no such status.
+        """
+        status_id = self.id_for(name)
+        if status_id is None:
+            raise ValueError(f"Unknown status '{name}'.")
+        return status_id
+
+    def load(self):
+        """Reload the whole table and swap the maps in one step."""
+        self._database_backed = True
+        with self.session_factory() as session:
+            rows = session.execute(text('SELECT id, name FROM "Status"')).fetchall()
+        self.replace({name: str(status_id) for status_id, name in rows})
+
+    def replace(self, statuses: Dict[str, str]):
+        """
+        Swap the maps for the given name to ID mapping, e.g. the statuses of the
+        memory repository backend, which has no "Status" table.
+        """
+        by_name = dict(statuses)
+        self._by_id = {status_id: name for name, status_id in by_name.items()}
+        self._by_name = by_name
+        self._loaded_at = monotonic()
+
+    def start(self):
+        """
+        Warm the registry up and start listening for changes.
+
+        Raises:
+            RuntimeError: If the statuses cannot be loaded after `start_attempts`
+                tries, so the application does not serve requests without them.
+        """
+        for attempt in range(1, self.start_attempts + 1):
+            try:
+                self.load()
+                break
+            except Exception as e:
+                if attempt == self.start_attempts:
+                    raise RuntimeError(f"Could not load statuses after {attempt} attempts: {e}") from e
+                print(f"Error loading statuses (attempt {attempt}/{self.start_attempts}): {e}")
+                sleep(self.start_retry_seconds)
+
+        if not self._subscribed:
+            self._subscribed = True
+            self.listener.subscribe(
+                STATUS_CHANNEL,
+                lambda payload: self.load(),
+                on_connect=self.load,
+                on_idle=self._refresh_if_stale,
+            )
+            self.listener.start()
+
+    def _refresh_if_stale(self):
+        if monotonic() - (self._loaded_at or 0) >= self.refresh_seconds:
+            self.load()
+
+    def _schedule_reload_after_miss(self):
+        """
+        Reload in a background thread after a lookup miss, unless another miss
+        did so in the last `miss_reload_seconds`. Never waits for the reload.
+        """
+        if not self._database_backed:
+            return
+        with self._miss_lock:
+            now = monotonic()
+            if self._miss_reloaded_at is not None and now - self._miss_reloaded_at < self.miss_reload_seconds:
+                return
+            self._miss_reloaded_at = now
+            self._miss_reload = threading.Thread(target=self._reload_quietly, name="status-reload", daemon=True)
+            self._miss_reload.start()
+
+    def _reload_quietly(self):
+        try:
+            self.load()
+        except Exception as e:
+            print(f"Error reloading statuses: {e}")
+
+
+# Shared registry, started with the application
+status_registry = StatusRegistry()
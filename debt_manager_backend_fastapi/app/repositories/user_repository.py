@@ -1,9 +1,9 @@
 from asyncpg import CaseNotFoundError
 from fastapi import HTTPException
 from sqlalchemy import text
-from app.middlewares.jwt_middleware import decode_jwt, generate_jwt
+from app.middlewares.jwt_middleware import decode_jwt
 from app.models.user import User, UserCreate
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 from app.models.user import User
 
 from app.models.user import User
@@ -11,7 +11,8 @@ from app.repositories.generic_repository import GenericRepository
 from app.repositories.interfaces.user_repository_interface import UserRepositoryInterface
 from typing import Optional
 
-from app.config.database import SessionLocal
+from app.config.cache import get_entity_cache
+from app.config.database import ReadSessionLocal, SessionLocal
 
 class CaseNotFoundError(HTTPException):
     """Exceção para indicar que um caso foi encontrado."""
@@ -23,8 +24,19 @@ class CaseNotFoundError(HTTPException):
         self.message = message       
 
 class UserRepository(GenericRepository[User], UserRepositoryInterface):
+    # Non-nullable columns that can back a stable keyset ordering
+    sortable_columns = {"id", "username", "email", "name"}
+
+    # Never returned by reads; use `get_by_email` to check credentials
+    hidden_fields = frozenset({"hashed_password"})
+
     def __init__(self):
-        super().__init__(session_factory=SessionLocal, model=User)
+        super().__init__(
+            session_factory=SessionLocal,
+            model=User,
+            read_session_factory=ReadSessionLocal,
+            entity_cache=get_entity_cache("Users"),
+        )
 
         # Inicializa o atributo users como uma lista vazia
         self.users = []
@@ -47,18 +59,21 @@ class UserRepository(GenericRepository[User], UserRepositoryInterface):
 
     def get_verify_password(self, password: str) -> Union[User, str]:
         with self.session_factory() as session:
-            # Parametrized query to avoid SQL Injection
-            result = session.execute(
-                text('SELECT * FROM "Users" WHERE hashed_password = :password'),
-                {"hashed_password": decode_jwt(password)}
-            )
-
-            # Fetch the first result
-            row = result.fetchone()
-
-            if row:
-                # If a user is found, raise CaseNotFoundError
-                raise CaseNotFoundError(f"User with password '{password}' already exists.")
+            return self._get_verify_password(session, password)
+
+    def _get_verify_password(self, session, password: str) -> Union[User, str]:
+        # Parametrized query to avoid SQL Injection
+        result = session.execute(
+            text('SELECT * FROM "Users" WHERE hashed_password = :password'),
+            {"hashed_password": decode_jwt(password)}
+        )
+
+        # Fetch the first result
+        row = result.fetchone()
+
+        if row:
+            # If a user is found, raise CaseNotFoundError
+            raise CaseNotFoundError(f"User with password '{password}' already exists.")
         
         return False
     
@@ -71,7 +86,10 @@ class UserRepository(GenericRepository[User], UserRepositoryInterface):
 
 
     def find_by_email(self, email: str) -> Union[User, str]:
-      with self.session_factory() as session:
+        with self.read_session() as session:
+            return self._find_by_email(session, email)
+
+    def _find_by_email(self, session, email: str) -> Union[User, str]:
         # Parametrized query to avoid SQL Injection
         result = session.execute(
             text('SELECT * FROM Users WHERE email = :email'),
@@ -87,26 +105,71 @@ class UserRepository(GenericRepository[User], UserRepositoryInterface):
         
         return False
 
+    def get_by_email(self, email: str) -> Optional[dict]:
+        """
+        Fetch the user with this email, including its password hash.
+
+        Returns:
+            Optional[dict]: The user's columns, or None if there is no such user.
+        """
+        with self.read_session() as session:
+            return self._get_by_email(session, email)
+
+    def _get_by_email(self, session, email: str) -> Optional[dict]:
+        row = session.execute(
+            text('SELECT * FROM "Users" WHERE email = :email'),
+            {"email": email}
+        ).fetchone()
+        return dict(row._mapping) if row is not None else None
+
+    def update_password(self, user_id: str, hashed_password: str) -> bool:
+        """
+        Replace the stored password hash of a user (e.g. after a rehash on login).
+        """
+        with self.session_factory() as session:
+            return self._update_password(session, user_id, hashed_password)
+
+    def _update_password(self, session, user_id: str, hashed_password: str) -> bool:
+        return self._update(session, user_id, {"hashed_password": hashed_password}, User)
+
     def add_user(self, user: User):
         self.users.append(user)
 
     def save(self, user: User):
         return super().save(user, "public.users_users_uuid_seq", user)
 
-    def find_all(self, page: int = 1, per_page: int = 10) -> dict:
-        return super().find_all(page=page, per_page=per_page)
+    def find_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = 10000,
+        fields: Optional[Iterable[str]] = None,
+    ) -> dict:
+        return super().find_all(
+            page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+            count=count, count_cap=count_cap, fields=fields
+        )
 
     def find_by_username(self, username: str) -> Optional[User]:
         return next((user for user in self.users if user.username == username), None)
 
-    def create(self, data: UserCreate) -> Optional[User]:
+    def create(self, data: UserCreate, hashed_password: str) -> Optional[User]:
+        with self.session_factory() as session:
+            return self._create(session, data, hashed_password)
+
+    def _create(self, session, data: UserCreate, hashed_password: str) -> Optional[User]:
         try:
 
             user = User(**{key: value for key, value in data.dict().items() if key != "password"})
-            user.hashed_password = generate_jwt(data.password)
+            user.hashed_password = hashed_password
             
             # Save the new User to the database
-            user.id = super().save(user, sequence_name="public.users_users_uuid_seq", entity_class=User)
+            user.id = self._save(session, user, sequence_name="public.users_users_uuid_seq", entity_class=User)
 
             return user
         except Exception as e:
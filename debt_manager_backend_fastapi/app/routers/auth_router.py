@@ -1,8 +1,10 @@
 from typing import Dict
 from fastapi import FastAPI, APIRouter, HTTPException, Depends
 from app.interfaces.router_initializer import RouterInitializer
+from app.middlewares.jwt_middleware import get_token_claims
 from app.models.user import UserCreate, UserResponse
 from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordHasherBusy
 from fastapi.security import OAuth2PasswordRequestForm
 
 class AuthRouter(RouterInitializer):
@@ -40,12 +42,29 @@ class AuthRouter(RouterInitializer):
                 dict: A dictionary containing the access token and its type.
             """
             try:
-                token = self.auth_service.authenticate_user(form_data.username, form_data.password)
-                return {"access_token": token, "token_type": "bearer"}
+                token = await self.auth_service.authenticate_user(form_data.username, form_data.password)
+            except PasswordHasherBusy as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
             except ValueError as e:
                 raise HTTPException(status_code=401, detail=str(e))
+            if token is None:
+                raise HTTPException(status_code=401, detail="Invalid email or password.")
+            return {"access_token": token, "token_type": "bearer"}
 
 
+        @router.get("/me", response_model=Dict)
+        async def me(claims: dict = Depends(get_token_claims)):
+            """
+            Return the claims of the bearer token sent with the request.
+
+            Args:
+                claims (dict): Claims decoded by the authentication dependency.
+
+            Returns:
+                dict: The caller's claims.
+            """
+            return self.auth_service.current_claims(claims)
+
         @router.post("/register", response_model=Dict)
         async def register(user: dict):
             """
@@ -59,8 +78,10 @@ class AuthRouter(RouterInitializer):
             """
             try:
                 new_user = UserCreate(**user)
-                response = self.auth_service.register_user(new_user)
+                response = await self.auth_service.register_user(new_user)
                 return response
+            except PasswordHasherBusy as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
@@ -1,21 +1,31 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from datetime import date
+from fastapi import FastAPI, APIRouter, Body, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from app.interfaces.router_initializer import RouterInitializer
-from app.services.debt_service import DebtService
-from typing import List, Dict
+from app.middlewares.etag import none_match
+from app.models.debt import DebtCreate
+from app.models.serialization import trusted_response
+from app.repositories.generic_repository import InvalidFieldsError
+from app.services.debt_import_service import DebtImportService
+from app.services.debt_service import EXPORT_FORMATS, DebtService
+from typing import List, Dict, Optional
+from uuid import UUID
 
 class DebtRouter(RouterInitializer):
     """
     Initializes debt-related routes for the application.
     """
 
-    def __init__(self, debt_service: DebtService):
+    def __init__(self, debt_service: DebtService, debt_import_service: DebtImportService):
         """
-        Initialize the DebtRouter with the DebtService dependency.
+        Initialize the DebtRouter with its service dependencies.
 
         Args:
             debt_service (DebtService): The service layer for debt operations.
+            debt_import_service (DebtImportService): The service layer for file imports.
         """
         self.debt_service = debt_service
+        self.debt_import_service = debt_import_service
 
     def initialize(self, app: FastAPI):
         """
@@ -26,47 +36,213 @@ class DebtRouter(RouterInitializer):
         """
         router = APIRouter()
 
-        @router.get("/", response_model=List[Dict])
-        async def get_debts():
+        @router.get("/", response_model=Dict)
+        async def get_debts(
+            page: int = 1,
+            per_page: int = 10,
+            cursor: Optional[str] = None,
+            sort_by: str = "id",
+            order: str = "asc",
+            mode: str = "offset",
+            count: Optional[str] = None,
+            count_cap: int = 10000,
+            fields: Optional[str] = None,
+            if_none_match: Optional[str] = Header(None),
+        ):
             """
-            Retrieve a list of all debts.
+            Retrieve a page of debts.
+
+            Pass `mode=cursor` (or a `cursor` from a previous response) to use
+            keyset pagination, which costs the same on every page. `count`
+            selects how the total is computed: exact, estimated, capped or none.
+            `fields` (comma separated, `*` for all) limits the returned columns.
+            The response carries an ETag; send it back in If-None-Match to get
+            a bodiless 304 while the page is unchanged.
+            """
+            try:
+                debts = await self.debt_service.list_debts(
+                    page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+                    count=count, count_cap=count_cap, fields=fields
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+            etag = self.debt_service.list_etag(debts)
+            if none_match(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return trusted_response(debts, self.debt_service.serializer, headers={"ETag": etag})
+
+        @router.get("/search", response_model=Dict)
+        async def search_debts(
+            q: str,
+            per_page: int = 20,
+            cursor: Optional[str] = None,
+            user_id: Optional[UUID] = None,
+            status: Optional[str] = None,
+        ):
+            """
+            Search debts, most relevant first.
+
+            `q` is matched as full text against the description and notes, and
+            approximately against debtor and creditor names, so names with small
+            typos still match. Follow `next_cursor` for further pages.
             """
             try:
-                debts = self.debt_service.list_debts()
-                return debts
+                results = await self.debt_service.search_debts(
+                    q, per_page=per_page, cursor=cursor, user_id=user_id, status=status
+                )
+                return trusted_response(results, self.debt_service.serializer)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @router.get("/summary", response_model=Dict)
+        async def get_debt_summary(group_by: Optional[str] = None):
+            """
+            Debt count and total amount, grouped by any of `user_id`, `status`
+            and `creditor_name` (comma separated), e.g. `?group_by=status,creditor_name`.
+
+            Served from an incrementally maintained summary table, so the cost
+            depends on the number of groups, not on the number of debts.
+            """
+            try:
+                return await self.debt_service.summarize_debts(group_by)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @router.get("/export")
+        async def export_debts(
+            format: str = "ndjson",
+            user_id: Optional[UUID] = None,
+            status: Optional[str] = None,
+            due_from: Optional[date] = None,
+            due_to: Optional[date] = None,
+        ):
+            """
+            Stream all debts matching the filters as NDJSON or CSV.
+
+            Rows are read from a server-side cursor and written out batch by
+            batch, so memory use does not grow with the size of the export.
+            """
+            try:
+                chunks = self.debt_service.export_debts(
+                    format=format, user_id=user_id, status=status, due_from=due_from, due_to=due_to
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            return StreamingResponse(
+                chunks,
+                media_type=EXPORT_FORMATS[format],
+                headers={"Content-Disposition": f'attachment; filename="debts.{format}"'},
+            )
+
         @router.get("/{debt_id}", response_model=Dict)
-        async def get_debt(debt_id: str):
+        async def get_debt(
+            debt_id: str,
+            fields: Optional[str] = None,
+            if_none_match: Optional[str] = Header(None),
+        ):
             """
-            Retrieve a specific debt by ID.
+            Retrieve a specific debt by ID; `fields` (comma separated) limits the returned columns.
+
+            The ETag follows the debt's row version: If-None-Match answers 304
+            while it is unchanged, and If-Match on PUT rejects stale updates.
             """
             try:
-                debt = self.debt_service.get_debt_by_id(debt_id)
-                return debt
+                debt = await self.debt_service.get_debt_by_id(debt_id, fields)
+            except InvalidFieldsError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
 
+            etag = self.debt_service.debt_etag(debt)
+            if none_match(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return trusted_response(debt, self.debt_service.serializer, headers={"ETag": etag})
+
         @router.post("/", response_model=Dict)
         async def create_debt(debt: dict):
             """
             Create a new debt.
             """
             try:
-                new_debt = self.debt_service.add_debt(debt)
+                new_debt = await self.debt_service.add_debt(debt)
                 return new_debt
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @router.post("/bulk", response_model=Dict)
+        async def create_debts_bulk(user_id: UUID, debts: List[DebtCreate]):
+            """
+            Create many debts for a user in one request.
+
+            Each row is validated as a `DebtCreate`. Rows are inserted in
+            multi-row batches, or streamed with COPY for large payloads. The
+            generated IDs are returned in input order.
+            """
+            try:
+                return await self.debt_service.create_debts_bulk(debts, user_id)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @router.post("/batch-get", response_model=Dict)
+        async def get_debts_by_ids(ids: List[str] = Body(..., embed=True)):
+            """
+            Retrieve many debts by ID in one request, e.g. `{"ids": ["...", "..."]}`.
+
+            Records come back in the requested order; IDs with no debt are
+            listed in `missing`.
+            """
+            try:
+                debts = await self.debt_service.get_debts_by_ids(ids)
+                return trusted_response(debts, self.debt_service.serializer)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @router.post("/import", response_model=Dict)
+        async def import_debts(request: Request, user_id: UUID, format: str = "csv"):
+            """
+            Import debts from a CSV (with header) or NDJSON file sent as the raw request body.
+
+            The body is read as a stream and loaded in batches through a staging
+            table. The response reports, per rejected row, why it was not imported.
+            """
+            try:
+                return await self.debt_import_service.import_debts(request.stream(), format, user_id)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
         @router.put("/{debt_id}", response_model=Dict)
-        async def update_debt(debt_id: str, debt: dict):
+        async def update_debt(
+            debt_id: str,
+            debt: dict,
+            response: Response,
+            if_match: Optional[str] = Header(None),
+        ):
             """
             Update an existing debt by ID.
+
+            Send the ETag of the debt you read in If-Match to update it only if
+            nobody changed it since (412 Precondition Failed otherwise).
             """
             try:
-                updated_debt = self.debt_service.update_debt(debt_id, debt)
+                updated_debt = await self.debt_service.update_debt(debt_id, debt, if_match)
+                response.headers["ETag"] = self.debt_service.debt_etag(updated_debt)
                 return updated_debt
+            except HTTPException:
+                raise
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
             except Exception as e:
@@ -78,7 +254,7 @@ class DebtRouter(RouterInitializer):
             Delete a debt by ID.
             """
             try:
-                self.debt_service.delete_debt(debt_id)
+                await self.debt_service.delete_debt(debt_id)
                 return {"message": f"Debt with ID {debt_id} deleted successfully."}
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
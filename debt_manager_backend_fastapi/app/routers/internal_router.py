@@ -0,0 +1,101 @@
+import hmac
+import os
+from dotenv import load_dotenv
+from fastapi import FastAPI, APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.config.cache import cache_statistics
+from app.config.pool_metrics import pool_statistics
+from app.config.query_metrics import query_metrics
+from app.middlewares.jwt_middleware import verified_tokens
+from app.interfaces.router_initializer import RouterInitializer
+from typing import Dict, Optional
+
+# Load environment variables from .env file
+load_dotenv()
+
+# The internal routes expose SQL text, pool and cache state: off unless enabled
+INTERNAL_ROUTES_ENABLED = os.getenv("INTERNAL_ROUTES_ENABLED", "false").lower() == "true"
+# Operator credential for the internal routes; user JWTs are not accepted there
+INTERNAL_ROUTES_TOKEN = os.getenv("INTERNAL_ROUTES_TOKEN", "")
+
+_bearer_scheme = HTTPBearer(auto_error=False)
+
+class InternalRouter(RouterInitializer):
+    """
+    Initializes internal operational routes (not part of the public API).
+
+    The routes are only attached when enabled, and then require the internal
+    routes token as a bearer token.
+    """
+
+    def __init__(self, enabled: bool = INTERNAL_ROUTES_ENABLED, token: str = INTERNAL_ROUTES_TOKEN):
+        """
+        Initialize the InternalRouter.
+
+        Args:
+            enabled (bool): Whether to attach the internal routes at all.
+            token (str): The bearer token the internal routes require.
+        """
+        self.enabled = enabled
+        self.token = token
+
+    def require_token(self, credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer_scheme)):
+        """
+        Dependency that accepts only the internal routes token.
+
+        Raises:
+            HTTPException: 401 if the token is missing or does not match.
+        """
+        if credentials is None or not hmac.compare_digest(
+            credentials.credentials.encode("utf-8"), self.token.encode("utf-8")
+        ):
+            raise HTTPException(status_code=401, detail="Invalid internal token.", headers={"WWW-Authenticate": "Bearer"})
+
+    def initialize(self, app: FastAPI):
+        """
+        Attach internal routes to the FastAPI application.
+
+        Args:
+            app (FastAPI): The FastAPI application instance.
+        """
+        if not self.enabled:
+            return
+        if not self.token:
+            raise RuntimeError("INTERNAL_ROUTES_TOKEN must be set when INTERNAL_ROUTES_ENABLED is true.")
+
+        router = APIRouter()
+
+        @router.get("/pool", response_model=Dict)
+        async def get_pool_statistics():
+            """
+            Live connection pool metrics: checked out and overflow connections,
+            checkout failures and the checkout wait time histogram.
+            """
+            return pool_statistics()
+
+        @router.get("/cache", response_model=Dict)
+        async def get_cache_statistics():
+            """
+            Entity cache counters per table: hits, misses, hit ratio, LRU
+            evictions, TTL expirations, write invalidations and current size,
+            plus the verified JWT cache.
+            """
+            return {**cache_statistics(), "verified_tokens": verified_tokens.statistics()}
+
+        @router.get("/queries", response_model=Dict)
+        async def get_query_statistics(limit: int = 50):
+            """
+            SQL statements by normalized fingerprint, slowest total time first:
+            count, errors, mean, p95 and max time, plus the routes flagged for
+            issuing too many statements per request.
+            """
+            return query_metrics.statistics(limit)
+
+        # Attach the router to the application
+        app.include_router(
+            router,
+            prefix="/internal",
+            tags=["Internal"],
+            include_in_schema=False,
+            dependencies=[Depends(self.require_token)],
+        )
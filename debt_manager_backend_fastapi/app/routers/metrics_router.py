@@ -0,0 +1,32 @@
+from fastapi import FastAPI, APIRouter
+from fastapi.responses import PlainTextResponse
+from app.config.request_metrics import request_metrics
+from app.interfaces.router_initializer import RouterInitializer
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class MetricsRouter(RouterInitializer):
+    """
+    Initializes the Prometheus scrape endpoint.
+    """
+
+    def initialize(self, app: FastAPI):
+        """
+        Attach the metrics route to the FastAPI application.
+
+        Args:
+            app (FastAPI): The FastAPI application instance.
+        """
+        router = APIRouter()
+
+        @router.get("/metrics", response_class=PlainTextResponse)
+        async def get_metrics():
+            """
+            Per-route request counts by status, in-flight requests and request
+            duration histograms, summed over all workers, in the Prometheus text format.
+            """
+            return PlainTextResponse(await request_metrics.exposition(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+        # Attach the router to the application
+        app.include_router(router, tags=["Internal"], include_in_schema=False)
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Body, HTTPException
 from app.interfaces.router_initializer import RouterInitializer
+from app.models.serialization import trusted_response
+from app.services.password_hasher import PasswordHasherBusy
 from app.services.user_service import UserService
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class UserRouter(RouterInitializer):
     """
@@ -26,14 +28,34 @@ class UserRouter(RouterInitializer):
         """
         router = APIRouter()
 
-        @router.get("/", response_model=List[Dict])
-        async def get_users():
+        @router.get("/", response_model=Dict)
+        async def get_users(
+            page: int = 1,
+            per_page: int = 10,
+            cursor: Optional[str] = None,
+            sort_by: str = "id",
+            order: str = "asc",
+            mode: str = "offset",
+            count: Optional[str] = None,
+            count_cap: int = 10000,
+            fields: Optional[str] = None,
+        ):
             """
-            Retrieve a list of users.
+            Retrieve a page of users.
+
+            Pass `mode=cursor` (or a `cursor` from a previous response) to use
+            keyset pagination, which costs the same on every page. `count`
+            selects how the total is computed: exact, estimated, capped or none.
+            `fields` (comma separated, `*` for all) limits the returned columns.
             """
             try:
-                users = self.user_service.get_users()
-                return users
+                users = await self.user_service.get_users(
+                    page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+                    count=count, count_cap=count_cap, fields=fields
+                )
+                return trusted_response(users, self.user_service.serializer)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
@@ -43,7 +65,7 @@ class UserRouter(RouterInitializer):
             Retrieve a specific user by ID.
             """
             try:
-                user = self.user_service.get_user_by_id(user_id)
+                user = await self.user_service.get_user_by_id(user_id)
                 return user
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
@@ -54,18 +76,36 @@ class UserRouter(RouterInitializer):
             Create a new user.
             """
             try:
-                new_user = self.user_service.create_user(user)
+                new_user = await self.user_service.create_user(user)
                 return new_user
+            except PasswordHasherBusy as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @router.post("/batch-get", response_model=Dict)
+        async def get_users_by_ids(ids: List[str] = Body(..., embed=True)):
+            """
+            Retrieve many users by ID in one request, e.g. `{"ids": ["...", "..."]}`.
+
+            Records come back in the requested order; IDs with no user are
+            listed in `missing`.
+            """
+            try:
+                users = await self.user_service.get_users_by_ids(ids)
+                return trusted_response(users, self.user_service.serializer)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
         @router.put("/{user_id}", response_model=Dict)
         async def update_user(user_id: str, user: dict):
             """
             Update an existing user by ID.
             """
             try:
-                updated_user = self.user_service.update_user(user_id, user)
+                updated_user = await self.user_service.update_user(user_id, user)
                 return updated_user
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
@@ -78,7 +118,7 @@ class UserRouter(RouterInitializer):
             Delete a user by ID.
             """
             try:
-                deleted_user = self.user_service.delete_user(user_id)
+                deleted_user = await self.user_service.delete_user(user_id)
                 return {"message": f"User with ID {user_id} deleted successfully."}
             except ValueError as e:
                 raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,30 @@
+from typing import Optional, Sequence, Tuple
+
+from app.repositories.generic_repository import InvalidFieldsError
+
+# Value of `fields` asking for every column
+ALL_FIELDS = "*"
+
+
+def parse_fields(fields: Optional[str], default: Optional[Sequence[str]] = None) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `fields` query parameter.
+
+    Args:
+        fields (Optional[str]): e.g. "description,amount"; "*" for every column.
+        default (Optional[Sequence[str]]): Fields used when `fields` is not given.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The field names, or None for every column.
+
+    Raises:
+        InvalidFieldsError: If `fields` names no column.
+    """
+    if fields is None:
+        return tuple(default) if default is not None else None
+    if fields.strip() == ALL_FIELDS:
+        return None
+    names = tuple(name.strip() for name in fields.split(",") if name.strip())
+    if not names:
+        raise InvalidFieldsError("'fields' must name at least one column.")
+    return names
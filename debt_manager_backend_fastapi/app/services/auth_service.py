@@ -1,19 +1,63 @@
-from app.models.auth import UserResponse
-from app.repositories.user_repository import UserRepository
+import hmac
+from typing import Optional
+
+from app.middlewares.jwt_middleware import decode_jwt
+from app.repositories.async_user_repository import AsyncUserRepository
 from app.models.user import User, UserCreate
+from app.services.password_hasher import PasswordHasher
 
 class AuthService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: AsyncUserRepository, password_hasher: PasswordHasher):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
+
+    async def authenticate_user(self, email: str, password: str) -> Optional[dict]:
+        """
+        Check a user's credentials.
+
+        Hashing runs on the password hasher's worker pool, never on the event
+        loop. A hash made with older cost parameters (or a legacy JWT-wrapped
+        password) is replaced by a fresh one once the password is verified.
+
+        Returns:
+            Optional[dict]: The user's public fields, or None if the credentials are wrong.
+
+        Raises:
+            PasswordHasherBusy: If too many password checks are already in progress.
+        """
+        user = await self.user_repository.get_by_email(email)
+        if user is None:
+            return None
+
+        hashed_password = user["hashed_password"]
+        if self.password_hasher.needs_rehash(hashed_password):
+            if not self._verify_legacy(password, hashed_password) and \
+                    not await self.password_hasher.verify(password, hashed_password):
+                return None
+            await self.user_repository.update_password(str(user["id"]), await self.password_hasher.hash(password))
+        elif not await self.password_hasher.verify(password, hashed_password):
+            return None
+
+        return {"id": str(user["id"]), "username": user["username"], "name": user["name"], "email": user["email"]}
+
+    def current_claims(self, claims: dict) -> dict:
+        """
+        Claims of the authenticated caller, as decoded once per request by
+        `get_token_claims`, without the secrets they may carry.
+        """
+        return {key: value for key, value in claims.items() if key != "password"}
+
+    async def register_user(self, user: UserCreate) -> User:
+        if await self.user_repository.get_by_email(user.email) is not None:
+            raise ValueError(f"User with email '{user.email}' already exists.")
+        hashed_password = await self.password_hasher.hash(user.password)
+        return await self.user_repository.create(user, hashed_password)
 
-    def authenticate_user(self, email: str, password: str) -> UserResponse:
-        user = self.user_repository.find_by_email(email)
-        if user and user.verify_password(password):
-            return UserResponse(username=user.username, email=user.email)
-        return None
-    
-    def register_user(self, user: UserCreate) -> UserResponse:
-        user = self.user_repository.find_by_email(user.email)
-        if user and user.verify_token(user.hashed_password):
-            return self.user_repository.create(user)
-        return None    
+    @staticmethod
+    def _verify_legacy(password: str, hashed_password: str) -> bool:
+        """Passwords stored before scrypt hashing were wrapped in a JWT."""
+        try:
+            stored = decode_jwt(hashed_password).get("password")
+        except RuntimeError:
+            return False
+        return isinstance(stored, str) and hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
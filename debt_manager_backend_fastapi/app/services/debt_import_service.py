@@ -0,0 +1,187 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.models.debt import DebtCreate
+from app.repositories.async_debt_repository import AsyncDebtRepository
+
+# Supported import file formats
+IMPORT_FORMATS = {"csv", "ndjson"}
+
+
+class DebtImportService:
+    """
+    Imports debts from a streamed CSV or NDJSON file.
+    """
+
+    # Rows validated and loaded per transaction
+    batch_size = 10000
+
+    # Rejected rows detailed in the report; the rest are only counted
+    max_reported_errors = 1000
+
+    def __init__(self, debt_repository: AsyncDebtRepository):
+        """
+        Initialize the DebtImportService with a repository dependency.
+
+        Args:
+            debt_repository (AsyncDebtRepository): The async repository layer for debt operations.
+        """
+        self.debt_repository = debt_repository
+
+    async def import_debts(self, chunks: AsyncIterator[bytes], format: str, user_id: UUID) -> Dict:
+        """
+        Import debts from the raw bytes of an uploaded file.
+
+        The file is decoded and split into records as it arrives. Every
+        `batch_size` records are validated against `DebtCreate` (in a worker
+        thread, off the event loop) and loaded in one transaction. Descriptions
+        repeated within a batch are rejected after their first occurrence; the
+        repository rejects those already loaded, including by earlier batches,
+        so memory stays bounded by the batch size.
+
+        Args:
+            chunks (AsyncIterator[bytes]): The request body, as it is received.
+            format (str): "csv" (with a header row) or "ndjson".
+            user_id (UUID): Owner of the imported debts.
+
+        Returns:
+            Dict: Row counts and a per-row error report.
+        """
+        if format not in IMPORT_FORMATS:
+            raise ValueError(f"Invalid import format '{format}'. Use one of: {', '.join(sorted(IMPORT_FORMATS))}.")
+
+        report = {"total_rows": 0, "imported": 0, "rejected": 0, "errors": [], "errors_truncated": False}
+        header: List[Optional[List[str]]] = [None]
+
+        batch: List[str] = []
+        async for record in self._records(chunks, format):
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch, format, header, user_id, report)
+                batch = []
+        if batch:
+            await self._import_batch(batch, format, header, user_id, report)
+
+        if format == "csv" and header[0] is None:
+            raise ValueError("The CSV file is empty.")
+        return report
+
+    async def _import_batch(
+        self,
+        records: List[str],
+        format: str,
+        header: List[Optional[List[str]]],
+        user_id: UUID,
+        report: Dict,
+    ):
+        rows, errors = await run_in_threadpool(
+            self._validate_batch, records, format, header, str(user_id), report["total_rows"]
+        )
+        report["total_rows"] += len(rows) + len(errors)
+
+        if rows:
+            result = await self.debt_repository.import_batch(rows)
+            report["imported"] += result["imported"]
+            errors.extend((row, [reason]) for row, reason in result["rejected"])
+
+        report["rejected"] += len(errors)
+        for row, messages in sorted(errors):
+            if len(report["errors"]) >= self.max_reported_errors:
+                report["errors_truncated"] = True
+                break
+            report["errors"].append({"row": row, "errors": messages})
+
+    def _validate_batch(
+        self,
+        records: List[str],
+        format: str,
+        header: List[Optional[List[str]]],
+        user_id: str,
+        first_row: int,
+    ) -> Tuple[List[Dict], List[Tuple[int, List[str]]]]:
+        """
+        Parse and validate a batch of records, numbering rows from `first_row + 1`.
+        """
+        rows, errors = [], []
+        seen_descriptions: Set[str] = set()
+
+        if format == "csv":
+            parsed = csv.reader(records)
+            if header[0] is None:
+                header[0] = [column.strip() for column in next(parsed, [])]
+            fields = (dict(zip(header[0], values)) for values in parsed)
+        else:
+            fields = (self._parse_json_record(record) for record in records)
+
+        for row_number, data in enumerate(fields, start=first_row + 1):
+            if isinstance(data, str):
+                errors.append((row_number, [data]))
+                continue
+
+            try:
+                debt = DebtCreate(**data)
+            except ValidationError as e:
+                errors.append((
+                    row_number,
+                    [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+                ))
+                continue
+
+            if debt.description in seen_descriptions:
+                errors.append((row_number, [f"Duplicate description '{debt.description}' in the file."]))
+                continue
+            seen_descriptions.add(debt.description)
+
+            rows.append({"row": row_number, "user_id": user_id, **debt.dict()})
+
+        return rows, errors
+
+    @staticmethod
+    def _parse_json_record(record: str):
+        """Parse one NDJSON line, returning an error message instead of raising."""
+        try:
+            data = json.loads(record)
+        except json.JSONDecodeError as e:
+            return f"Invalid JSON: {e.msg}."
+        if not isinstance(data, dict):
+            return "Each line must be a JSON object."
+        return data
+
+    @staticmethod
+    async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        """Decode the body as UTF-8 and yield it line by line, without line endings."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending.rstrip("\r")
+
+    async def _records(self, chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[str]:
+        """
+        Yield one record per non-blank line. In CSV, lines are joined while a
+        quoted field is still open, so values may contain line breaks.
+        """
+        record = None
+        async for line in self._lines(chunks):
+            if format == "csv":
+                record = line if record is None else f"{record}\n{line}"
+                if record.count('"') % 2:
+                    continue
+                line, record = record, None
+
+            if line.strip():
+                yield line
+
+        if record is not None:
+            yield record
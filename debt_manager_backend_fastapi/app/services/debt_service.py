@@ -1,7 +1,23 @@
-from typing import List, Dict
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, List, Dict, Optional
+from uuid import UUID
 from fastapi import HTTPException
-from app.models.debt import DebtCreate, DebtUpdate, DebtResponse
-from app.repositories.debt_repository import DebtRepository
+from app.middlewares.etag import digest_etag, version_etag, version_from_if_match
+from app.models.debt import Debt, DebtCreate, DebtUpdate, DebtResponse
+from app.models.serialization import get_record_serializer
+from app.repositories.async_debt_repository import AsyncDebtRepository
+from app.repositories.generic_repository import VersionConflictError
+from app.repositories.status_registry import status_registry
+from app.services import parse_fields
+
+# Export formats and their media types
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Columns listed by default; `fields` selects others ("*" for all)
+DEBT_LIST_FIELDS = ("id", "user_id", "description", "amount", "due_date", "status_id")
 
 
 class DebtService:
@@ -9,16 +25,18 @@ class DebtService:
     Service layer to handle debt-related business logic.
     """
 
-    def __init__(self, debt_repository: DebtRepository):
+    def __init__(self, debt_repository: AsyncDebtRepository):
         """
         Initialize the DebtService with a repository dependency.
 
         Args:
-            debt_repository (DebtRepository): The repository layer for debt operations.
+            debt_repository (AsyncDebtRepository): The async repository layer for debt operations.
         """
         self.debt_repository = debt_repository
+        # Prepares debt records for the JSON fast path of the router
+        self.serializer = get_record_serializer(Debt)
 
-    def create_debt(self, data: DebtCreate) -> DebtResponse:
+    async def create_debt(self, data: DebtCreate) -> DebtResponse:
         """
         Create a new debt.
 
@@ -29,86 +47,289 @@ class DebtService:
             DebtResponse: The created debt.
         """
         # Check if a debt with the same description already exists
-        if self.debt_repository.find_by_description(data.description):
+        if await self.debt_repository.find_by_description(data.description):
             raise HTTPException(
                 status_code=400,
                 detail=f"Debt with description '{data.description}' already exists."
             )
         
         # Create a new debt
-        new_debt = self.debt_repository.create(data)
+        new_debt = await self.debt_repository.create(data)
         return DebtResponse(**new_debt.dict())
 
-    def get_debt_by_id(self, debt_id: str) -> DebtResponse:
+    async def create_debts_bulk(self, debts: List[DebtCreate], user_id: UUID) -> Dict:
+        """
+        Create many debts for a user in a single transaction.
+
+        Args:
+            debts (List[DebtCreate]): The validated debts; `status` is a status name.
+            user_id (UUID): Owner of the debts.
+
+        Returns:
+            Dict: The generated IDs, in the same order as the input, and their count.
+
+        Raises:
+            ValueError: If no debt is given or a status is unknown.
+        """
+        if not debts:
+            raise ValueError("At least one debt must be provided.")
+
+        ids = await self.debt_repository.create_many([{**debt.dict(), "user_id": user_id} for debt in debts])
+        return {"ids": ids, "count": len(ids)}
+
+    async def get_debt_by_id(self, debt_id: str, fields: Optional[str] = None) -> Dict:
         """
         Retrieve a debt by ID.
 
         Args:
             debt_id (str): The ID of the debt.
+            fields (Optional[str]): Comma-separated columns to return. Default: all.
 
         Returns:
-            DebtResponse: The retrieved debt.
+            Dict: The retrieved debt, with its status name.
         """
-        debt = self.debt_repository.get_by_id(debt_id)
-        if not debt:
+        result = await self.debt_repository.get_by_id(debt_id, parse_fields(fields))
+        if result["status_code"] != 200:
             raise HTTPException(
                 status_code=404,
                 detail=f"Debt with ID '{debt_id}' not found."
             )
-        return DebtResponse(**debt.dict())
+        return self._with_status_name(result["data"])
+
+    async def get_debts_by_ids(self, ids: List[str]) -> Dict:
+        """
+        Retrieve many debts by ID in one query.
+
+        Args:
+            ids (List[str]): The debt IDs, in the order the records should come back.
+
+        Returns:
+            Dict: The debts found (`records`, with their status names) and the IDs not found (`missing`).
+        """
+        result = await self.debt_repository.get_many(ids)
+        data = result["data"]
+        data["records"] = [self._with_status_name(record) for record in data["records"]]
+        return data
 
-    def update_debt(self, debt_id: str, data: DebtUpdate) -> DebtResponse:
+    async def update_debt(self, debt_id: str, data: DebtUpdate, if_match: Optional[str] = None) -> Dict:
         """
         Update an existing debt by ID.
 
+        With `if_match` (an ETag from a previous read), the debt is only updated
+        if it has not changed since, in a single conditional UPDATE.
+
         Args:
             debt_id (str): The ID of the debt to update.
             data (DebtUpdate): The updated debt data.
+            if_match (Optional[str]): The request's If-Match header.
 
         Returns:
-            DebtResponse: The updated debt.
+            Dict: The updated debt, with its status name.
         """
-        existing_debt = self.debt_repository.get_by_id(debt_id)
-        if not existing_debt:
+        precondition_failed = HTTPException(
+            status_code=412,
+            detail=f"Debt with ID '{debt_id}' was modified by another request. Reload it and retry."
+        )
+        expected_version = None
+        if if_match is not None:
+            try:
+                expected_version = version_from_if_match(if_match, debt_id)
+            except ValueError:
+                raise precondition_failed
+
+        try:
+            updated = await self.debt_repository.update(debt_id, data, expected_version=expected_version)
+        except VersionConflictError:
+            raise precondition_failed
+        if not updated:
             raise HTTPException(
                 status_code=404,
                 detail=f"Debt with ID '{debt_id}' not found."
             )
-        
-        updated_debt = self.debt_repository.update(debt_id, data)
-        return DebtResponse(**updated_debt.dict())
+        return await self.get_debt_by_id(debt_id)
+
+    @staticmethod
+    def debt_etag(debt: Dict) -> str:
+        """Strong ETag of a single debt, derived from its row version."""
+        return version_etag(debt["id"], debt["version"])
+
+    @staticmethod
+    def list_etag(page: Dict) -> str:
+        """
+        Strong ETag of a page of debts, from the IDs and versions of its records
+        and its pagination metadata, so it is computed without serializing the page.
+        """
+        records = ((record["id"], record.get("version"), record.get("status")) for record in page["records"])
+        return digest_etag([*records, sorted(page.get("pagination", {}).items())])
 
-    def delete_debt(self, debt_id: str) -> None:
+    async def delete_debt(self, debt_id: str) -> None:
         """
         Delete a debt by ID.
 
         Args:
             debt_id (str): The ID of the debt to delete.
         """
-        debt = self.debt_repository.get_by_id(debt_id)
-        if not debt:
+        debt = await self.debt_repository.get_by_id(debt_id)
+        if debt["status_code"] != 200:
             raise HTTPException(
                 status_code=404,
                 detail=f"Debt with ID '{debt_id}' not found."
             )
         
-        self.debt_repository.delete(debt_id)
+        await self.debt_repository.delete(debt_id)
+
+    async def list_debts(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = 10000,
+        fields: Optional[str] = None,
+    ) -> Dict:
+        """
+        List debts using offset or cursor (keyset) pagination.
+
+        Args:
+            page (int): Page number, used only in offset mode.
+            per_page (int): Number of records per page.
+            cursor (Optional[str]): Opaque cursor returned by a previous page.
+            sort_by (str): Whitelisted column to sort by; `id` breaks ties.
+            order (str): Sort direction, "asc" or "desc".
+            mode (str): Pagination mode, "offset" or "cursor".
+            count (Optional[str]): Count strategy: "exact", "estimated", "capped" or "none".
+            count_cap (int): Upper bound used by the "capped" strategy.
+            fields (Optional[str]): Comma-separated columns to return, "*" for all.
+                Default: `DEBT_LIST_FIELDS`.
+
+        Returns:
+            Dict: Records and pagination metadata.
+        """
+        result = await self.debt_repository.find_all(
+            page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+            count=count, count_cap=count_cap, fields=parse_fields(fields, DEBT_LIST_FIELDS)
+        )
+        data = result["data"]
+        data["records"] = [self._with_status_name(record) for record in data["records"]]
+        return data
+
+    async def search_debts(
+        self,
+        q: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+    ) -> Dict:
+        """
+        Search debts by description and notes (full text) and by debtor or creditor name (fuzzy).
+
+        Args:
+            q (str): Search text.
+            per_page (int): Number of results per page, up to 100.
+            cursor (Optional[str]): `next_cursor` of the previous page.
+            user_id (Optional[UUID]): Only debts of this user.
+            status (Optional[str]): Only debts with this status name.
+
+        Returns:
+            Dict: Records ordered by relevance and the cursor of the next page.
+        """
+        q = (q or "").strip()
+        if not q:
+            raise ValueError("The search text must not be empty.")
+        if len(q) > 200:
+            raise ValueError("The search text must be at most 200 characters.")
+        if not 1 <= per_page <= 100:
+            raise ValueError("per_page must be between 1 and 100.")
+
+        result = await self.debt_repository.search(q, per_page, cursor, user_id, status)
+        result["records"] = [self._with_status_name(record) for record in result["records"]]
+        return result
+
+    async def summarize_debts(self, group_by: Optional[str] = None) -> Dict:
+        """
+        Totals of debts, optionally grouped.
+
+        Args:
+            group_by (Optional[str]): Comma-separated dimensions among "user_id",
+                "status" and "creditor_name". Empty for the grand total.
+
+        Returns:
+            Dict: The grouping and, per group, the debt count and total amount.
+        """
+        dimensions = [dimension.strip() for dimension in (group_by or "").split(",") if dimension.strip()]
+        return await self.debt_repository.summarize(dimensions)
+
+    def export_debts(
+        self,
+        format: str = "ndjson",
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Export debts as NDJSON or CSV, one chunk per fetched batch.
+
+        Arguments are validated here, before anything is streamed, so bad
+        input can still be answered with an error status.
+
+        Args:
+            format (str): "ndjson" or "csv".
+            user_id (Optional[UUID]): Only debts of this user.
+            status (Optional[str]): Only debts with this status name.
+            due_from (Optional[date]): Only debts due on or after this date.
+            due_to (Optional[date]): Only debts due on or before this date.
+
+        Returns:
+            AsyncIterator[str]: Text chunks of the export.
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format '{format}'. Use one of: {', '.join(sorted(EXPORT_FORMATS))}.")
+        if due_from is not None and due_to is not None and due_from > due_to:
+            raise ValueError("'due_from' must not be after 'due_to'.")
+        if status is not None:
+            status_registry.require_id(status)
+
+        return self._export_chunks(format, user_id=user_id, status=status, due_from=due_from, due_to=due_to)
+
+    async def _export_chunks(self, format: str, **filters) -> AsyncIterator[str]:
+        columns = self.debt_repository.repository.export_columns
+
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
 
-    def get_all_debts(self, skip: int = 0, limit: int = 10) -> List[DebtResponse]:
+            async for rows in self.debt_repository.export(**filters):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            return
+
+        async for rows in self.debt_repository.export(**filters):
+            yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows)
+
+    async def get_all_debts(self, skip: int = 0, limit: int = 10) -> List[Dict]:
         """
         Retrieve all debts with pagination.
 
         Args:
-            skip (int): Number of records to skip. Default is 0.
+            skip (int): Number of records to skip, rounded down to a whole page. Default is 0.
             limit (int): Maximum number of records to return. Default is 10.
 
         Returns:
-            List[DebtResponse]: A list of debts.
+            List[Dict]: A list of debts, as returned by the repository.
         """
-        debts = self.debt_repository.find_all(skip=skip, limit=limit)
-        return [DebtResponse(**debt.dict()) for debt in debts]
+        result = await self.list_debts(page=skip // limit + 1, per_page=limit, count="none", fields="*")
+        return result["records"]
 
-    def paginate_debts(self, page: int, page_size: int) -> Dict:
+    async def paginate_debts(self, page: int, page_size: int) -> Dict:
         """
         Paginate debts.
 
@@ -119,13 +340,17 @@ class DebtService:
         Returns:
             Dict: Paginated result containing total count, page number, and debts.
         """
-        total_debts = self.debt_repository.count()
-        debts = self.debt_repository.find_all(
-            skip=(page - 1) * page_size, limit=page_size
-        )
+        result = await self.list_debts(page=page, per_page=page_size, count="exact", fields="*")
         return {
-            "total": total_debts,
+            "total": result["pagination"]["total_records"],
             "page": page,
             "page_size": page_size,
-            "debts": [DebtResponse(**debt.dict()) for debt in debts],
+            "debts": result["records"],
         }
+
+    @staticmethod
+    def _with_status_name(record: Dict) -> Dict:
+        """Copy of `record` with the name of its status, resolved from the status registry."""
+        if "status_id" not in record:
+            return record
+        return {**record, "status": status_registry.name_for(record["status_id"])}
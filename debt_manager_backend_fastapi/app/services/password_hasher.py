@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# scrypt cost parameters and worker pool limits
+PASSWORD_HASH_SETTINGS = {
+    "n": int(os.getenv("PASSWORD_HASH_N", 2 ** 14)),
+    "r": int(os.getenv("PASSWORD_HASH_R", 8)),
+    "p": int(os.getenv("PASSWORD_HASH_P", 1)),
+    "workers": int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))),
+    "max_pending": int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64)),
+}
+
+# Prefix of the encoded hashes: scrypt$<n>$<r>$<p>$<salt>$<hash>
+SCHEME = "scrypt"
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many hash operations are already queued."""
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with scrypt on a dedicated thread pool.
+
+    scrypt releases the GIL, so at most `workers` hashes run in parallel
+    without blocking the event loop. Callers beyond that wait, and once
+    `max_pending` operations are in flight new ones are refused right away
+    with `PasswordHasherBusy`, so a login storm cannot queue up unbounded
+    work and starve the rest of the API.
+    """
+
+    def __init__(
+        self,
+        n: int = PASSWORD_HASH_SETTINGS["n"],
+        r: int = PASSWORD_HASH_SETTINGS["r"],
+        p: int = PASSWORD_HASH_SETTINGS["p"],
+        workers: int = PASSWORD_HASH_SETTINGS["workers"],
+        max_pending: int = PASSWORD_HASH_SETTINGS["max_pending"],
+    ):
+        if n < 2 or n & (n - 1):
+            raise ValueError("The scrypt cost 'n' must be a power of two greater than one.")
+        if workers < 1 or max_pending < workers:
+            raise ValueError("'max_pending' must be at least 'workers', which must be positive.")
+
+        self.n, self.r, self.p = n, r, p
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash `password` with the current cost parameters.
+
+        Raises:
+            PasswordHasherBusy: If the queue is full.
+        """
+        return await self._submit(self.hash_sync, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Check `password` against a hash produced by `hash`, whatever its cost parameters.
+
+        Raises:
+            PasswordHasherBusy: If the queue is full.
+        """
+        return await self._submit(self.verify_sync, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether the hash was made with other cost parameters (or another scheme)."""
+        parsed = self._parse(hashed_password)
+        return parsed is None or parsed[:3] != (self.n, self.r, self.p)
+
+    def hash_sync(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return "$".join((SCHEME, str(self.n), str(self.r), str(self.p), self._b64(salt), self._b64(digest)))
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        parsed = self._parse(hashed_password)
+        if parsed is None:
+            return False
+        n, r, p, salt, digest = parsed
+        return hmac.compare_digest(self._derive(password, salt, n, r, p, len(digest)), digest)
+
+    def statistics(self) -> Dict[str, int]:
+        return {"workers": self.workers, "pending": self._pending, "max_pending": self.max_pending,
+                "rejected": self.rejected}
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, function, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress. Try again later.")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        self._pending += 1
+        try:
+            async with self._slots:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, length: int = 32) -> bytes:
+        # scrypt needs 128 * r * (n + p + 2) bytes; leave some headroom
+        maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, dklen=length, maxmem=maxmem)
+
+    @staticmethod
+    def _b64(value: bytes) -> str:
+        return base64.urlsafe_b64encode(value).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _parse(hashed_password: str):
+        parts = (hashed_password or "").split("$")
+        if len(parts) != 6 or parts[0] != SCHEME:
+            return None
+        try:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            salt, digest = (base64.urlsafe_b64decode(part + "=" * (-len(part) % 4)) for part in parts[4:])
+        except ValueError:
+            return None
+        return n, r, p, salt, digest
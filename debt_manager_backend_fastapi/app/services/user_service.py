@@ -1,81 +1,106 @@
 from fastapi import HTTPException, status
 from flask import jsonify
-from app.repositories.user_repository import UserRepository
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.services import parse_fields
+from app.services.password_hasher import PasswordHasher
+from app.models.serialization import get_record_serializer
 from app.models.user import UserCreate, UserResponse
 
-from app.repositories.user_repository import UserRepository
-from app.models.user import UserCreate, UserResponse, UserUpdate
-from typing import Dict, List
+from app.models.user import User, UserCreate, UserResponse, UserUpdate
+from typing import Dict, List, Optional
 
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: AsyncUserRepository, password_hasher: PasswordHasher):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
+        # Prepares user records for the JSON fast path of the router
+        self.serializer = get_record_serializer(User, user_repository.repository.hidden_fields)
 
 
-    def create_user(self, data: UserCreate) -> UserResponse:
+    async def create_user(self, data: UserCreate) -> UserResponse:
  
-        if self.user_repository.find_by_email(data.email) == True:
+        if await self.user_repository.find_by_email(data.email) == True:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": f"User with email '{data.email}' already exists."}
             )
 
-        new_user = self.user_repository.create(data)
+        hashed_password = await self.password_hasher.hash(data.password)
+        new_user = await self.user_repository.create(data, hashed_password)
         response = UserResponse(**new_user.to_dict())
         return response
 
 
-    def get_user_by_id(self, user_id: str) -> UserResponse:
-        user = self.user_repository.find_by_id(user_id)
-        if not user:
+    async def get_user_by_id(self, user_id: str) -> Dict:
+        result = await self.user_repository.get_by_id(user_id)
+        if result["status_code"] != 200:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "User not found."}
             )               
-        return UserResponse(**user.dict())
+        return result["data"]
 
-    def update_user(self, user_id: str, data: UserUpdate) -> UserResponse:
-        existing_user = self.user_repository.find_by_id(user_id)
+    async def update_user(self, user_id: str, data: UserUpdate) -> UserResponse:
+        existing_user = await self.user_repository.find_by_id(user_id)
         if not existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "User not found."}
             )  
-        updated_user = self.user_repository.update(user_id, data)
+        updated_user = await self.user_repository.update(user_id, data)
         return UserResponse(**updated_user.dict())
 
-    def delete_user(self, user_id: str) -> None:
-        user = self.user_repository.find_by_id(user_id)
+    async def delete_user(self, user_id: str) -> None:
+        user = await self.user_repository.find_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "User not found."}
             ) 
-        self.user_repository.delete(user_id)
+        await self.user_repository.delete(user_id)
+
+    async def get_users(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        mode: str = "offset",
+        count: Optional[str] = None,
+        count_cap: int = 10000,
+        fields: Optional[str] = None,
+    ) -> Dict:
+        result = await self.user_repository.find_all(
+            page=page, per_page=per_page, cursor=cursor, sort_by=sort_by, order=order, mode=mode,
+            count=count, count_cap=count_cap, fields=parse_fields(fields)
+        )
+        return result["data"]
 
-    def get_all_users(self, skip: int = 0, limit: int = 10) -> dict:
-        users = self.user_repository.find_all(skip, limit)
-        if not users:
+    async def get_users_by_ids(self, ids: List[str]) -> Dict:
+        """
+        Retrieve many users by ID in one query: the users found (`records`, in
+        the requested order) and the IDs not found (`missing`).
+        """
+        result = await self.user_repository.get_many(ids)
+        return result["data"]
+
+    async def get_all_users(self, skip: int = 0, limit: int = 10) -> List[Dict]:
+        users = await self.get_users(page=skip // limit + 1, per_page=limit, count="none")
+        if not users["records"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "User not found."}
             ) 
-        records = users['data']['records']
-        response: List[UserResponse] = []
-        for user in records:
-            response.append(UserResponse(**user))
-        return response
+        return users["records"]
 
-    def paginate_users(self, page: int, page_size: int) -> Dict:
-        total_users = self.user_repository.count()
-        users = self.user_repository.find_all(
-            skip=(page - 1) * page_size, limit=page_size
-        )
+    async def paginate_users(self, page: int, page_size: int) -> Dict:
+        users = await self.get_users(page=page, per_page=page_size, count="exact")
         return {
-            "total": total_users,
+            "total": users["pagination"]["total_records"],
             "page": page,
             "page_size": page_size,
-            "users": [UserResponse(**user.dict()) for user in users],
+            "users": users["records"],
         }
@@ -0,0 +1,58 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from app.models.debt import Debt
+from app.repositories.generic_repository import GenericRepository
+
+class RecordingSession:
+    """Sessão falsa: devolve IDs reservados e guarda as instruções executadas."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, params=None):
+        if "generate_sequential_uuid" in str(statement):
+            ids = [uuid.uuid4() for _ in range(params["total"])]
+            return type("Result", (), {"scalars": lambda self: type("Scalars", (), {"all": lambda self: ids})()})()
+        self.statements.append((str(statement), params))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+@pytest.fixture
+def session():
+    return RecordingSession()
+
+@pytest.fixture
+def repository(session):
+    return GenericRepository(session_factory=lambda: session, model=Debt)
+
+def test_save_many_coerces_values_and_keeps_defaults_for_omitted_columns(repository, session):
+    user_id = uuid.uuid4()
+    row = {"user_id": str(user_id), "description": "Rent", "amount": "10.5", "debtor_name": "Ana",
+           "creditor_name": "Bank", "status_id": str(uuid.uuid4())}
+
+    ids = repository.save_many([row, {**row, "description": "Gym", "due_date": "2024-05-01"}], "seq", Debt,
+                               copy_threshold=100)
+
+    assert len(ids) == 2
+    assert len(session.statements) == 2
+    statement, params = session.statements[1]
+    assert "due_date" in statement and "version" not in statement and "notes" not in statement
+    assert user_id in params.values() and 10.5 in params.values() and date(2024, 5, 1) in params.values()
+
+def test_save_many_rejects_values_of_the_wrong_type(repository, session):
+    with pytest.raises(ValueError):
+        repository.save_many([{"description": "Rent", "amount": "ten"}], "seq", Debt)
+    assert session.statements == []
@@ -0,0 +1,68 @@
+import asyncio
+import gzip
+
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from app.middlewares.compression import CompressionMiddleware, negotiate_encoding
+
+def call(response, accept_encoding="gzip"):
+    """Run `response` through the middleware and collect the ASGI messages it sends."""
+    middleware = CompressionMiddleware(response, settings={"minimum_size": 100, "encodings": ["gzip"]})
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    return headers, messages[1:]
+
+def test_negotiation_honours_quality_and_server_preference():
+    assert negotiate_encoding("gzip;q=0.5, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate_encoding("*;q=0.1", ["gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity", ["gzip"]) is None
+
+def test_large_bodies_are_compressed_and_small_ones_are_not():
+    headers, body = call(PlainTextResponse("x" * 1000))
+    assert headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in headers["vary"]
+    assert gzip.decompress(body[0]["body"]) == b"x" * 1000
+
+    headers, body = call(PlainTextResponse("x"))
+    assert "content-encoding" not in headers
+    assert body[0]["body"] == b"x"
+
+def test_streaming_responses_are_compressed_in_chunks():
+    headers, body = call(StreamingResponse((b"row\n" * 100 for _ in range(5)), media_type="application/x-ndjson"))
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(body) > 2
+    assert gzip.decompress(b"".join(message["body"] for message in body)) == b"row\n" * 500
+
+def test_compressed_responses_get_their_own_etag_and_every_response_varies():
+    from app.middlewares.etag import none_match, version_from_if_match
+
+    headers, _ = call(PlainTextResponse("x" * 1000, headers={"ETag": '"42-v3"'}))
+    assert headers["etag"] == '"42-v3-gzip"'
+    assert none_match(headers["etag"], '"42-v3"')
+    assert version_from_if_match(headers["etag"], 42) == 3
+
+    for response, accept_encoding in ((PlainTextResponse("x"), "gzip"), (PlainTextResponse("x" * 1000), "identity")):
+        headers, _ = call(response, accept_encoding)
+        assert "content-encoding" not in headers
+        assert "Accept-Encoding" in headers["vary"]
+
+def test_not_modified_carries_the_etag_of_the_compressed_representation():
+    from starlette.responses import Response
+
+    headers, _ = call(Response(status_code=304, headers={"ETag": '"42-v3"'}))
+    assert headers["etag"] == '"42-v3-gzip"'
+    assert "Accept-Encoding" in headers["vary"]
+
+    headers, _ = call(Response(status_code=304, headers={"ETag": '"42-v3"'}), "identity")
+    assert headers["etag"] == '"42-v3"'
@@ -0,0 +1,84 @@
+import uuid
+
+from app.repositories.entity_cache import EntityCache, InMemorySharedBackend, LocalLRUCache
+
+def test_lru_evicts_least_recently_used():
+    cache = LocalLRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+def test_expired_entries_are_dropped():
+    cache = LocalLRUCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+def test_invalidation_discards_in_flight_load():
+    cache = EntityCache("Debts", LocalLRUCache(10, 60), shared=InMemorySharedBackend())
+
+    record, generation = cache.get("ID-1")
+    assert record is None
+    cache.invalidate("id-1")
+    cache.set("ID-1", {"amount": 1.0}, generation)
+
+    assert cache.get("id-1")[0] is None
+
+def test_shared_backend_fills_local_cache():
+    shared = InMemorySharedBackend()
+    writer = EntityCache("Debts", LocalLRUCache(10, 60), shared=shared)
+    reader = EntityCache("Debts", LocalLRUCache(10, 60), shared=shared)
+
+    _, generation = writer.get("id-1")
+    writer.set("id-1", {"amount": 1.0}, generation)
+
+    assert reader.get("id-1")[0] == {"amount": 1.0}
+    assert reader.statistics()["hits"] == 1
+
+def test_repository_caches_every_spelling_of_an_id_under_one_key():
+    from app.models.debt import Debt
+    from app.repositories.generic_repository import GenericRepository
+
+    record_id = uuid.uuid4()
+    repository = GenericRepository(None, Debt, entity_cache=EntityCache("Debts", LocalLRUCache(10, 60)))
+
+    _, generation = repository._cached_get(record_id.hex.upper())
+    repository._cache_result(record_id.hex.upper(), {"status_code": 200, "data": {"amount": 1.0}}, generation)
+    assert repository._cached_get(f"{{{record_id}}}")[0]["data"] == {"amount": 1.0}
+
+    repository._invalidate_cached("Debts", str(record_id))
+    assert repository._cached_get(record_id.hex)[0] is None
+    assert len(repository.entity_cache.local) == 0
+
+def test_published_invalidation_evicts_other_workers_local_copy():
+    from app.models.debt import Debt
+    from app.repositories.generic_repository import GenericRepository
+
+    class RecordingSession:
+        def __init__(self):
+            self.params = []
+
+        def execute(self, statement, params):
+            self.params.append(params)
+
+    record_id = uuid.uuid4()
+    writer = GenericRepository(
+        None, Debt, entity_cache=EntityCache("Debts", LocalLRUCache(10, 60), broadcast_channel="invalidated")
+    )
+    reader = EntityCache("Debts", LocalLRUCache(10, 60))
+    _, generation = reader.get(str(record_id))
+    reader.set(str(record_id), {"amount": 1.0}, generation)
+
+    session = RecordingSession()
+    writer._publish_invalidation(session, "Debts", record_id.hex.upper())
+    assert session.params == [{"channel": "invalidated", "key": f"Debts:{record_id}"}]
+
+    reader.evict_local(session.params[0]["key"])
+    assert reader.get(str(record_id))[0] is None
+    assert reader.statistics()["remote_invalidations"] == 1
@@ -0,0 +1,123 @@
+import uuid
+
+import pytest
+
+from app.config.repositories import memory_statuses
+from app.models.user import User
+from app.repositories.generic_repository import InvalidFieldsError
+from app.repositories.memory_debt_repository import InMemoryDebtRepository
+from app.repositories.memory_repository import InMemoryRepository
+from app.repositories.status_registry import status_registry
+
+@pytest.fixture
+def statuses():
+    status_registry.replace(memory_statuses())
+    yield memory_statuses()
+    status_registry.replace({})
+
+@pytest.fixture
+def user_repository():
+    return InMemoryRepository(User, unique=("email", "username"))
+
+@pytest.fixture
+def user_ids(user_repository):
+    return user_repository.save_many(
+        [
+            {"username": f"user{i:02d}", "email": f"user{i:02d}@example.com", "name": f"User {i}", "hashed_password": "h"}
+            for i in range(7)
+        ],
+        "users_seq",
+    )
+
+@pytest.fixture
+def debt_repository(statuses):
+    return InMemoryDebtRepository()
+
+@pytest.fixture
+def debt_ids(debt_repository, statuses):
+    user_id = uuid.uuid4()
+    return debt_repository.create_many([
+        {"user_id": user_id, "description": "Car loan", "amount": 100.0, "debtor_name": "Ana",
+         "creditor_name": "Bank", "status_id": statuses["pending"]},
+        {"user_id": user_id, "description": "House loan", "amount": 250.0, "debtor_name": "Ana",
+         "creditor_name": "Bank", "status_id": statuses["pending"], "notes": "car park included"},
+        {"user_id": user_id, "description": "Phone bill", "amount": 40.0, "debtor_name": "Ana",
+         "creditor_name": "Telecom", "status_id": statuses["paid"]},
+        {"user_id": user_id, "description": "Car repair", "amount": 60.0, "debtor_name": "Ana",
+         "creditor_name": "Garage", "status_id": statuses["pending"]},
+    ])
+
+def test_cursor_pages_walk_every_record_once(user_repository, user_ids):
+    seen, cursor = [], None
+    while True:
+        data = user_repository.find_all(per_page=3, cursor=cursor, mode="cursor")["data"]
+        seen += [str(record["id"]) for record in data["records"]]
+        cursor = data["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(str(record_id) for record_id in user_ids)
+    assert user_repository.find_all(page=3, per_page=3)["data"]["pagination"]["total_records"] == 7
+    assert user_repository.get_by_id(str(user_ids[0]))["data"]["username"] == "user00"
+
+def test_invalid_fields_are_told_apart_from_missing_records(user_repository, user_ids):
+    with pytest.raises(InvalidFieldsError):
+        user_repository.get_by_id(str(user_ids[0]), fields=("username", "nickname"))
+
+    assert user_repository.get_by_id(str(uuid.uuid4()), fields=("username",))["status_code"] == 404
+
+def test_unique_violation_rejects_the_whole_batch(user_repository, user_ids):
+    with pytest.raises(RuntimeError):
+        user_repository.save_many(
+            [
+                {"username": "new", "email": "new@example.com", "name": "New", "hashed_password": "h"},
+                {"username": "user01", "email": "other@example.com", "name": "Dup", "hashed_password": "h"},
+            ],
+            "users_seq",
+        )
+
+    assert len(user_repository.find_all(per_page=10)["data"]["records"]) == 7
+
+def test_summary_follows_updates_and_deletes(debt_repository, debt_ids, statuses):
+    def totals():
+        return {
+            group["status"]: (group["debt_count"], group["total_amount"])
+            for group in debt_repository.summarize(["status"])["groups"]
+        }
+
+    assert totals() == {"paid": (1, 40.0), "pending": (3, 410.0)}
+
+    assert debt_repository.update(str(debt_ids[0]), {"status_id": statuses["paid"], "amount": 120.0})
+    assert debt_repository.delete(str(debt_ids[2]))
+    assert totals() == {"paid": (1, 120.0), "pending": (2, 310.0)}
+
+    expected = debt_repository.summarize(["status", "creditor_name"])
+    debt_repository.summary_repository.rebuild()
+    assert debt_repository.summarize(["status", "creditor_name"]) == expected
+
+def test_search_ranks_and_walks_cursors(debt_repository, debt_ids):
+    first = debt_repository.search("car", per_page=2)
+    cursor = first["pagination"]["next_cursor"]
+    second = debt_repository.search("car", per_page=2, cursor=cursor)
+
+    descriptions = [record["description"] for record in first["records"] + second["records"]]
+    assert sorted(descriptions) == ["Car loan", "Car repair", "House loan"]
+    # A term in the description outranks the same term only in the notes
+    assert descriptions[-1] == "House loan"
+    assert second["pagination"]["next_cursor"] is None
+    assert debt_repository.search("car -repair", per_page=5)["records"][0]["description"] == "Car loan"
+
+def test_import_rejects_duplicates_and_unknown_statuses(debt_repository, debt_ids):
+    user_id = uuid.uuid4()
+    row = {"user_id": user_id, "amount": 1.0, "debtor_name": "Bo", "creditor_name": "Bank"}
+
+    result = debt_repository.import_batch([
+        {**row, "row": 1, "description": "Car loan", "status": "pending"},
+        {**row, "row": 2, "description": "Gym", "status": "unknown"},
+        {**row, "row": 3, "description": "Rent", "status": "paid"},
+        {**row, "row": 4, "description": "Rent", "status": "paid"},
+    ])
+
+    assert result["imported"] == 1
+    assert [row_number for row_number, _ in result["rejected"]] == [1, 2, 4]
+    assert debt_repository.summarize()["groups"][0]["debt_count"] == 5
@@ -0,0 +1,22 @@
+from sqlalchemy.orm import configure_mappers
+
+from app.models.debt import Debt
+from app.repositories.model_metadata import get_model_metadata
+
+def test_debt_metadata_lists_columns_without_relationships():
+    metadata = get_model_metadata(Debt)
+
+    assert metadata.columns[0] == "id"
+    assert {"user_id", "status_id", "version"} <= set(metadata.columns)
+    assert "user" not in metadata.columns and "status" not in metadata.columns
+    assert "id" not in metadata.insertable and "version" not in metadata.insertable
+    assert metadata.versioned
+    assert metadata.table_name == "Debts"
+
+def test_debt_mappers_configure_across_model_bases():
+    configure_mappers()
+
+    debt = Debt(description="Rent", amount=10.0)
+    values = get_model_metadata(debt).extract(debt, get_model_metadata(Debt).insertable)
+    assert values["description"] == "Rent" and values["amount"] == 10.0
+    assert "user" not in values and "status" not in values
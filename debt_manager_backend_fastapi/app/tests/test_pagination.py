@@ -0,0 +1,51 @@
+import pytest
+
+from app.repositories.pagination import (
+    build_count_metadata,
+    cursor_from_record,
+    decode_cursor,
+    encode_cursor,
+)
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("amount", "desc", [150.0, "0b7c6f1e-0000-0000-0000-000000000001"], "next")
+
+    decoded = decode_cursor(cursor, "amount", "desc")
+    assert decoded == {
+        "values": [150.0, "0b7c6f1e-0000-0000-0000-000000000001"],
+        "direction": "next",
+    }
+
+def test_cursor_rejects_other_ordering():
+    cursor = encode_cursor("amount", "asc", [10.0, "some-id"], "next")
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "description", "asc")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "amount", "desc")
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "id", "asc")
+
+def test_cursor_from_record_uses_id_as_tiebreaker():
+    record = {"id": "abc", "description": "Rent", "amount": 10.0}
+
+    cursor = cursor_from_record(record, "description", "asc", "prev")
+    assert decode_cursor(cursor, "description", "asc")["values"] == ["Rent", "abc"]
+    assert cursor_from_record(None, "id", "asc", "next") is None
+
+def test_count_metadata_computes_total_pages():
+    metadata = build_count_metadata("exact", 25, 10)
+
+    assert metadata["total_records"] == 25
+    assert metadata["total_pages"] == 3
+
+def test_count_metadata_capped_and_skipped():
+    capped = build_count_metadata("capped", 10000, 10, capped=True)
+    assert capped["total_records_display"] == "10,000+"
+    assert capped["total_pages"] == 1000
+
+    skipped = build_count_metadata("none", None, 10)
+    assert skipped["total_records"] is None
+    assert skipped["total_pages"] is None
@@ -0,0 +1,22 @@
+import asyncio
+
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+def test_hash_verifies_and_flags_cost_changes():
+    hasher = PasswordHasher(n=2 ** 10, workers=1, max_pending=1)
+    hashed = hasher.hash_sync("s3cret")
+
+    assert hasher.verify_sync("s3cret", hashed)
+    assert not hasher.verify_sync("wrong", hashed)
+    assert not hasher.needs_rehash(hashed)
+    assert PasswordHasher(n=2 ** 11, workers=1, max_pending=1).needs_rehash(hashed)
+
+def test_full_queue_is_refused():
+    hasher = PasswordHasher(n=2 ** 10, workers=1, max_pending=2)
+
+    async def hash_many():
+        return await asyncio.gather(*[hasher.hash("s3cret") for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(hash_many())
+    assert sum(isinstance(result, PasswordHasherBusy) for result in results) == 1
+    assert hasher.statistics()["rejected"] == 1
@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine, text
+
+from app.config.query_metrics import QueryMetrics, fingerprint
+
+def test_fingerprint_replaces_literals_and_collapses_lists():
+    assert fingerprint(
+        'SELECT * FROM "Debts" WHERE id IN (%(id_1)s, %(id_2)s) AND amount > 10 AND status = \'paid\''
+    ) == 'SELECT * FROM "Debts" WHERE id IN (...) AND amount > ? AND status = ?'
+    assert fingerprint("INSERT INTO t (a, b) VALUES (:a_0, :b_0), (:a_1, :b_1)") == "INSERT INTO t (a, b) VALUES (?, ?), ..."
+
+def test_statements_are_counted_per_fingerprint_and_request():
+    metrics = QueryMetrics({"max_queries_per_request": 2})
+    engine = create_engine("sqlite://")
+    metrics.instrument(engine)
+
+    token = metrics.begin_request({"path": "/debts"})
+    with engine.connect() as connection:
+        for value in range(3):
+            connection.execute(text("SELECT :value"), {"value": value})
+    queries = metrics.end_request(token)
+
+    assert queries.count == 3
+    statistics = metrics.statistics()
+    assert statistics["statements"][0]["statement"] == "SELECT ?"
+    assert statistics["statements"][0]["count"] == 3
+    assert statistics["n_plus_one_routes"] == {"/debts": 1}
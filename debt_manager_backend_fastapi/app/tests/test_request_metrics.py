@@ -0,0 +1,64 @@
+import asyncio
+
+from fastapi import FastAPI, HTTPException
+
+from app.config.request_metrics import RequestMetrics, render
+from app.middlewares.metrics import MetricsMiddleware
+
+def call(app, method, path):
+    scope = {"type": "http", "method": method, "path": path, "raw_path": path.encode(), "root_path": "",
+             "query_string": b"", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    asyncio.run(app(scope, receive, send))
+
+def make_app(metrics):
+    app = FastAPI()
+
+    @app.get("/debts/{debt_id}")
+    async def get_debt(debt_id: str):
+        if debt_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": debt_id}
+
+    return MetricsMiddleware(app, router=app.router, metrics=metrics)
+
+def test_requests_are_counted_by_route_template_and_status():
+    metrics = RequestMetrics()
+    app = make_app(metrics)
+    for path in ("/debts/1", "/debts/2", "/debts/missing", "/nowhere/3"):
+        call(app, "GET", path)
+
+    output = render(metrics.snapshot())
+    assert 'http_requests_total{method="GET",route="/debts/{debt_id}",status="200"} 2' in output
+    assert 'http_requests_total{method="GET",route="/debts/{debt_id}",status="404"} 1' in output
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in output
+    assert 'http_request_duration_seconds_count{method="GET",route="/debts/{debt_id}"} 3' in output
+    assert 'http_requests_in_flight{method="GET",route="/debts/{debt_id}"} 0' in output
+
+def test_non_standard_methods_share_one_label():
+    metrics = RequestMetrics()
+    app = make_app(metrics)
+    for method in ("FOO", "BAR", "DELETE"):
+        call(app, method, "/debts/1")
+
+    output = render(metrics.snapshot())
+    assert 'http_requests_total{method="other",route="/debts/{debt_id}",status="405"} 2' in output
+    assert 'http_requests_total{method="DELETE",route="/debts/{debt_id}",status="405"} 1' in output
+    assert "FOO" not in output
+
+def test_workers_are_summed_in_multiprocess_mode(tmp_path):
+    metrics = RequestMetrics(multiprocess_dir=str(tmp_path))
+    call(make_app(metrics), "GET", "/debts/1")
+    other_worker = [{"method": "GET", "route": "/debts/{debt_id}", "statuses": {"200": 4},
+                     "bucket_counts": [4] + [0] * 13, "duration_sum": 0.01, "in_flight": 1}]
+    metrics._write(2 ** 22 + 1, other_worker)  # A worker that has exited
+
+    output = asyncio.run(metrics.exposition())
+    assert 'http_requests_total{method="GET",route="/debts/{debt_id}",status="200"} 5' in output
+    assert 'http_requests_in_flight{method="GET",route="/debts/{debt_id}"} 0' in output
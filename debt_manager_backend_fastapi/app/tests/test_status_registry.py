@@ -0,0 +1,48 @@
+import pytest
+
+from app.repositories.status_registry import StatusRegistry
+
+class StatusTable:
+    """Fake session factory over a list of (id, name) rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        self.loads += 1
+        if self.rows is None:
+            raise ConnectionError("database unavailable")
+        return type("Result", (), {"fetchall": lambda result: list(self.rows)})()
+
+def test_miss_fails_right_away_and_reloads_in_background_once_per_interval():
+    table = StatusTable([("id-1", "pending")])
+    registry = StatusRegistry(session_factory=table, listener=None, miss_reload_seconds=60)
+    registry.load()
+
+    table.rows.append(("id-2", "paid"))
+    with pytest.raises(ValueError):
+        registry.require_id("paid")
+    registry._miss_reload.join()
+    assert registry.require_id("paid") == "id-2"
+
+    with pytest.raises(ValueError):
+        registry.require_id("overdue")
+    assert table.loads == 2
+
+def test_start_fails_when_statuses_cannot_be_loaded():
+    table = StatusTable(None)
+    registry = StatusRegistry(session_factory=table, listener=None, start_attempts=2, start_retry_seconds=0)
+
+    with pytest.raises(RuntimeError):
+        registry.start()
+    assert table.loads == 2
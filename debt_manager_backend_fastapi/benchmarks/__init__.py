@@ -0,0 +1,14 @@
+"""
+Benchmarks of the repository, service and HTTP hot paths.
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python -m benchmarks.run --scale 10k
+
+The benchmark database is seeded (and truncated) by the run, so it must be
+a dedicated database, never the application's. Create it once with
+`python -m app.migrations.create_database`; the run applies the migrations.
+
+With REPOSITORY_BACKEND=memory the same rows are loaded into the in-memory
+repositories instead, and no benchmark database is needed:
+    REPOSITORY_BACKEND=memory python -m benchmarks.run --scale 10k
+"""
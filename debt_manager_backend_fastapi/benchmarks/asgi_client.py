@@ -0,0 +1,77 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+class ASGIResponse:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in headers}
+        self.body = body
+
+
+class ASGIClient:
+    """
+    Minimal in-process HTTP client: calls the ASGI application directly, so
+    the benchmarks measure the whole middleware and routing stack without
+    any socket or server overhead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict] = None,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> ASGIResponse:
+        raw_headers = [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (headers or {}).items()]
+        if body:
+            raw_headers.append((b"content-length", str(len(body)).encode("ascii")))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("ascii"),
+            "root_path": "",
+            "query_string": urlencode(query or {}).encode("ascii"),
+            "headers": [(b"host", b"benchmark"), *raw_headers],
+            "client": ("127.0.0.1", 0),
+            "server": ("benchmark", 80),
+        }
+
+        request_sent = False
+        status, response_headers, chunks = 0, [], []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Only streaming responses keep listening; the request never disconnects
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status, response_headers = message["status"], message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return ASGIResponse(status, response_headers, b"".join(chunks))
+
+    async def get(self, path: str, **kwargs) -> ASGIResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post_form(self, path: str, form: Dict[str, str], headers: Optional[Dict[str, str]] = None) -> ASGIResponse:
+        return await self.request(
+            "POST", path, body=urlencode(form).encode("utf-8"),
+            headers={"content-type": "application/x-www-form-urlencoded", **(headers or {})},
+        )
@@ -0,0 +1,178 @@
+import random
+import uuid
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.harness import measure, measure_async
+from benchmarks.seed import BENCHMARK_EMAIL, BENCHMARK_PASSWORD, seeded_id, user_count
+
+# Page size of the list benchmarks
+PER_PAGE = 50
+
+# Untimed runs before each case
+WARMUP = 5
+
+# Cases reading or writing single debts, each given its own IDs
+POINT_CASES = ("repository.get_by_id", "repository.update", "service.get_debt_by_id", "http.get_debt")
+
+
+def database_anchors(engine, debts: int) -> Tuple[str, str]:
+    """The deep-page anchor debt and the first status (by name) of the seeded database."""
+    with engine.connect() as connection:
+        deep_id = connection.execute(
+            text('SELECT id FROM "Debts" ORDER BY id OFFSET :offset LIMIT 1'),
+            {"offset": max(0, debts - 2 * PER_PAGE)},
+        ).scalar()
+        status_id = connection.execute(text('SELECT id FROM "Status" ORDER BY name LIMIT 1')).scalar()
+    return str(deep_id), str(status_id)
+
+
+def memory_anchors(repository, debts: int) -> Tuple[str, str]:
+    """`database_anchors` for the in-memory debt repository."""
+    from app.config.repositories import memory_statuses
+
+    ids = repository.table.ids()
+    statuses = memory_statuses()
+    return ids[min(len(ids) - 1, max(0, debts - 2 * PER_PAGE))], statuses[min(statuses)]
+
+
+class BenchmarkContext:
+    """
+    Inputs shared by the cases, drawn from a seeded random generator so every
+    run at the same scale and seed touches the same rows.
+    """
+
+    def __init__(self, debts: int, seed: int, iterations: int, deep_id: str, status_id: str):
+        self.debts = debts
+        self.deep_id = deep_id
+        self.status_id = status_id
+        self.iterations = iterations
+        rng = random.Random(seed)
+        # Distinct IDs per case, so point reads are not served by the entity cache
+        per_case = WARMUP + iterations
+        indexes = rng.sample(range(1, debts + 1), min(debts, per_case * len(POINT_CASES)))
+        self._debt_ids = {
+            case: [seeded_id("bench-debt-", index) for index in indexes[slot * per_case:(slot + 1) * per_case]]
+            for slot, case in enumerate(POINT_CASES)
+        }
+        self.user_ids = [seeded_id("bench-user-", index) for index in range(1, min(100, user_count(debts)) + 1)]
+        self.amounts = [round(rng.uniform(1, 10000), 2) for _ in range(per_case)]
+        self.deep_page = max(1, debts // PER_PAGE - 1)
+
+    def debt_id(self, case: str, i: int) -> str:
+        """The debt the `i`-th run of `case` works on (IDs wrap around at small scales)."""
+        ids = self._debt_ids[case] or self._debt_ids[POINT_CASES[0]]
+        return ids[i % len(ids)]
+
+
+def repository_cases(repository, context: BenchmarkContext) -> List[Dict]:
+    """`find_all` (shallow and deep pages), `get_by_id`, `save` and `update` on the sync repository."""
+    from app.models.debt import Debt
+    from app.repositories.pagination import cursor_from_record
+
+    iterations = context.iterations
+    deep_cursor = cursor_from_record({"id": context.deep_id}, "id", "asc", "next")
+    results = [
+        measure(
+            "repository.find_all.first_page",
+            lambda i: repository.find_all(page=1, per_page=PER_PAGE),
+            iterations,
+            WARMUP,
+        ),
+        measure(
+            "repository.find_all.deep_offset",
+            lambda i: repository.find_all(page=context.deep_page, per_page=PER_PAGE),
+            iterations,
+            WARMUP,
+        ),
+        measure(
+            "repository.find_all.deep_cursor",
+            lambda i: repository.find_all(per_page=PER_PAGE, cursor=deep_cursor),
+            iterations,
+            WARMUP,
+        ),
+        measure(
+            "repository.get_by_id",
+            lambda i: repository.get_by_id(context.debt_id("repository.get_by_id", i)),
+            iterations,
+            WARMUP,
+        ),
+        measure(
+            "repository.update",
+            lambda i: repository.update(context.debt_id("repository.update", i), {"amount": context.amounts[i]}, Debt),
+            iterations,
+            WARMUP,
+        ),
+    ]
+
+    created = []
+
+    def save(i: int):
+        debt = Debt(
+            user_id=context.user_ids[i % len(context.user_ids)],
+            description=f"Benchmark insert {uuid.uuid4()}",
+            amount=context.amounts[i],
+            debtor_name="Benchmark debtor",
+            creditor_name="Benchmark creditor",
+            status_id=context.status_id,
+        )
+        created.append(repository.save(debt))
+
+    try:
+        results.append(measure("repository.save", save, iterations, WARMUP))
+    finally:
+        # Keep the table at its seeded size for the next cases and runs
+        for debt_id in created:
+            repository.delete(debt_id)
+    return results
+
+
+async def service_cases(service, context: BenchmarkContext) -> List[Dict]:
+    """Listing and point reads through `DebtService`, on the async repository."""
+    iterations = context.iterations
+    return [
+        await measure_async(
+            "service.list_debts",
+            lambda i: service.list_debts(page=1, per_page=PER_PAGE),
+            iterations,
+            WARMUP,
+        ),
+        await measure_async(
+            "service.get_debt_by_id",
+            lambda i: service.get_debt_by_id(context.debt_id("service.get_debt_by_id", i)),
+            iterations,
+            WARMUP,
+        ),
+    ]
+
+
+async def http_cases(app, context: BenchmarkContext) -> List[Dict]:
+    """End-to-end requests through the whole ASGI stack (middlewares, routing, serialization)."""
+    client = ASGIClient(app)
+    iterations = context.iterations
+
+    async def list_debts(i: int):
+        response = await client.get("/debts/", query={"page": 1, "per_page": PER_PAGE})
+        _expect(response, 200)
+
+    async def get_debt(i: int):
+        response = await client.get(f"/debts/{context.debt_id('http.get_debt', i)}")
+        _expect(response, 200)
+
+    async def login(i: int):
+        response = await client.post_form("/auth/login", {"username": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD})
+        _expect(response, 200)
+
+    return [
+        await measure_async("http.get_debts", list_debts, iterations, WARMUP),
+        await measure_async("http.get_debt", get_debt, iterations, WARMUP),
+        # Dominated by the password hash, so fewer iterations
+        await measure_async("http.auth_login", login, max(5, iterations // 10), warmup=1),
+    ]
+
+
+def _expect(response, status: int):
+    if response.status != status:
+        raise RuntimeError(f"Expected HTTP {status}, got {response.status}: {response.body[:200]!r}")
@@ -0,0 +1,98 @@
+import gc
+import json
+import statistics
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+def summarize(name: str, durations: List[float]) -> Dict:
+    """Latency statistics, in milliseconds, of one benchmark case."""
+    ordered = sorted(durations)
+    total = sum(ordered)
+    return {
+        "name": name,
+        "iterations": len(ordered),
+        "mean_ms": round(total / len(ordered) * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "ops_per_second": round(len(ordered) / total, 2) if total else None,
+    }
+
+
+def measure(name: str, function: Callable[[int], object], iterations: int, warmup: int = 5) -> Dict:
+    """
+    Time `function(i)` sequentially for `iterations` runs, after `warmup` untimed runs.
+
+    The garbage collector is paused while timing, so collections triggered by
+    earlier cases do not land on this one.
+    """
+    for i in range(warmup):
+        function(i)
+
+    durations = []
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(iterations):
+            start = perf_counter()
+            function(warmup + i)
+            durations.append(perf_counter() - start)
+    finally:
+        gc.enable()
+    return summarize(name, durations)
+
+
+async def measure_async(
+    name: str, function: Callable[[int], Awaitable[object]], iterations: int, warmup: int = 5
+) -> Dict:
+    """Same as `measure`, awaiting `function(i)`."""
+    for i in range(warmup):
+        await function(i)
+
+    durations = []
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(iterations):
+            start = perf_counter()
+            await function(warmup + i)
+            durations.append(perf_counter() - start)
+    finally:
+        gc.enable()
+    return summarize(name, durations)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], metric: str, tolerance: float) -> List[Dict]:
+    """
+    Cases whose `metric` got worse than the baseline by more than `tolerance` (0.2 = 20%).
+
+    Cases missing from either side are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get(metric):
+            continue
+        ratio = result[metric] / reference[metric]
+        if ratio > 1 + tolerance:
+            regressions.append({
+                "name": name, "metric": metric, "baseline": reference[metric],
+                "current": result[metric], "ratio": round(ratio, 3),
+            })
+    return regressions
+
+
+def load_report(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_report(path: str, report: Dict):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.harness import compare, load_report, write_report
+from benchmarks.seed import BENCHMARK_PASSWORD, SCALES
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SUITES = ("repository", "service", "http")
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Seed the benchmark database and time the repository, service and HTTP hot paths.",
+    )
+    parser.add_argument("--scale", default="10k", help=f"Debts to seed: {', '.join(SCALES)} or a number.")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs per case.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the rows each case touches.")
+    parser.add_argument("--suites", default=",".join(SUITES), help="Comma separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<scale>-<timestamp>.json).")
+    parser.add_argument("--baseline", help="Baseline to compare with (default: benchmarks/baselines/<scale>.json).")
+    parser.add_argument("--metric", default="median_ms", choices=("median_ms", "p95_ms", "mean_ms"))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the baseline (0.25 = 25%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--reseed", action="store_true", help="Seed again even if the database holds this scale.")
+    return parser.parse_args(argv)
+
+
+def debts_for(scale: str) -> int:
+    if scale in SCALES:
+        return SCALES[scale]
+    try:
+        return int(scale)
+    except ValueError:
+        raise ValueError(f"Invalid scale '{scale}'. Use one of: {', '.join(SCALES)} or a number.")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_async_suites(suites: List[str], context, debt_repository=None) -> List[Dict]:
+    """
+    Service and HTTP suites share one event loop, as the async engine's pool is bound to it.
+    The service suite runs on `debt_repository` (default: a new AsyncDebtRepository).
+    """
+    from benchmarks.cases import http_cases, service_cases
+
+    results = []
+    if "service" in suites:
+        from app.services.debt_service import DebtService
+
+        if debt_repository is None:
+            from app.repositories.async_debt_repository import AsyncDebtRepository
+
+            debt_repository = AsyncDebtRepository()
+        results += await service_cases(DebtService(debt_repository), context)
+
+    if "http" in suites:
+        from app.main import app
+
+        await app.router.startup()
+        try:
+            results += await http_cases(app, context)
+        finally:
+            await app.router.shutdown()
+    return results
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"{'case':<36} {'median ms':>10} {'p95 ms':>10} {'ops/s':>10}")
+    for name, result in results.items():
+        print(f"{name:<36} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f} {result['ops_per_second'] or 0:>10.1f}")
+
+
+def run_database(args: argparse.Namespace, debts: int, suites: List[str]) -> Tuple[List[Dict], str]:
+    """Seed the benchmark database and run the suites on it. Returns the results and the server version."""
+    from sqlalchemy import text
+
+    from app.config.database import engine
+    from app.migrations.runner import MigrationRunner
+    from app.repositories.debt_repository import DebtRepository
+    from app.repositories.debt_summary_repository import DebtSummaryRepository
+    from app.repositories.status_registry import status_registry
+    from app.services.password_hasher import PasswordHasher
+    from benchmarks.cases import BenchmarkContext, database_anchors, repository_cases
+    from benchmarks.seed import seed
+
+    MigrationRunner(engine).upgrade()
+    if seed(engine, debts, PasswordHasher().hash_sync(BENCHMARK_PASSWORD), force=args.reseed):
+        DebtSummaryRepository().rebuild()
+    status_registry.load()
+
+    context = BenchmarkContext(debts, args.seed, args.iterations, *database_anchors(engine, debts))
+    results = []
+    if "repository" in suites:
+        results += repository_cases(DebtRepository(), context)
+    if "service" in suites or "http" in suites:
+        results += asyncio.run(run_async_suites(suites, context))
+
+    with engine.connect() as connection:
+        server_version = connection.execute(text("SHOW server_version")).scalar()
+    return results, server_version
+
+
+def run_memory(args: argparse.Namespace, debts: int, suites: List[str]) -> Tuple[List[Dict], None]:
+    """
+    Seed the application's in-memory repositories (REPOSITORY_BACKEND=memory) and
+    run the suites on them, so no database is needed. They are seeded on every run.
+    """
+    from app.config.repositories import memory_statuses
+    from app.main import debt_repository, user_repository
+    from app.repositories.status_registry import status_registry
+    from app.services.password_hasher import PasswordHasher
+    from benchmarks.cases import BenchmarkContext, memory_anchors, repository_cases
+    from benchmarks.seed import seed_memory
+
+    seed_memory(
+        debt_repository.repository,
+        user_repository.repository,
+        debts,
+        PasswordHasher().hash_sync(BENCHMARK_PASSWORD),
+    )
+    status_registry.replace(memory_statuses())
+
+    context = BenchmarkContext(debts, args.seed, args.iterations, *memory_anchors(debt_repository.repository, debts))
+    results = []
+    if "repository" in suites:
+        results += repository_cases(debt_repository.repository, context)
+    if "service" in suites or "http" in suites:
+        results += asyncio.run(run_async_suites(suites, context, debt_repository))
+    return results, None
+
+
+# Main Function
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    debts = debts_for(args.scale)
+    suites = [suite.strip() for suite in args.suites.split(",") if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown suites: {', '.join(sorted(unknown))}.")
+
+    from app.config.repositories import repository_backend
+
+    backend = repository_backend()
+    if backend == "memory":
+        results, server_version = run_memory(args, debts, suites)
+    else:
+        # The seed truncates the tables, so never fall back to the application's database
+        database_url = os.getenv("BENCHMARK_DATABASE_URL")
+        if not database_url:
+            print("Set BENCHMARK_DATABASE_URL to a dedicated database; its tables are truncated by the seed.")
+            return 2
+        os.environ["DATABASE_URL"] = database_url
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        os.environ.pop("DATABASE_REPLICA_URLS", None)
+        results, server_version = run_database(args, debts, suites)
+
+    # Memory results are kept apart from the database's, as they are not comparable
+    label = args.scale if backend == "postgres" else f"{args.scale}-{backend}"
+    timestamp = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "debts": debts,
+            "iterations": args.iterations,
+            "seed": args.seed,
+            "suites": suites,
+            "backend": backend,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgres": server_version,
+            "timestamp": timestamp.isoformat(),
+        },
+        "results": {result["name"]: result for result in results},
+    }
+
+    output = args.output or os.path.join(
+        BENCHMARKS_DIR, "results", f"{label}-{timestamp.strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    write_report(output, report)
+    print_table(report["results"])
+    print(f"Results written to {output}")
+
+    baseline_path = args.baseline or os.path.join(BENCHMARKS_DIR, "baselines", f"{label}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        write_report(baseline_path, report)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    baseline = load_report(baseline_path)
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(report["results"], baseline["results"], args.metric, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']}: {regression['metric']} {regression['baseline']:.3f} -> "
+            f"{regression['current']:.3f} ({regression['ratio']:.2f}x)"
+        )
+    if regressions:
+        return 1
+    print(f"No regressions over {args.tolerance:.0%} on {args.metric} against {baseline_path}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
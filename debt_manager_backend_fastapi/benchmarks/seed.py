@@ -0,0 +1,168 @@
+import hashlib
+import uuid
+from datetime import date, timedelta
+from time import perf_counter
+from typing import List
+
+from sqlalchemy import text
+
+# Debts seeded per scale
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Users are seeded in proportion to the debts
+DEBTS_PER_USER = 100
+
+# Statuses the seeded debts cycle through
+STATUSES = ("pending", "paid", "overdue")
+
+# Rows inserted per statement while seeding debts
+SEED_BATCH_SIZE = 500_000
+
+# Credentials of the first seeded user, used by the login benchmark
+BENCHMARK_EMAIL = "bench1@example.com"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+# One-row table recording the scale the database was seeded at
+SEED_MARKER_TABLE = "benchmark_seed"
+
+
+def user_count(debts: int) -> int:
+    return max(1, debts // DEBTS_PER_USER)
+
+
+def seeded_id(label: str, index: int) -> str:
+    """ID of a seeded row, as generated by `md5(label || index)::uuid` in `seed`."""
+    return str(uuid.UUID(hashlib.md5(f"{label}{index}".encode("utf-8")).hexdigest()))
+
+
+def seed(engine, debts: int, hashed_password: str, force: bool = False) -> bool:
+    """
+    Fill the benchmark database with `debts` debts and their users.
+
+    Rows are generated in SQL from their index (IDs are the md5 of a fixed
+    label), so every run at the same scale sees the same data. Seeding is
+    skipped when the database already holds this scale.
+
+    Returns:
+        bool: Whether the database was (re)seeded.
+    """
+    with engine.begin() as connection:
+        connection.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{SEED_MARKER_TABLE}" (debts bigint NOT NULL, seeded_at timestamp NOT NULL)'
+        ))
+        seeded = connection.execute(text(f'SELECT debts FROM "{SEED_MARKER_TABLE}"')).scalar()
+    if seeded == debts and not force:
+        return False
+
+    start = perf_counter()
+    users = user_count(debts)
+    with engine.begin() as connection:
+        connection.execute(text(f'DELETE FROM "{SEED_MARKER_TABLE}"'))
+        connection.execute(text('TRUNCATE "Debt_summary", "Logs", "Debts", "Users" CASCADE'))
+
+        for status in STATUSES:
+            connection.execute(
+                text('INSERT INTO "Status" (id, name) VALUES (md5(:label)::uuid, :name) ON CONFLICT (name) DO NOTHING'),
+                {"label": f"bench-status-{status}", "name": status},
+            )
+        status_ids: List[str] = [
+            str(row[0]) for row in connection.execute(
+                text('SELECT id FROM "Status" WHERE name = ANY(:names) ORDER BY name'), {"names": list(STATUSES)}
+            )
+        ]
+
+        connection.execute(
+            text("""
+                INSERT INTO "Users" (id, username, email, hashed_password, name)
+                SELECT md5('bench-user-' || i)::uuid, 'bench' || i, 'bench' || i || '@example.com',
+                       :hashed_password, 'Bench User ' || i
+                FROM generate_series(1, :users) AS i
+            """),
+            {"users": users, "hashed_password": hashed_password},
+        )
+
+    for first in range(1, debts + 1, SEED_BATCH_SIZE):
+        last = min(debts, first + SEED_BATCH_SIZE - 1)
+        with engine.begin() as connection:
+            connection.execute(
+                text("""
+                    INSERT INTO "Debts" (id, user_id, description, amount, debtor_name, creditor_name,
+                                         due_date, status_id, notes)
+                    SELECT md5('bench-debt-' || i)::uuid,
+                           md5('bench-user-' || (1 + i % :users))::uuid,
+                           'Debt ' || i,
+                           ((i * 7919) % 1000000) / 100.0,
+                           'Debtor ' || (i % 1000),
+                           'Creditor ' || (i % 50),
+                           date '2024-01-01' + (i % 730),
+                           (CAST(:status_ids AS uuid[]))[1 + i % :statuses],
+                           CASE WHEN i % 10 = 0 THEN 'Benchmark note ' || i END
+                    FROM generate_series(:first, :last) AS i
+                """),
+                {"users": users, "status_ids": status_ids, "statuses": len(status_ids),
+                 "first": first, "last": last},
+            )
+        print(f"  Seeded debts {first}-{last}")
+
+    with engine.begin() as connection:
+        connection.execute(text(f'INSERT INTO "{SEED_MARKER_TABLE}" (debts, seeded_at) VALUES (:debts, now())'),
+                           {"debts": debts})
+
+    # ANALYZE cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text('ANALYZE "Users"'))
+        connection.execute(text('ANALYZE "Debts"'))
+
+    print(f"Seeded {debts} debts and {users} users in {perf_counter() - start:.1f}s.")
+    return True
+
+
+def seed_memory(debt_repository, user_repository, debts: int, hashed_password: str):
+    """
+    Fill the in-memory repositories (REPOSITORY_BACKEND=memory) with the same
+    users and debts `seed` writes to the database, IDs included. Statuses are
+    the memory backend's own (see `app.config.repositories.memory_statuses`).
+    """
+    from app.config.repositories import memory_statuses
+
+    start = perf_counter()
+    users = user_count(debts)
+    statuses = memory_statuses()
+    missing = [status for status in STATUSES if status not in statuses]
+    if missing:
+        raise ValueError(f"REPOSITORY_MEMORY_STATUSES must include: {', '.join(missing)}.")
+    status_ids = [statuses[status] for status in sorted(STATUSES)]
+    user_ids = [seeded_id("bench-user-", i) for i in range(1, users + 1)]
+
+    user_repository.table.insert_many([
+        {
+            "id": user_ids[i - 1],
+            "username": f"bench{i}",
+            "email": f"bench{i}@example.com",
+            "hashed_password": hashed_password,
+            "name": f"Bench User {i}",
+        }
+        for i in range(1, users + 1)
+    ])
+
+    first_due_date = date(2024, 1, 1)
+    for first in range(1, debts + 1, SEED_BATCH_SIZE):
+        last = min(debts, first + SEED_BATCH_SIZE - 1)
+        debt_repository.table.insert_many([
+            {
+                "id": seeded_id("bench-debt-", i),
+                "user_id": user_ids[i % users],
+                "description": f"Debt {i}",
+                "amount": ((i * 7919) % 1000000) / 100.0,
+                "debtor_name": f"Debtor {i % 1000}",
+                "creditor_name": f"Creditor {i % 50}",
+                "due_date": first_due_date + timedelta(days=i % 730),
+                "status_id": status_ids[i % len(status_ids)],
+                "notes": f"Benchmark note {i}" if i % 10 == 0 else None,
+            }
+            for i in range(first, last + 1)
+        ])
+        print(f"  Seeded debts {first}-{last}")
+
+    debt_repository.summary_repository.rebuild()
+    print(f"Seeded {debts} debts and {users} users in memory in {perf_counter() - start:.1f}s.")